@@ -0,0 +1,195 @@
+"""
+Time the FPL ingestion paths end to end against a local stub API.
+
+Starts benchmarks.stub_fpl on a background thread, points FPLDataSync at it
+and runs bootstrap, single-league and all-invitational-leagues syncs into
+the database (create the tables first with ``python -m db.schema``), then
+crawls every league again with queue-leasing crawl workers.
+
+Run from backend/:
+    python -m benchmarks.ingestion --entries 500 --leagues 3
+    python -m benchmarks.ingestion --latency-ms 40 --error-rate 0.01
+    python -m benchmarks.ingestion --trace sync.jsonl  # stage breakdown per run
+    python -m benchmarks.ingestion --latency-ms 40 --crawl-workers 1 2 4 8
+"""
+
+import argparse
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+from db.connector import SQLAlchemyConnector
+from services.crawl import CrawlQueue, CrawlWorker
+from services.data_sync import FPLDataSync
+from services.tracing import Tracer, load_spans, report
+from benchmarks.stub_fpl import USER_ENTRY, StubFPL, StubServer
+
+
+def count_rows(db: SQLAlchemyConnector, written: Counter):
+    """Tally rows batch upserts actually inserted or changed, per table."""
+    upsert = db.batch_upsert_on_conflict
+
+    def counting(table, data, conflict_target, **kwargs):
+        changed = upsert(table, data, conflict_target, **kwargs)
+        if changed:
+            written[table.name] += changed
+        return changed
+
+    db.batch_upsert_on_conflict = counting
+
+
+def run_case(label, fn, server, written, units, tracer):
+    server.calls.clear()
+    written.clear()
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        ok = fn()
+    except Exception as e:
+        ok = f"raised {type(e).__name__}"
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    calls = sum(v for k, v in server.calls.items() if k != "errors")
+    print(f"\n{label}: {elapsed:.2f}s, ok={ok}")
+    print(
+        f"  {units[1] / elapsed:10.1f} {units[0]}/s"
+        f"   {calls} upstream calls ({server.calls['errors']} failed)"
+        f"   {sum(written.values())} rows written"
+        f"   peak {peak / 2**20:.1f} MiB"
+    )
+    print(f"  calls: {dict(sorted(server.calls.items()))}")
+    print(f"  rows:  {dict(sorted(written.items()))}")
+    if tracer.enabled:
+        spans = load_spans(tracer.path)
+        report([s for s in spans if s["trace_id"] == spans[-1]["trace_id"]])
+
+
+def crawl(db: SQLAlchemyConnector, base_url: str, leagues: int, workers: int, tracer):
+    """Queue every league and drain the queue with ``workers`` worker threads."""
+    queue = CrawlQueue(db)
+    queue.enqueue_leagues(range(1, leagues + 1))
+    threads = [
+        threading.Thread(
+            target=CrawlWorker(
+                queue, FPLDataSync(db, base_url=base_url, tracer=tracer)
+            ).run,
+            kwargs={"drain": True},
+        )
+        for _ in range(workers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return queue.status()["items"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--leagues", type=int, default=2)
+    parser.add_argument("--entries", type=int, default=200, help="entries per league")
+    parser.add_argument("--players", type=int, default=700)
+    parser.add_argument("--gameweek", type=int, default=20, help="current gameweek")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--workers", type=int, default=8, help="concurrent element summaries"
+    )
+    parser.add_argument(
+        "--rate", type=float, default=50.0, help="element summaries per second"
+    )
+    parser.add_argument(
+        "--crawl-workers",
+        type=int,
+        nargs="+",
+        default=[4],
+        help="crawl worker counts to compare",
+    )
+    parser.add_argument("--trace", help="write sync spans to this JSON-lines file")
+    parser.add_argument("--db-host", default=os.environ.get("DB_HOST", "localhost"))
+    parser.add_argument("--db-name", default=os.environ.get("DB_NAME", "fpl_db"))
+    parser.add_argument("--db-user", default=os.environ.get("DB_USER", "bcheye"))
+    parser.add_argument(
+        "--db-password", default=os.environ.get("DB_PASSWORD", "password")
+    )
+    args = parser.parse_args()
+    # Per-request connection logs would swamp the report
+    logging.getLogger("urllib3").setLevel(logging.WARNING)
+
+    api = StubFPL(args.leagues, args.entries, args.players, args.gameweek)
+    server = StubServer(
+        api, latency=args.latency_ms / 1000, error_rate=args.error_rate
+    ).start()
+    db = SQLAlchemyConnector(
+        user=args.db_user,
+        password=args.db_password,
+        host=args.db_host,
+        database=args.db_name,
+    )
+    written: Counter = Counter()
+    count_rows(db, written)
+    tracer = Tracer(args.trace)
+    sync = FPLDataSync(db, base_url=server.url, tracer=tracer)
+
+    print(
+        f"Stub API on {server.url}: {args.leagues} leagues × {args.entries} entries, "
+        f"{args.players} players, GW{args.gameweek}, "
+        f"{args.latency_ms:g}ms latency, {args.error_rate:.1%} errors"
+    )
+    try:
+        run_case(
+            "bootstrap",
+            sync.sync_bootstrap_data,
+            server,
+            written,
+            ("players", args.players),
+            tracer,
+        )
+        run_case(
+            "element summaries",
+            lambda: sync.sync_element_summaries(
+                force=True, workers=args.workers, rate=args.rate
+            ),
+            server,
+            written,
+            ("players", args.players),
+            tracer,
+        )
+        run_case(
+            "one league",
+            lambda: sync.sync_league_managers_data(1),
+            server,
+            written,
+            ("entries", args.entries),
+            tracer,
+        )
+        run_case(
+            "all invitational leagues",
+            lambda: sync.sync_all_invitational_classic_leagues_for_user(USER_ENTRY),
+            server,
+            written,
+            ("entries", args.entries * args.leagues),
+            tracer,
+        )
+        for workers in args.crawl_workers:
+            run_case(
+                f"crawl, {workers} workers",
+                lambda: crawl(db, server.url, args.leagues, workers, tracer),
+                server,
+                written,
+                ("entries", args.entries * args.leagues),
+                tracer,
+            )
+    finally:
+        server.stop()
+        tracer.close()
+        db.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Time live mini-league scoring over synthetic picks.
+
+Run from backend/:
+    python -m benchmarks.live_scoring --entries 10000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from services.live_scoring import LiveVectors, PicksMatrix, score
+from services.player_index import PlayerIndex
+
+# Squad order: GK, 4 DEF, 4 MID, 2 FWD, then bench GK, DEF, MID, FWD
+SQUAD_POSITIONS = [1, 2, 2, 2, 2, 3, 3, 3, 3, 4, 4, 1, 2, 3, 4]
+
+
+def synthetic(entries, n_players=700, seed=7):
+    rng = np.random.default_rng(seed)
+    player_ids = np.arange(1, n_players + 1)
+    positions = rng.choice([1, 2, 3, 4], size=n_players, p=[0.1, 0.35, 0.4, 0.15])
+    teams = rng.integers(1, 21, size=n_players)
+    by_position = {p: player_ids[positions == p] for p in (1, 2, 3, 4)}
+
+    pick_rows, chip_rows = [], []
+    for entry_id in range(1, entries + 1):
+        needed = {p: SQUAD_POSITIONS.count(p) for p in (1, 2, 3, 4)}
+        chosen = {
+            p: list(rng.choice(by_position[p], size=n, replace=False))
+            for p, n in needed.items()
+        }
+        captain, vice = rng.choice(np.arange(1, 11), size=2, replace=False)
+        for slot, p in enumerate(SQUAD_POSITIONS):
+            pick_rows.append(
+                {
+                    "entry_id": entry_id,
+                    "position": slot + 1,
+                    "player_id": int(chosen[p].pop()),
+                    "multiplier": (2 if slot == captain else 1) if slot < 11 else 0,
+                    "is_captain": slot == captain,
+                    "is_vice_captain": slot == vice,
+                }
+            )
+        chip_rows.append(
+            {"entry_id": entry_id, "active_chip": None, "transfers_cost": 0}
+        )
+
+    index = PlayerIndex(
+        {
+            "player_id": player_ids,
+            "position_type_id": positions,
+            "team_id": teams,
+        }
+    )
+    minutes = np.where(rng.random(n_players) < 0.3, 0, rng.integers(1, 91, n_players))
+    live_data = {
+        "elements": [
+            {
+                "id": int(pid),
+                "stats": {
+                    "minutes": int(m),
+                    "total_points": int(rng.integers(0, 13)) if m else 0,
+                },
+            }
+            for pid, m in zip(player_ids, minutes)
+        ]
+    }
+    # Half the fixtures finished, so some auto-subs apply
+    fixtures = [
+        {"team_h": t, "team_a": t + 1, "finished_provisional": t < 10}
+        for t in range(1, 21, 2)
+    ]
+    return pick_rows, chip_rows, live_data, fixtures, index
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=10000)
+    parser.add_argument("--ticks", type=int, default=20)
+    args = parser.parse_args()
+
+    pick_rows, chip_rows, live_data, fixtures, index = synthetic(args.entries)
+
+    start = time.perf_counter()
+    picks = PicksMatrix.from_rows(pick_rows, chip_rows)
+    print(
+        f"Built picks matrix for {len(picks)} entries in {time.perf_counter() - start:.3f}s"
+    )
+
+    samples = []
+    for _ in range(args.ticks):
+        start = time.perf_counter()
+        live = LiveVectors.from_live(live_data, fixtures, index)
+        scores = score(picks, live)
+        samples.append(time.perf_counter() - start)
+
+    print(
+        f"Live tick (vectors + scoring) over {args.entries} entries: "
+        f"median {np.median(samples) * 1000:.1f}ms, max {max(samples) * 1000:.1f}ms"
+    )
+    print(f"Mean live score {scores.mean():.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Replay a dashboard-shaped request mix against a running API and report
+throughput and latency percentiles per route.
+
+Seed the database with benchmarks.seed_data first and start the server
+(e.g. ``gunicorn -c gunicorn.conf.py run:app``). The run fails (exit 1)
+when a route exceeds its latency thresholds or the error rate is too high.
+
+Run from backend/:
+    python -m benchmarks.loadtest --url http://127.0.0.1:8000 --duration 60
+    python -m benchmarks.loadtest --thresholds my_thresholds.json --concurrency 64
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+
+import numpy as np
+import requests
+
+# (route label, weight, path template); ids are drawn from the seeded layout
+MIX = [
+    ("dashboard", 30, "/api/dashboard/{entry}"),
+    ("minileagues", 18, "/api/minileagues/{entry}"),
+    ("overview", 10, "/api/overview/{entry}"),
+    ("gameweeks", 10, "/api/gameweeks/{entry}"),
+    ("top_performing_players", 8, "/api/top_performing_players?position={position}"),
+    ("players", 8, "/api/players?sort=total_points&limit=50"),
+    ("league_winners", 6, "/api/leagues/{league}/winners"),
+    ("similar_players", 5, "/api/players/{player}/similar"),
+    ("xpoints", 5, "/api/xpoints?limit=50"),
+]
+
+# Default per-route limits in milliseconds; override with --thresholds
+THRESHOLDS = {
+    "dashboard": {"p95": 50, "p99": 150},
+    "minileagues": {"p95": 100, "p99": 250},
+    "overview": {"p95": 25, "p99": 75},
+    "gameweeks": {"p95": 25, "p99": 75},
+    "top_performing_players": {"p95": 15, "p99": 50},
+    "players": {"p95": 25, "p99": 75},
+    "league_winners": {"p95": 50, "p99": 150},
+    "similar_players": {"p95": 15, "p99": 50},
+    "xpoints": {"p95": 25, "p99": 75},
+}
+
+PERCENTILES = (50, 95, 99)
+
+
+class LoadTest:
+    """
+    Closed-loop load: each worker thread sends its next request as soon as
+    the previous one returns. With ``revalidate`` workers keep ETags like a
+    browser and send If-None-Match, so 304s count as hits.
+    """
+
+    def __init__(self, args):
+        self.args = args
+        self.samples = defaultdict(list)
+        self.errors = defaultdict(int)
+        self._lock = threading.Lock()
+        self._routes = [(label, path) for label, _, path in MIX]
+        self._weights = [weight for _, weight, _ in MIX]
+
+    def _request(self, rng: random.Random):
+        label, template = rng.choices(self._routes, self._weights)[0]
+        return label, template.format(
+            entry=rng.randint(1, self.args.entries),
+            league=rng.randint(1, self.args.leagues),
+            player=rng.randint(1, self.args.players),
+            position=rng.randint(1, 4),
+        )
+
+    def _worker(self, seed: int, deadline: float, warmup_until: float):
+        rng = random.Random(seed)
+        session = requests.Session()
+        etags = {}
+        while time.perf_counter() < deadline:
+            label, path = self._request(rng)
+            headers = {"Accept-Encoding": "gzip, br"}
+            if self.args.revalidate and path in etags:
+                headers["If-None-Match"] = etags[path]
+            start = time.perf_counter()
+            try:
+                response = session.get(self.args.url + path, headers=headers)
+                ok = response.status_code in (200, 304)
+                if "ETag" in response.headers:
+                    etags[path] = response.headers["ETag"]
+            except requests.RequestException:
+                ok = False
+            elapsed = time.perf_counter() - start
+            if start < warmup_until:
+                continue
+            with self._lock:
+                self.samples[label].append(elapsed)
+                if not ok:
+                    self.errors[label] += 1
+
+    def run(self) -> float:
+        start = time.perf_counter()
+        warmup_until = start + self.args.warmup
+        deadline = warmup_until + self.args.duration
+        threads = [
+            threading.Thread(
+                target=self._worker, args=(self.args.seed + i, deadline, warmup_until)
+            )
+            for i in range(self.args.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return time.perf_counter() - warmup_until
+
+    def report(self, elapsed: float, thresholds) -> list:
+        """Print per-route stats; return the threshold violations."""
+        failures = []
+        total = sum(len(s) for s in self.samples.values())
+        errors = sum(self.errors.values())
+        print(
+            f"{total} requests in {elapsed:.1f}s: {total / elapsed:.1f} req/s, "
+            f"{errors} errors, {self.args.concurrency} workers"
+        )
+        print(
+            f"{'route':<24}{'count':>8}{'req/s':>9}"
+            + "".join(f"{f'p{p} ms':>10}" for p in PERCENTILES)
+            + f"{'errors':>8}"
+        )
+        for label, _, _ in MIX:
+            samples = np.array(self.samples.get(label, [])) * 1000
+            if not len(samples):
+                continue
+            values = dict(zip(PERCENTILES, np.percentile(samples, PERCENTILES)))
+            print(
+                f"{label:<24}{len(samples):>8}{len(samples) / elapsed:>9.1f}"
+                + "".join(f"{values[p]:>10.1f}" for p in PERCENTILES)
+                + f"{self.errors[label]:>8}"
+            )
+            for name, limit in thresholds.get(label, {}).items():
+                value = values[int(name.lstrip("p"))]
+                if value > limit:
+                    failures.append(f"{label} {name} {value:.1f}ms > {limit}ms")
+
+        if total and errors / total > self.args.max_error_rate:
+            failures.append(
+                f"error rate {errors / total:.2%} > {self.args.max_error_rate:.2%}"
+            )
+        return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="http://127.0.0.1:5000")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds")
+    parser.add_argument("--warmup", type=float, default=5.0, help="seconds")
+    parser.add_argument("--entries", type=int, default=200_000, help="as seeded")
+    parser.add_argument("--leagues", type=int, default=5_000, help="as seeded")
+    parser.add_argument("--players", type=int, default=700, help="as seeded")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument(
+        "--revalidate", action="store_true", help="send If-None-Match like a browser"
+    )
+    parser.add_argument(
+        "--thresholds", help='JSON file of {"route": {"p95": ms, "p99": ms}}'
+    )
+    parser.add_argument("--max-error-rate", type=float, default=0.001)
+    args = parser.parse_args()
+
+    thresholds = THRESHOLDS
+    if args.thresholds:
+        with open(args.thresholds) as f:
+            thresholds = {**THRESHOLDS, **json.load(f)}
+
+    test = LoadTest(args)
+    failures = test.report(test.run(), thresholds)
+    if failures:
+        print("\nFAILED:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+    print("\nAll thresholds met")
+
+
+if __name__ == "__main__":
+    main()
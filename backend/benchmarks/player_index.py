@@ -0,0 +1,126 @@
+"""
+Compare top-N player queries served from the in-memory PlayerIndex against
+the SQL path (players ⋈ positions ⋈ teams with ORDER BY ... LIMIT).
+
+Run from backend/:
+    python -m benchmarks.player_index            # against fpl_db
+    python -m benchmarks.player_index --synthetic 700   # index only, no database
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from sqlalchemy import desc
+
+from db.connector import SQLAlchemyConnector
+from db.schema import players
+from services.player_index import PlayerIndex, joined_players_query
+
+# (sort, position, team) combinations exercised on every iteration
+QUERIES = [
+    ("total_points", None, None),
+    ("total_points", 3, None),
+    ("cost", None, 14),
+    ("minutes", 2, None),
+]
+
+
+def sql_top(conn, limit, sort, position, team):
+    query = joined_players_query().order_by(desc(players.c[sort]))
+    if position:
+        query = query.where(players.c.position_type_id == position)
+    if team:
+        query = query.where(players.c.team == team)
+    return [dict(r) for r in conn.execute(query.limit(limit)).mappings()]
+
+
+def synthetic_rows(n):
+    rng = random.Random(42)
+    return [
+        {
+            "player_id": i,
+            "player_name": f"Player {i}",
+            "total_points": rng.randint(0, 250),
+            "cost": rng.randint(38, 150) / 10,
+            "minutes": rng.randint(0, 3420),
+            "selected_by_percent": f"{rng.uniform(0, 60):.1f}",
+            "goals_scored": rng.randint(0, 25),
+            "assists": rng.randint(0, 15),
+            "clean_sheets": rng.randint(0, 15),
+            "yellow_cards": rng.randint(0, 10),
+            "red_cards": rng.randint(0, 1),
+            "position_type_id": rng.randint(1, 4),
+            "team_id": rng.randint(1, 20),
+            "position": "Midfielder",
+            "team": "Arsenal",
+        }
+        for i in range(1, n + 1)
+    ]
+
+
+def timed(fn, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return {
+        "p50_ms": statistics.median(samples) * 1000,
+        "p95_ms": samples[int(len(samples) * 0.95) - 1] * 1000,
+    }
+
+
+def report(label, stats):
+    print(f"{label:<12} p50={stats['p50_ms']:8.3f}ms  p95={stats['p95_ms']:8.3f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument(
+        "--synthetic", type=int, help="benchmark the index over N synthetic rows"
+    )
+    args = parser.parse_args()
+
+    def run_index(index):
+        for sort, position, team in QUERIES:
+            index.top(args.limit, sort, "desc", position, team)
+
+    if args.synthetic:
+        start = time.perf_counter()
+        index = PlayerIndex.from_rows(synthetic_rows(args.synthetic))
+        print(
+            f"Built index over {index.size} rows in {time.perf_counter() - start:.4f}s"
+        )
+        report("index", timed(lambda: run_index(index), args.iterations))
+        return
+
+    db = SQLAlchemyConnector(
+        user="bcheye", password="password", host="localhost", database="fpl_db"
+    )
+    start = time.perf_counter()
+    index = PlayerIndex.load(db)
+    print(f"Loaded index over {index.size} rows in {time.perf_counter() - start:.4f}s")
+
+    with db.engine.connect() as conn:
+
+        def run_sql():
+            for sort, position, team in QUERIES:
+                sql_top(conn, args.limit, sort, position, team)
+
+        sql_stats = timed(run_sql, args.iterations)
+    index_stats = timed(lambda: run_index(index), args.iterations)
+
+    print(f"{len(QUERIES)} queries per iteration, {args.iterations} iterations")
+    report("sql", sql_stats)
+    report("index", index_stats)
+    print(f"speedup      {sql_stats['p50_ms'] / index_stats['p50_ms']:.1f}x (p50)")
+    db.dispose()
+
+
+if __name__ == "__main__":
+    main()
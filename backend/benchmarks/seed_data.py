@@ -0,0 +1,303 @@
+"""
+Fill the fpl schema with synthetic data at production scale for load tests.
+
+Reference data (teams, positions, players, gameweeks, fixtures and
+per-gameweek player stats) goes through FPLDataSync against the stub API,
+so it is shaped exactly like a real sync. Managers, leagues and a season of
+scores are generated in bulk and loaded with COPY.
+
+Layout, relied on by benchmarks.loadtest: entry ids are 1..entries, league
+ids are 1..leagues, and every entry has a full gameweek history.
+
+Run from backend/ (create the tables first with ``python -m db.schema``),
+then restart the API so it drops cached responses:
+    python -m benchmarks.seed_data --entries 200000 --leagues 5000 --truncate
+"""
+
+import argparse
+import io
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy import func, select
+
+from db.connector import SQLAlchemyConnector
+from db.schema import (
+    gameweek_history,
+    league_gameweek_winners,
+    mini_league_entries,
+    mini_league_gameweek_scores,
+    mini_leagues,
+    overview,
+)
+from services.data_sync import FPLDataSync
+from services.gameweek_winners import persist_gameweek_winners
+from services.xpoints import XPointsPipeline
+from benchmarks.stub_fpl import StubFPL, StubServer
+
+# Tables filled in bulk; they must be empty unless --truncate is given
+BULK_TABLES = (
+    league_gameweek_winners,
+    overview,
+    gameweek_history,
+    mini_leagues,
+    mini_league_entries,
+    mini_league_gameweek_scores,
+)
+
+# Memberships per COPY batch of gameweek scores
+CHUNK = 20_000
+
+
+def league_sizes(rng, leagues: int, entries: int, per_entry: float) -> np.ndarray:
+    """Heavy-tailed league sizes: mostly 10-30 friends, a few thousand-strong."""
+    sizes = rng.lognormal(mean=3.0, sigma=1.0, size=leagues)
+    sizes *= entries * per_entry / sizes.sum()
+    return np.clip(sizes.round(), 5, entries).astype(np.int64)
+
+
+def memberships(rng, leagues: int, entries: int, per_entry: float):
+    """(entry_id, league_id) pairs, sorted by league then entry."""
+    pairs = []
+    for league_id, size in enumerate(league_sizes(rng, leagues, entries, per_entry), 1):
+        members = np.unique(rng.integers(1, entries + 1, size=size))
+        pairs.append(np.column_stack((members, np.full(len(members), league_id))))
+    return np.concatenate(pairs)
+
+
+def season(rng, entries: int, gameweeks: int):
+    """Per-entry gameweek points and transfer costs (row = entry_id - 1)."""
+    skill = rng.normal(0, 6, size=(entries, 1))
+    points = np.clip(rng.normal(52, 14, size=(entries, gameweeks)) + skill, 0, 160)
+    cost = rng.choice([0, 0, 0, 0, 4, 8], size=(entries, gameweeks))
+    return points.astype(np.int64), cost.astype(np.int64)
+
+
+def copy_rows(cursor, table, columns, rows):
+    """COPY an iterable of row tuples (already formatted as CSV fields)."""
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write(",".join(row))
+        buffer.write("\n")
+    _copy(cursor, table, columns, buffer)
+
+
+def copy_array(cursor, table, columns, array: np.ndarray):
+    """COPY an integer array, one row per table row."""
+    # One %-format over the whole chunk is several times faster than savetxt
+    line = ",".join(["%d"] * array.shape[1]) + "\n"
+    buffer = io.StringIO((line * len(array)) % tuple(array.ravel().tolist()))
+    _copy(cursor, table, columns, buffer)
+
+
+def _copy(cursor, table, columns, buffer: io.StringIO):
+    buffer.seek(0)
+    cursor.copy_expert(
+        f"COPY {table.schema}.{table.name} ({', '.join(columns)}) "
+        "FROM STDIN WITH (FORMAT csv)",
+        buffer,
+    )
+
+
+def seed_reference(db, args):
+    """Teams, players, gameweeks, fixtures and player stats via the stub API."""
+    server = StubServer(
+        StubFPL(players=args.players, current_gameweek=args.gameweek)
+    ).start()
+    try:
+        sync = FPLDataSync(db, base_url=server.url)
+        # Live syncs rewrite player rows, so bootstrap last restores them
+        for gameweek in range(1, args.gameweek + 1):
+            sync.sync_live_gameweek_data(gameweek)
+        sync.sync_fixtures()
+        sync.sync_bootstrap_data()
+    finally:
+        server.stop()
+    XPointsPipeline(db).run(force=True)
+
+
+def seed_managers(db, args):
+    rng = np.random.default_rng(args.seed)
+    gws = args.gameweek
+    points, cost = season(rng, args.entries, gws)
+    totals = np.cumsum(points - cost, axis=1)
+    pairs = memberships(rng, args.leagues, args.entries, args.leagues_per_entry)
+    entry_rows = pairs[:, 0] - 1
+
+    # Rank within each league by season total
+    order = np.lexsort((-totals[entry_rows, -1], pairs[:, 1]))
+    pairs, entry_rows = pairs[order], entry_rows[order]
+    starts = np.flatnonzero(np.r_[True, pairs[1:, 1] != pairs[:-1, 1]])
+    ranks = (
+        np.arange(len(pairs))
+        - np.repeat(starts, np.diff(np.r_[starts, len(pairs)]))
+        + 1
+    )
+
+    created = datetime(2024, 7, 20, 12).isoformat()
+    raw = db.engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        if args.truncate:
+            cursor.execute(
+                "TRUNCATE " + ", ".join(f"{t.schema}.{t.name}" for t in BULK_TABLES)
+            )
+
+        entry_ids = np.arange(1, args.entries + 1)
+        team_value = rng.integers(1000, 1060, size=(args.entries, 1))
+        copy_array(
+            cursor,
+            overview,
+            [
+                "entry_id",
+                "overall_points",
+                "overall_rank",
+                "gameweek_points",
+                "current_gameweek",
+                "team_value",
+            ],
+            np.column_stack(
+                (
+                    entry_ids,
+                    totals[:, -1],
+                    np.argsort(np.argsort(-totals[:, -1])) + 1,
+                    points[:, -1],
+                    np.full(args.entries, gws),
+                    team_value[:, 0] + (gws - 1) // 4,
+                )
+            ),
+        )
+
+        overall_rank = np.argsort(np.argsort(-totals, axis=0), axis=0) + 1
+        for start in range(0, args.entries, CHUNK):
+            rows = slice(start, start + CHUNK)
+            ids = entry_ids[rows]
+            copy_array(
+                cursor,
+                gameweek_history,
+                [
+                    "entry_id",
+                    "gameweek",
+                    "points",
+                    "total_points",
+                    "overall_rank",
+                    "team_value",
+                    "cost",
+                    "points_on_bench",
+                ],
+                np.column_stack(
+                    (
+                        np.repeat(ids, gws),
+                        np.tile(np.arange(1, gws + 1), len(ids)),
+                        points[rows].ravel(),
+                        totals[rows].ravel(),
+                        overall_rank[rows].ravel(),
+                        (team_value[rows] + np.arange(gws) // 4).ravel(),
+                        cost[rows].ravel(),
+                        rng.integers(0, 16, size=len(ids) * gws),
+                    )
+                ),
+            )
+
+        copy_rows(
+            cursor,
+            mini_leagues,
+            ["entry_id", "league_id", "name", "created", "league_type"],
+            ((str(e), str(l), f"League {l}", created, "x") for e, l in pairs.tolist()),
+        )
+        copy_rows(
+            cursor,
+            mini_league_entries,
+            ["entry_id", "entry_name", "player_name", "rank", "total", "league_id"],
+            (
+                (str(e), f"Team {e}", f"Manager {e}", str(r), str(t), str(l))
+                for (e, l), r, t in zip(
+                    pairs.tolist(),
+                    ranks.tolist(),
+                    totals[entry_rows, -1].tolist(),
+                )
+            ),
+        )
+
+        gw_ids = np.arange(1, gws + 1)
+        for start in range(0, len(pairs), CHUNK):
+            chunk, rows = (
+                pairs[start : start + CHUNK],
+                entry_rows[start : start + CHUNK],
+            )
+            copy_array(
+                cursor,
+                mini_league_gameweek_scores,
+                ["entry_id", "league_id", "gameweek", "points", "cost"],
+                np.column_stack(
+                    (
+                        np.repeat(chunk[:, 0], gws),
+                        np.repeat(chunk[:, 1], gws),
+                        np.tile(gw_ids, len(chunk)),
+                        points[rows].ravel(),
+                        cost[rows].ravel(),
+                    )
+                ),
+            )
+        raw.commit()
+    finally:
+        raw.close()
+    return len(pairs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=200_000)
+    parser.add_argument("--leagues", type=int, default=5_000)
+    parser.add_argument(
+        "--leagues-per-entry", type=float, default=3.0, help="mean memberships"
+    )
+    parser.add_argument("--players", type=int, default=700)
+    parser.add_argument("--gameweek", type=int, default=38, help="current gameweek")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument(
+        "--truncate", action="store_true", help="clear the manager tables first"
+    )
+    parser.add_argument("--db-host", default=os.environ.get("DB_HOST", "localhost"))
+    parser.add_argument("--db-name", default=os.environ.get("DB_NAME", "fpl_db"))
+    parser.add_argument("--db-user", default=os.environ.get("DB_USER", "bcheye"))
+    parser.add_argument(
+        "--db-password", default=os.environ.get("DB_PASSWORD", "password")
+    )
+    args = parser.parse_args()
+
+    db = SQLAlchemyConnector(
+        user=args.db_user,
+        password=args.db_password,
+        host=args.db_host,
+        database=args.db_name,
+    )
+    if not args.truncate:
+        with db.engine.connect() as conn:
+            filled = [
+                t.name
+                for t in BULK_TABLES
+                if conn.execute(select(func.count()).select_from(t)).scalar()
+            ]
+        if filled:
+            parser.error(f"{', '.join(filled)} not empty; pass --truncate to replace")
+
+    start = time.perf_counter()
+    seed_reference(db, args)
+    print(f"Reference data synced in {time.perf_counter() - start:.1f}s")
+
+    start = time.perf_counter()
+    n = seed_managers(db, args)
+    persist_gameweek_winners(db)
+    print(
+        f"Loaded {args.entries} entries in {args.leagues} leagues "
+        f"({n} memberships, {n * args.gameweek} gameweek scores) "
+        f"in {time.perf_counter() - start:.1f}s"
+    )
+    db.dispose()
+
+
+if __name__ == "__main__":
+    main()
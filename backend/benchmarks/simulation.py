@@ -0,0 +1,67 @@
+"""
+Time the Monte Carlo league simulator on a synthetic league.
+
+Run from backend/:
+    python -m benchmarks.simulation --entries 200 --trials 100000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from services.simulation import LeagueModel, LeagueSimulator
+
+
+def synthetic(entries, played=20, remaining=18, seed=7):
+    rng = np.random.default_rng(seed)
+    skill = rng.normal(50, 6, size=entries)
+    scores = {
+        entry_id: rng.normal(skill[entry_id - 1], 14, size=played)
+        .clip(5)
+        .astype(int)
+        .tolist()
+        for entry_id in range(1, entries + 1)
+    }
+    standings = [
+        {
+            "entry_id": entry_id,
+            "entry_name": f"Entry {entry_id}",
+            "total": sum(scores[entry_id]),
+        }
+        for entry_id in scores
+    ]
+    return LeagueModel.from_rows(standings, scores, remaining)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=200)
+    parser.add_argument("--trials", type=int, default=100_000)
+    parser.add_argument("--remaining", type=int, default=18)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    model = synthetic(args.entries, remaining=args.remaining)
+    simulator = LeagueSimulator(db=None, workers=args.workers)
+    # Warm the pool so process start-up isn't timed
+    simulator.run(model, args.trials, seed=1)
+
+    start = time.perf_counter()
+    projections = simulator.run(model, args.trials, seed=2)
+    elapsed = time.perf_counter() - start
+    simulator.shutdown()
+
+    print(
+        f"{args.trials} trials × {args.entries} entries × {args.remaining} gameweeks "
+        f"on {simulator.workers} workers: {elapsed:.2f}s"
+    )
+    for p in projections[:3]:
+        print(
+            f"  {p['entry_name']}: win {p['win_probability']:.3f}, "
+            f"top 3 {p['top3_probability']:.3f}, projected {p['projected_total']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,457 @@
+"""
+A local stand-in for the FPL API serving synthetic, deterministic payloads.
+
+Run from backend/ and point the app at it with FPL_BASE_URL:
+    python -m benchmarks.stub_fpl --port 8099 --leagues 3 --entries 500
+    FPL_BASE_URL=http://localhost:8099 python run.py
+
+League ``n`` (1..leagues) has ``entries`` members with entry ids
+``n * 100000 + i``; entry ``USER_ENTRY`` belongs to every league.
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+USER_ENTRY = 1
+PAGE_SIZE = 50
+TEAMS = 20
+GAMEWEEKS = 38
+SEASON_START = datetime(2024, 8, 16, 17, 30)
+
+
+class StubFPL:
+    """Synthetic FPL payloads, generated on first request and then reused."""
+
+    def __init__(
+        self,
+        leagues: int = 1,
+        entries: int = 200,
+        players: int = 700,
+        current_gameweek: int = 20,
+        seed: int = 7,
+    ):
+        self.leagues = leagues
+        self.entries = entries
+        self.players = players
+        self.current_gameweek = current_gameweek
+        self.seed = seed
+        self.routes = [
+            (re.compile(r"^/bootstrap-static/$"), "bootstrap", self.bootstrap),
+            (re.compile(r"^/fixtures/$"), "fixtures", self.fixtures),
+            (
+                re.compile(r"^/leagues-classic/(\d+)/standings/$"),
+                "standings",
+                self.standings,
+            ),
+            (re.compile(r"^/entry/(\d+)/$"), "entry", self.entry),
+            (re.compile(r"^/entry/(\d+)/history/$"), "history", self.history),
+            (
+                re.compile(r"^/entry/(\d+)/event/(\d+)/picks/$"),
+                "picks",
+                self.picks,
+            ),
+            (re.compile(r"^/event/(\d+)/live/$"), "live", self.live),
+            (
+                re.compile(r"^/element-summary/(\d+)/$"),
+                "element_summary",
+                self.element_summary,
+            ),
+        ]
+
+    def _rng(self, *key) -> random.Random:
+        return random.Random(":".join(map(str, (self.seed, *key))))
+
+    def league_members(self, league_id: int):
+        if not 1 <= league_id <= self.leagues:
+            return None
+        return [USER_ENTRY] + [league_id * 100000 + i for i in range(1, self.entries)]
+
+    def bootstrap(self, query):
+        return self._bootstrap()
+
+    @lru_cache(maxsize=None)
+    def _bootstrap(self):
+        rng = self._rng("bootstrap")
+        return {
+            "teams": [
+                {
+                    "id": t,
+                    "name": f"Team {t}",
+                    "short_name": f"T{t:02d}",
+                    "strength_overall_home": rng.randint(1000, 1350),
+                    "strength_overall_away": rng.randint(1000, 1350),
+                }
+                for t in range(1, TEAMS + 1)
+            ],
+            "element_types": [
+                {"id": 1, "singular_name": "Goalkeeper", "plural_name_short": "GKP"},
+                {"id": 2, "singular_name": "Defender", "plural_name_short": "DEF"},
+                {"id": 3, "singular_name": "Midfielder", "plural_name_short": "MID"},
+                {"id": 4, "singular_name": "Forward", "plural_name_short": "FWD"},
+            ],
+            "elements": [
+                {
+                    "id": i,
+                    "first_name": "Player",
+                    "second_name": str(i),
+                    "web_name": f"Player {i}",
+                    "team": rng.randint(1, TEAMS),
+                    "element_type": rng.choices([1, 2, 3, 4], [1, 3.5, 4, 1.5])[0],
+                    "now_cost": rng.randint(38, 150),
+                    "total_points": rng.randint(0, 250),
+                    "selected_by_percent": f"{rng.uniform(0, 60):.1f}",
+                    "minutes": rng.randint(0, 90 * self.current_gameweek),
+                    "goals_scored": rng.randint(0, 20),
+                    "assists": rng.randint(0, 12),
+                    "clean_sheets": rng.randint(0, 10),
+                    "yellow_cards": rng.randint(0, 8),
+                    "red_cards": rng.randint(0, 1),
+                }
+                for i in range(1, self.players + 1)
+            ],
+            "events": [
+                {
+                    "id": gw,
+                    "name": f"Gameweek {gw}",
+                    "deadline_time": (SEASON_START + timedelta(weeks=gw - 1)).strftime(
+                        "%Y-%m-%dT%H:%M:%SZ"
+                    ),
+                    "average_entry_score": rng.randint(40, 70),
+                    "finished": gw < self.current_gameweek,
+                    "data_checked": gw < self.current_gameweek,
+                    "is_current": gw == self.current_gameweek,
+                    "is_next": gw == self.current_gameweek + 1,
+                }
+                for gw in range(1, GAMEWEEKS + 1)
+            ],
+        }
+
+    @lru_cache(maxsize=None)
+    def _all_fixtures(self):
+        rng = self._rng("fixtures")
+        fixtures = []
+        for gw in range(1, GAMEWEEKS + 1):
+            teams = list(range(1, TEAMS + 1))
+            rng.shuffle(teams)
+            for home, away in zip(teams[::2], teams[1::2]):
+                done = gw < self.current_gameweek
+                fixtures.append(
+                    {
+                        "id": len(fixtures) + 1,
+                        "event": gw,
+                        "kickoff_time": "2024-08-16T19:00:00Z",
+                        "team_h": home,
+                        "team_a": away,
+                        "team_h_difficulty": rng.randint(2, 5),
+                        "team_a_difficulty": rng.randint(2, 5),
+                        "team_h_score": rng.randint(0, 4) if done else None,
+                        "team_a_score": rng.randint(0, 4) if done else None,
+                        "finished": done,
+                        "finished_provisional": done,
+                    }
+                )
+        return fixtures
+
+    def fixtures(self, query):
+        event = query.get("event")
+        fixtures = self._all_fixtures()
+        if event:
+            return [f for f in fixtures if f["event"] == int(event[0])]
+        return fixtures
+
+    def standings(self, query, league_id):
+        members = self.league_members(int(league_id))
+        if members is None:
+            return None
+        page = int(query.get("page", ["1"])[0])
+        start = (page - 1) * PAGE_SIZE
+        return {
+            "league": {
+                "id": int(league_id),
+                "name": f"League {league_id}",
+                "created": "2024-07-20T12:00:00Z",
+            },
+            "standings": {
+                "has_next": start + PAGE_SIZE < len(members),
+                "page": page,
+                "results": [
+                    {
+                        "entry": entry_id,
+                        "entry_name": f"Team {entry_id}",
+                        "player_name": f"Manager {entry_id}",
+                        "rank": start + i + 1,
+                        "total": 2000 - start - i,
+                    }
+                    for i, entry_id in enumerate(members[start : start + PAGE_SIZE])
+                ],
+            },
+        }
+
+    def entry(self, query, entry_id):
+        entry_id = int(entry_id)
+        leagues = (
+            range(1, self.leagues + 1)
+            if entry_id == USER_ENTRY
+            else [entry_id // 100000]
+        )
+        return {
+            "id": entry_id,
+            "name": f"Team {entry_id}",
+            "player_first_name": "Manager",
+            "player_last_name": str(entry_id),
+            "summary_overall_points": 1200,
+            "summary_overall_rank": entry_id,
+            "summary_event_points": 60,
+            "current_event": self.current_gameweek,
+            "last_deadline_value": 1000,
+            "leagues": {
+                "classic": [
+                    {
+                        "id": league_id,
+                        "name": f"League {league_id}",
+                        "created": "2024-07-20T12:00:00Z",
+                        "league_type": "x",
+                        "entry_rank": 1,
+                    }
+                    for league_id in leagues
+                ]
+            },
+        }
+
+    def history(self, query, entry_id):
+        rng = self._rng("history", int(entry_id))
+        total = 0
+        current = []
+        for gw in range(1, self.current_gameweek + 1):
+            points = rng.randint(20, 100)
+            total += points
+            current.append(
+                {
+                    "event": gw,
+                    "points": points,
+                    "total_points": total,
+                    "overall_rank": rng.randint(1, 10_000_000),
+                    "value": 1000 + gw,
+                    "event_transfers_cost": rng.choice([0, 0, 0, 4]),
+                    "points_on_bench": rng.randint(0, 15),
+                }
+            )
+        return {"current": current, "past": [], "chips": []}
+
+    def picks(self, query, entry_id, gameweek):
+        rng = self._rng("picks", int(entry_id), int(gameweek))
+        elements = rng.sample(range(1, self.players + 1), 15)
+        return {
+            "active_chip": None,
+            "entry_history": {"event_transfers_cost": 0, "bank": rng.randint(0, 30)},
+            "picks": [
+                {
+                    "element": element,
+                    "position": slot + 1,
+                    "multiplier": (2 if slot == 0 else 1) if slot < 11 else 0,
+                    "is_captain": slot == 0,
+                    "is_vice_captain": slot == 1,
+                }
+                for slot, element in enumerate(elements)
+            ],
+        }
+
+    def element_summary(self, query, player_id):
+        player_id = int(player_id)
+        if not 1 <= player_id <= self.players:
+            return None
+        team = self._bootstrap()["elements"][player_id - 1]["team"]
+        rng = self._rng("element-summary", player_id)
+        history, upcoming = [], []
+        for fixture in self._all_fixtures():
+            if team not in (fixture["team_h"], fixture["team_a"]):
+                continue
+            was_home = fixture["team_h"] == team
+            if not fixture["finished"]:
+                upcoming.append(
+                    {
+                        "id": fixture["id"],
+                        "event": fixture["event"],
+                        "team_h": fixture["team_h"],
+                        "team_a": fixture["team_a"],
+                        "is_home": was_home,
+                        "difficulty": fixture[
+                            "team_h_difficulty" if was_home else "team_a_difficulty"
+                        ],
+                    }
+                )
+                continue
+            minutes = rng.choice([0, 0, 20, 90, 90, 90])
+            history.append(
+                {
+                    "element": player_id,
+                    "fixture": fixture["id"],
+                    "opponent_team": fixture["team_a" if was_home else "team_h"],
+                    "was_home": was_home,
+                    "round": fixture["event"],
+                    "minutes": minutes,
+                    "total_points": rng.randint(1, 12) if minutes else 0,
+                    "goals_scored": rng.choice([0, 0, 0, 1]) if minutes else 0,
+                    "assists": rng.choice([0, 0, 0, 1]) if minutes else 0,
+                    "clean_sheets": rng.choice([0, 1]) if minutes >= 60 else 0,
+                    "goals_conceded": rng.randint(0, 3) if minutes else 0,
+                    "saves": 0,
+                    "bonus": rng.choice([0, 0, 0, 1, 2, 3]) if minutes else 0,
+                    "bps": rng.randint(0, 40) if minutes else 0,
+                    "yellow_cards": 0,
+                    "red_cards": 0,
+                    "expected_goals": f"{rng.random() / 2:.2f}",
+                    "expected_assists": f"{rng.random() / 3:.2f}",
+                    "value": 50 + player_id % 70,
+                    "selected": rng.randint(0, 5_000_000),
+                }
+            )
+        return {"history": history, "fixtures": upcoming, "history_past": []}
+
+    def live(self, query, event_id):
+        rng = self._rng("live", int(event_id))
+        return {
+            "elements": [
+                {
+                    "id": i,
+                    "stats": {
+                        "minutes": minutes,
+                        "goals_scored": rng.choice([0, 0, 0, 1]),
+                        "assists": rng.choice([0, 0, 0, 1]),
+                        "clean_sheets": rng.choice([0, 1]),
+                        "goals_conceded": rng.randint(0, 3),
+                        "saves": rng.randint(0, 4),
+                        "bonus": rng.choice([0, 0, 0, 1, 2, 3]),
+                        "bps": rng.randint(0, 40),
+                        "yellow_cards": rng.choice([0, 0, 0, 1]),
+                        "red_cards": 0,
+                        "total_points": rng.randint(0, 12) if minutes else 0,
+                        "expected_goals": f"{rng.random() / 2:.2f}",
+                        "expected_assists": f"{rng.random() / 3:.2f}",
+                    },
+                }
+                for i in range(1, self.players + 1)
+                for minutes in [rng.choice([0, 0, 45, 90, 90])]
+            ]
+        }
+
+
+class StubServer:
+    """
+    Serves a StubFPL over HTTP on a background thread, with injected latency
+    and a random fraction of 503 responses. ``calls`` counts requests per
+    route (plus ``errors``).
+    """
+
+    def __init__(
+        self,
+        api: StubFPL,
+        port: int = 0,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 7,
+    ):
+        self.api = api
+        self.latency = latency
+        self.error_rate = error_rate
+        self.calls: Counter = Counter()
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = parse_qs(url.query)
+                for pattern, name, view in stub.api.routes:
+                    match = pattern.match(url.path)
+                    if match:
+                        break
+                else:
+                    return self._send(404, {"detail": "Not found."})
+
+                with stub._lock:
+                    stub.calls[name] += 1
+                    failed = stub._rng.random() < stub.error_rate
+                    if failed:
+                        stub.calls["errors"] += 1
+                if stub.latency:
+                    time.sleep(stub.latency)
+                if failed:
+                    return self._send(503, {"detail": "Service unavailable."})
+
+                payload = view(query, *match.groups())
+                if payload is None:
+                    return self._send(404, {"detail": "Not found."})
+                self._send(200, payload)
+
+            def _send(self, status, payload):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(
+            target=self.httpd.serve_forever, name="stub-fpl", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--leagues", type=int, default=1)
+    parser.add_argument("--entries", type=int, default=200)
+    parser.add_argument("--players", type=int, default=700)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = StubServer(
+        StubFPL(args.leagues, args.entries, args.players),
+        port=args.port,
+        latency=args.latency_ms / 1000,
+        error_rate=args.error_rate,
+    )
+    print(f"Stub FPL API on {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
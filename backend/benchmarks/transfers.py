@@ -0,0 +1,94 @@
+"""
+Time the transfer optimizer on a synthetic player pool.
+
+Run from backend/:
+    python -m benchmarks.transfers --players 700 --iterations 50
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from services.player_index import PlayerIndex
+from services.transfers import best_squad, best_transfers, candidates
+
+POSITION_SHARE = [0.1, 0.35, 0.4, 0.15]
+
+
+def synthetic_index(n, seed=42):
+    """Points loosely track price, and a few strong teams hold the best players."""
+    rng = np.random.default_rng(seed)
+    position = rng.choice([1, 2, 3, 4], size=n, p=POSITION_SHARE)
+    team = rng.integers(1, 21, size=n)
+    strength = np.linspace(1.4, 0.7, 20)[team - 1]
+    cost = np.round(rng.gamma(2.0, 1.2, size=n) + 3.8, 1).clip(max=15.0)
+    points = (rng.normal(cost * 14 * strength, 20)).clip(min=0).astype(np.int64)
+    ids = np.arange(1, n + 1)
+    columns = {
+        "player_id": ids,
+        "total_points": points,
+        "cost": cost,
+        "position_type_id": position,
+        "team_id": team,
+        "player_name": np.array([f"Player {i}" for i in ids]),
+        "position": np.array([str(p) for p in position]),
+        "team": np.array([f"Team {t}" for t in team]),
+    }
+    return PlayerIndex(columns)
+
+
+def cheapest_squad(cands):
+    squad = []
+    for position, slots in ((1, 2), (2, 5), (3, 5), (4, 3)):
+        rows = np.flatnonzero(cands.position == position)
+        squad += rows[np.argsort(cands.cost[rows])][:slots].tolist()
+    return cands.index.columns["player_id"][squad].tolist()
+
+
+def timed(label, fn, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    print(
+        f"{label:<14} p50={samples[len(samples) // 2] * 1000:8.2f}ms  "
+        f"max={samples[-1] * 1000:8.2f}ms"
+    )
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--players", type=int, default=700)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    index = synthetic_index(args.players)
+    start = time.perf_counter()
+    cands = candidates(index)
+    print(
+        f"candidate lists: {(time.perf_counter() - start) * 1000:.1f}ms, "
+        f"{sum(len(r) for r in cands.by_position.values())} of {index.size} kept"
+    )
+
+    squad = cheapest_squad(cands)
+    for k in (1, 2):
+        options = timed(
+            f"{k} transfer(s)",
+            lambda: best_transfers(cands, squad, bank=50, max_transfers=k),
+            args.iterations,
+        )
+        print(f"  gain {options[-1]['gain']:.0f}")
+
+    result = timed("squad rebuild", lambda: best_squad(cands), args.iterations)
+    print(
+        f"  score {result['score']:.0f}, cost {result['cost']}, "
+        f"optimal={result['optimal']}, nodes={result['nodes']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
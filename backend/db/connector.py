@@ -2,7 +2,7 @@ import logging
 import time
 from typing import Optional, List, Dict, Any, Generator
 
-from sqlalchemy import create_engine, text, insert
+from sqlalchemy import create_engine, text, insert, or_
 from sqlalchemy.dialects import postgresql
 from sqlalchemy.engine import Engine, Result
 from sqlalchemy.orm import sessionmaker, Session as OrmSession
@@ -140,32 +140,59 @@ class SQLAlchemyConnector:
             return False
 
     def batch_upsert_on_conflict(
-        self, table, data: List[Dict[str, Any]], conflict_target: List[str]
-    ) -> bool:
-        """Upsert rows based on PostgreSQL's ON CONFLICT DO UPDATE."""
+        self,
+        table,
+        data: List[Dict[str, Any]],
+        conflict_target: List[str],
+        partial: bool = False,
+    ) -> Optional[int]:
+        """
+        Upsert rows based on PostgreSQL's ON CONFLICT DO UPDATE.
+
+        With ``partial``, only the columns present in the rows are updated,
+        so rows carrying a subset of the table's columns leave the rest
+        alone. Existing rows whose values would not change are skipped by a
+        ``WHERE ... IS DISTINCT FROM`` guard, costing no dead tuple or WAL.
+        Returns the number of rows inserted or changed, or None on failure.
+        """
         if not data:
-            return True
+            return 0
 
         insert_stmt = postgresql.insert(table).values(data)
 
+        present = data[0].keys() if partial else None
         update_cols = {
             c.name: getattr(insert_stmt.excluded, c.name)
             for c in table.columns
-            if c.name not in conflict_target
+            if c.name not in conflict_target and (present is None or c.name in present)
         }
 
-        do_update_stmt = insert_stmt.on_conflict_do_update(
-            index_elements=conflict_target,
-            set_=update_cols,
-        )
+        if update_cols:
+            upsert_stmt = insert_stmt.on_conflict_do_update(
+                index_elements=conflict_target,
+                set_=update_cols,
+                where=or_(
+                    *(
+                        table.c[name].is_distinct_from(value)
+                        for name, value in update_cols.items()
+                    )
+                ),
+            )
+        else:
+            upsert_stmt = insert_stmt.on_conflict_do_nothing(
+                index_elements=conflict_target
+            )
         try:
             with self.engine.begin() as conn:
-                conn.execute(do_update_stmt)
-            logging.info(f"Batch upsert on {table.name} succeeded.")
-            return True
+                changed = conn.execute(upsert_stmt).rowcount
+            logging.info(
+                f"Batch upsert on {table.name} succeeded: "
+                f"{changed} of {len(data)} rows changed."
+            )
+            return changed
         except Exception as e:
             logging.error(f"Batch upsert failed for {table.name}: {e}")
-            return False
+            return None
 
     def get_session(self) -> OrmSession:
         return self.SessionLocal()
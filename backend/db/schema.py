@@ -8,6 +8,7 @@ from sqlalchemy import (
     DateTime,
     MetaData,
     PrimaryKeyConstraint,
+    Index,
     func,
 )
 from sqlalchemy.schema import CreateSchema
@@ -109,6 +110,27 @@ players = Table(
     Column("red_cards", Integer),
 )
 
+# Keyset pagination indexes for /api/players sort orders, NULLs last both
+# ways: ascending is the default index order, descending needs its own
+Index("players_total_points_idx", players.c.total_points, players.c.player_id)
+Index("players_cost_idx", players.c.cost, players.c.player_id)
+Index("players_minutes_idx", players.c.minutes, players.c.player_id)
+Index(
+    "players_total_points_desc_idx",
+    players.c.total_points.desc().nulls_last(),
+    players.c.player_id.desc(),
+)
+Index(
+    "players_cost_desc_idx",
+    players.c.cost.desc().nulls_last(),
+    players.c.player_id.desc(),
+)
+Index(
+    "players_minutes_desc_idx",
+    players.c.minutes.desc().nulls_last(),
+    players.c.player_id.desc(),
+)
+
 teams = Table(
     "teams",
     metadata,
@@ -139,6 +161,185 @@ positions = Table(
     Column("singular_name", String),
     Column("plural_name", String),
 )
+
+entry_picks = Table(
+    "entry_picks",
+    metadata,
+    Column("entry_id", Integer, nullable=False),
+    Column("gameweek", Integer, nullable=False),
+    Column("position", Integer, nullable=False),  # squad slot 1-15; 12-15 bench
+    Column("player_id", Integer, nullable=False),
+    Column("multiplier", Integer),
+    Column("is_captain", Boolean),
+    Column("is_vice_captain", Boolean),
+    PrimaryKeyConstraint("entry_id", "gameweek", "position", name="entry_picks_pkey"),
+)
+
+entry_chips = Table(
+    "entry_chips",
+    metadata,
+    Column("entry_id", Integer, nullable=False),
+    Column("gameweek", Integer, nullable=False),
+    Column("active_chip", String),
+    Column("transfers_cost", Integer),
+    Column("bank", Integer),
+    PrimaryKeyConstraint("entry_id", "gameweek", name="entry_chips_pkey"),
+)
+
+league_gameweek_winners = Table(
+    "league_gameweek_winners",
+    metadata,
+    Column("league_id", Integer, nullable=False),
+    Column("gameweek", Integer, nullable=False),
+    Column("entry_id", Integer, nullable=False),
+    Column("rank", Integer, nullable=False),
+    Column("points", Integer),  # net of transfer costs
+    Column("tied", Boolean),
+    PrimaryKeyConstraint(
+        "league_id", "gameweek", "entry_id", name="league_gameweek_winners_pkey"
+    ),
+)
+
+# Shares of a league's entries with picks; only players someone in it owns
+league_ownership = Table(
+    "league_ownership",
+    metadata,
+    Column("league_id", Integer, nullable=False),
+    Column("gameweek", Integer, nullable=False),
+    Column("player_id", Integer, nullable=False),
+    Column("ownership", Float),  # share of entries with the player in their 15
+    Column("effective_ownership", Float),  # mean multiplier; captains count 2 (or 3)
+    Column("captaincy", Float),  # share of entries captaining the player
+    PrimaryKeyConstraint(
+        "league_id", "gameweek", "player_id", name="league_ownership_pkey"
+    ),
+)
+
+# Each entry's exposure against its league's effective ownership, in
+# multiplier units summed over players
+league_differentials = Table(
+    "league_differentials",
+    metadata,
+    Column("league_id", Integer, nullable=False),
+    Column("gameweek", Integer, nullable=False),
+    Column("entry_id", Integer, nullable=False),
+    Column("gain_exposure", Float),  # over the league: gains when they score
+    Column("loss_exposure", Float),  # under the league: loses when they score
+    Column("top_differential", Integer),  # player_id with the largest gain
+    PrimaryKeyConstraint(
+        "league_id", "gameweek", "entry_id", name="league_differentials_pkey"
+    ),
+)
+
+fixtures = Table(
+    "fixtures",
+    metadata,
+    Column("fixture_id", Integer, primary_key=True),
+    Column("gameweek", Integer),  # null while unscheduled
+    Column("kickoff_time", DateTime),
+    Column("team_h", Integer),
+    Column("team_a", Integer),
+    Column("team_h_difficulty", Integer),
+    Column("team_a_difficulty", Integer),
+    Column("team_h_score", Integer),
+    Column("team_a_score", Integer),
+    Column("finished", Boolean),
+)
+
+Index("fixtures_gameweek_idx", fixtures.c.gameweek)
+
+player_gameweek_stats = Table(
+    "player_gameweek_stats",
+    metadata,
+    Column("player_id", Integer, nullable=False),
+    Column("gameweek", Integer, nullable=False),
+    Column("minutes", Integer),
+    Column("goals_scored", Integer),
+    Column("assists", Integer),
+    Column("clean_sheets", Integer),
+    Column("goals_conceded", Integer),
+    Column("saves", Integer),
+    Column("bonus", Integer),
+    Column("bps", Integer),
+    Column("yellow_cards", Integer),
+    Column("red_cards", Integer),
+    Column("total_points", Integer),
+    Column("expected_goals", Float),
+    Column("expected_assists", Float),
+    # From element-summary history; double gameweeks are summed per gameweek
+    Column("fixture_count", Integer),
+    Column("value", Integer),  # price in tenths at the gameweek
+    Column("selected", Integer),  # number of managers owning the player
+    PrimaryKeyConstraint("player_id", "gameweek", name="player_gameweek_stats_pkey"),
+)
+
+# Last finished gameweek each player's element-summary history is stored up to
+player_history_syncs = Table(
+    "player_history_syncs",
+    metadata,
+    Column("player_id", Integer, primary_key=True),
+    Column("synced_through", Integer, nullable=False),
+    Column("synced_at", DateTime),
+)
+
+player_xpoints = Table(
+    "player_xpoints",
+    metadata,
+    Column("player_id", Integer, nullable=False),
+    Column("gameweek", Integer, nullable=False),
+    Column("xpoints", Float),
+    Column("inputs_hash", String),  # feature row digest; unchanged rows are skipped
+    Column("model_version", String),
+    Column("computed_at", DateTime),
+    PrimaryKeyConstraint("player_id", "gameweek", name="player_xpoints_pkey"),
+)
+
+# Distributed league crawl: standings pages and member fetches leased by
+# crawl workers with FOR UPDATE SKIP LOCKED
+crawl_items = Table(
+    "crawl_items",
+    metadata,
+    Column("item_id", Integer, primary_key=True, autoincrement=True),
+    Column("item_key", String, nullable=False, unique=True),  # kind:league:page/entry
+    Column("kind", String, nullable=False),  # league_page or entry
+    Column("priority", Integer, nullable=False),  # lower first; pages before entries
+    Column("league_id", Integer, nullable=False),
+    Column("page", Integer),
+    Column("entry_id", Integer),
+    Column("rank", Integer),  # standings row of an entry item
+    Column("total", Integer),
+    Column("status", String, nullable=False),  # pending, leased, done or failed
+    Column("attempts", Integer, nullable=False, server_default="0"),
+    Column("available_at", PG_TIMESTAMP(timezone=True), server_default=func.now()),
+    Column("leased_by", String),
+    Column("lease_expires", PG_TIMESTAMP(timezone=True)),
+    Column("last_error", String),
+)
+
+Index(
+    "crawl_items_pending_idx",
+    crawl_items.c.priority,
+    crawl_items.c.item_id,
+    postgresql_where=crawl_items.c.status == "pending",
+)
+Index("crawl_items_league_idx", crawl_items.c.league_id, crawl_items.c.status)
+Index(
+    "crawl_items_leased_idx",
+    crawl_items.c.lease_expires,
+    postgresql_where=crawl_items.c.status == "leased",
+)
+
+# Commit time of the latest sync write per table and key ("*" for writes
+# without keys); every process derives its HTTP validators from these
+sync_watermarks = Table(
+    "sync_watermarks",
+    metadata,
+    Column("table_name", String, nullable=False),
+    Column("key", String, nullable=False),
+    Column("synced_at", PG_TIMESTAMP(timezone=True), nullable=False),
+    PrimaryKeyConstraint("table_name", "key", name="sync_watermarks_pkey"),
+)
+
 users = Table(
     "users",
     metadata,
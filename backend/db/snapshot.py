@@ -0,0 +1,362 @@
+"""
+Export the fpl schema to a single snapshot file and restore it elsewhere,
+so a new API node or staging database is ready without re-running syncs.
+
+A snapshot is a tar archive holding ``manifest.json`` (format version,
+column layout, row counts and checksums) and one gzip-compressed
+``COPY ... (FORMAT binary)`` stream per table. Tables are exported in
+parallel from one exported transaction snapshot, so they are mutually
+consistent, and restored in parallel, one table per connection: each load
+truncates the table, drops its primary key and indexes, runs COPY FREEZE
+and only then rebuilds them.
+
+Run from backend/ (create the database first; tables are created as needed):
+    python -m db.snapshot export fpl.snapshot --jobs 4
+    python -m db.snapshot import fpl.snapshot --jobs 8
+    python -m db.snapshot inspect fpl.snapshot
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import tarfile
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy.schema import CreateIndex
+
+from db.connector import SQLAlchemyConnector
+from db.schema import metadata
+from services.change_events import record_change
+
+FORMAT = "fpl-snapshot"
+FORMAT_VERSION = 1
+
+# Accounts belong to their environment; pass --exclude none to copy them too
+DEFAULT_EXCLUDE = ("users",)
+
+
+def _qualified(table) -> str:
+    return f"{table.schema}.{table.name}"
+
+
+def _layout(table) -> List[List[str]]:
+    """Column names and types; binary COPY needs both to match on restore."""
+    return [[c.name, str(c.type)] for c in table.columns]
+
+
+class _HashingReader:
+    """File wrapper that digests everything read through it."""
+
+    def __init__(self, f):
+        self.f = f
+        self.sha256 = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.f.read(size)
+        self.sha256.update(data)
+        return data
+
+
+def _export_table(db, table, snapshot_id: str, directory: str, level: int):
+    raw = db.engine.raw_connection()
+    try:
+        conn = raw.driver_connection
+        conn.set_session(isolation_level="REPEATABLE READ", readonly=True)
+        with conn.cursor() as cursor:
+            cursor.execute("SET TRANSACTION SNAPSHOT %s", (snapshot_id,))
+            path = os.path.join(directory, f"{table.name}.bin.gz")
+            columns = ", ".join(c.name for c in table.columns)
+            with gzip.open(path, "wb", compresslevel=level) as out:
+                cursor.copy_expert(
+                    f"COPY {_qualified(table)} ({columns}) TO STDOUT WITH (FORMAT binary)",
+                    out,
+                )
+            rows = cursor.rowcount
+        conn.rollback()
+    finally:
+        raw.close()
+
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha256.update(chunk)
+    return {
+        "file": f"tables/{table.name}.bin.gz",
+        "columns": _layout(table),
+        "rows": rows,  # -1 if the driver doesn't report COPY counts
+        "bytes": os.path.getsize(path),
+        "sha256": sha256.hexdigest(),
+    }
+
+
+def export_snapshot(
+    db: SQLAlchemyConnector,
+    path: str,
+    exclude: Iterable[str] = DEFAULT_EXCLUDE,
+    jobs: int = 4,
+    level: int = 6,
+) -> Dict[str, Any]:
+    """Write every fpl table not in ``exclude`` to the snapshot at ``path``."""
+    tables = [t for t in metadata.sorted_tables if t.name not in set(exclude)]
+    start = time.perf_counter()
+
+    # Workers join this transaction's snapshot, so all tables agree
+    leader = db.engine.raw_connection()
+    try:
+        conn = leader.driver_connection
+        conn.set_session(isolation_level="REPEATABLE READ", readonly=True)
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_export_snapshot(), current_setting('server_version')"
+            )
+            snapshot_id, server_version = cursor.fetchone()
+
+        with tempfile.TemporaryDirectory(
+            dir=os.path.dirname(os.path.abspath(path))
+        ) as tmp:
+            with ThreadPoolExecutor(max_workers=jobs) as executor:
+                exported = dict(
+                    zip(
+                        (t.name for t in tables),
+                        executor.map(
+                            lambda t: _export_table(db, t, snapshot_id, tmp, level),
+                            tables,
+                        ),
+                    )
+                )
+            conn.rollback()
+
+            manifest = {
+                "format": FORMAT,
+                "version": FORMAT_VERSION,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "server_version": server_version,
+                "schema": metadata.schema,
+                "tables": exported,
+            }
+            manifest_path = os.path.join(tmp, "manifest.json")
+            with open(manifest_path, "w") as f:
+                json.dump(manifest, f, indent=2)
+
+            # Members are already compressed; the archive only bundles them
+            partial = path + ".partial"
+            with tarfile.open(partial, "w") as archive:
+                archive.add(manifest_path, arcname="manifest.json")
+                for name in exported:
+                    archive.add(
+                        os.path.join(tmp, f"{name}.bin.gz"),
+                        arcname=exported[name]["file"],
+                    )
+            os.replace(partial, path)
+    finally:
+        leader.close()
+
+    rows = sum(t["rows"] for t in exported.values())
+    print(
+        f"📦 Exported {len(exported)} tables, {rows} rows, "
+        f"{os.path.getsize(path) / 2**20:.1f} MiB in {time.perf_counter() - start:.1f}s"
+    )
+    return manifest
+
+
+def read_manifest(path: str) -> Dict[str, Any]:
+    with tarfile.open(path, "r") as archive:
+        manifest = json.load(archive.extractfile("manifest.json"))
+    if manifest.get("format") != FORMAT:
+        raise ValueError(f"{path} is not an fpl snapshot")
+    if manifest["version"] > FORMAT_VERSION:
+        raise ValueError(
+            f"Snapshot format {manifest['version']} is newer than supported "
+            f"({FORMAT_VERSION})"
+        )
+    return manifest
+
+
+def _load_table(db, table, entry: Dict[str, Any], path: str) -> int:
+    qualified = _qualified(table)
+    pk_name = table.primary_key.name or f"{table.name}_pkey"
+    pk_columns = ", ".join(c.name for c in table.primary_key.columns)
+    columns = ", ".join(name for name, _ in entry["columns"])
+
+    raw = db.engine.raw_connection()
+    try:
+        with tarfile.open(path, "r") as archive, raw.cursor() as cursor:
+            # TRUNCATE in the same transaction lets COPY FREEZE skip the
+            # visibility work a later VACUUM would otherwise do
+            cursor.execute(f"TRUNCATE {qualified}")
+            for index in table.indexes:
+                cursor.execute(f"DROP INDEX IF EXISTS {table.schema}.{index.name}")
+            if pk_columns:
+                cursor.execute(
+                    f'ALTER TABLE {qualified} DROP CONSTRAINT IF EXISTS "{pk_name}"'
+                )
+
+            reader = _HashingReader(archive.extractfile(entry["file"]))
+            with gzip.GzipFile(fileobj=reader, mode="rb") as stream:
+                cursor.copy_expert(
+                    f"COPY {qualified} ({columns}) FROM STDIN WITH (FORMAT binary, FREEZE)",
+                    stream,
+                )
+            reader.read()
+            if reader.sha256.hexdigest() != entry["sha256"]:
+                raise ValueError(f"Checksum mismatch for {table.name}")
+            rows = cursor.rowcount
+            if min(rows, entry["rows"]) >= 0 and rows != entry["rows"]:
+                raise ValueError(
+                    f"{table.name}: loaded {rows} rows, snapshot has {entry['rows']}"
+                )
+
+            if pk_columns:
+                cursor.execute(
+                    f'ALTER TABLE {qualified} ADD CONSTRAINT "{pk_name}" '
+                    f"PRIMARY KEY ({pk_columns})"
+                )
+            for index in table.indexes:
+                cursor.execute(
+                    str(CreateIndex(index).compile(dialect=db.engine.dialect))
+                )
+            column = table.autoincrement_column
+            if column is not None:
+                cursor.execute(
+                    f"SELECT setval(pg_get_serial_sequence('{qualified}', '{column.name}'), "
+                    f"COALESCE(MAX({column.name}), 0) + 1, false) FROM {qualified}"
+                )
+        raw.commit()
+    except Exception:
+        raw.rollback()
+        raise
+    finally:
+        raw.close()
+    return rows
+
+
+def import_snapshot(
+    db: SQLAlchemyConnector,
+    path: str,
+    jobs: int = 4,
+    tables: Optional[Iterable[str]] = None,
+) -> Dict[str, int]:
+    """
+    Replace the contents of the snapshot's tables (or just ``tables``) with
+    the snapshot's rows. Each table loads in its own transaction, so a
+    failed table keeps its previous contents. Returns rows per table.
+    """
+    manifest = read_manifest(path)
+    by_name = {t.name: t for t in metadata.sorted_tables}
+    names = list(tables or manifest["tables"])
+
+    problems = []
+    for name in names:
+        if name not in by_name:
+            problems.append(f"{name}: not in this schema")
+        elif name not in manifest["tables"]:
+            problems.append(f"{name}: not in the snapshot")
+        elif manifest["tables"][name]["columns"] != _layout(by_name[name]):
+            problems.append(f"{name}: columns differ")
+    if problems:
+        raise ValueError("Snapshot doesn't match the schema: " + "; ".join(problems))
+
+    with db.engine.begin() as conn:
+        conn.exec_driver_sql(f"CREATE SCHEMA IF NOT EXISTS {metadata.schema}")
+        metadata.create_all(conn, tables=[by_name[name] for name in names])
+
+    start = time.perf_counter()
+    # Largest first, so one big table doesn't start last and run alone
+    names.sort(key=lambda name: -manifest["tables"][name]["bytes"])
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        loaded = dict(
+            zip(
+                names,
+                executor.map(
+                    lambda name: _load_table(
+                        db, by_name[name], manifest["tables"][name], path
+                    ),
+                    names,
+                ),
+            )
+        )
+
+    with db.engine.connect() as conn:
+        conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+        for name in names:
+            conn.exec_driver_sql(f"ANALYZE {_qualified(by_name[name])}")
+    # Running API processes drop whatever they cached from the old contents
+    for name in names:
+        record_change(db, name)
+
+    print(
+        f"📥 Restored {len(loaded)} tables, {sum(loaded.values())} rows "
+        f"from {manifest['created_at']} in {time.perf_counter() - start:.1f}s"
+    )
+    return loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="write a snapshot")
+    export.add_argument("path")
+    export.add_argument(
+        "--exclude",
+        nargs="+",
+        default=list(DEFAULT_EXCLUDE),
+        help="tables to leave out ('none' for none; default: users)",
+    )
+    export.add_argument("--level", type=int, default=6, help="gzip level, 1-9")
+
+    restore = commands.add_parser("import", help="restore a snapshot")
+    restore.add_argument("path")
+    restore.add_argument("--tables", nargs="+", help="only these tables")
+
+    inspect = commands.add_parser("inspect", help="print a snapshot's manifest")
+    inspect.add_argument("path")
+
+    for command in (export, restore):
+        command.add_argument("--jobs", type=int, default=4, help="parallel tables")
+        command.add_argument(
+            "--db-host", default=os.environ.get("DB_HOST", "localhost")
+        )
+        command.add_argument("--db-name", default=os.environ.get("DB_NAME", "fpl_db"))
+        command.add_argument("--db-user", default=os.environ.get("DB_USER", "bcheye"))
+        command.add_argument(
+            "--db-password", default=os.environ.get("DB_PASSWORD", "password")
+        )
+    args = parser.parse_args()
+
+    if args.command == "inspect":
+        manifest = read_manifest(args.path)
+        print(
+            f"{manifest['format']} v{manifest['version']}, created "
+            f"{manifest['created_at']} on PostgreSQL {manifest['server_version']}"
+        )
+        for name, entry in manifest["tables"].items():
+            print(
+                f"  {name:<32}{entry['rows']:>12} rows{entry['bytes'] / 2**20:>10.1f} MiB"
+            )
+        return
+
+    db = SQLAlchemyConnector(
+        user=args.db_user,
+        password=args.db_password,
+        host=args.db_host,
+        database=args.db_name,
+    )
+    try:
+        if args.command == "export":
+            exclude = [] if args.exclude == ["none"] else args.exclude
+            export_snapshot(db, args.path, exclude, args.jobs, args.level)
+        else:
+            import_snapshot(db, args.path, args.jobs, args.tables)
+    finally:
+        db.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Production serving: preforked gunicorn workers sharing one reference snapshot.
+
+Run from backend/:
+    gunicorn -c gunicorn.conf.py run:app
+
+The app is imported once in the master (preload_app), which also builds the
+reference snapshot (players, teams, positions, gameweeks) before forking, so
+every worker maps the same read-only pages instead of loading its own copy.
+"""
+
+import multiprocessing
+import os
+
+bind = os.environ.get("BIND", "0.0.0.0:5000")
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+# Per-process pools (e.g. the league simulator) size themselves from this
+os.environ["WEB_CONCURRENCY"] = str(workers)
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+preload_app = True
+timeout = 120
+
+
+def when_ready(server):
+    from routes.api import db, reference
+
+    reference.preload()
+    # Don't let workers inherit the master's pooled connections
+    db.engine.dispose()
+
+
+def post_fork(server, worker):
+    from routes.api import change_listener, db, scheduler
+
+    db.engine.dispose(close=False)
+    change_listener.start()
+    # Every worker competes for the scheduler lock; one runs the syncs
+    if os.environ.get("FPL_SCHEDULER", "1") != "0":
+        scheduler.start()
@@ -0,0 +1,31 @@
+"""
+Streaming server for /api/live/stream, kept apart from the API workers.
+
+Run from backend/, next to the API server:
+    gunicorn -c gunicorn_stream.conf.py stream:app
+
+A server-sent event stream holds its thread for as long as the client
+watches, so streams would starve the API workers' small thread pools. Here
+one process with many threads serves the viewers; each thread mostly waits
+on its queue. Route /api/live/stream to this server (e.g. in the reverse
+proxy) and everything else to gunicorn.conf.py. Live updates come from the
+API server's scheduler leader over LISTEN/NOTIFY; this server polls nothing.
+"""
+
+import os
+
+bind = os.environ.get("STREAM_BIND", "0.0.0.0:5001")
+workers = int(os.environ.get("STREAM_WORKERS", 1))
+worker_class = "gthread"
+threads = int(os.environ.get("STREAM_THREADS", 500))
+# gthread caps open connections per worker at worker_connections
+worker_connections = threads
+timeout = 120
+
+
+def post_fork(server, worker):
+    from routes.api import change_listener, db
+
+    db.engine.dispose(close=False)
+    # Feeds the live deltas to this process; the scheduler isn't started here
+    change_listener.start()
@@ -1,26 +1,63 @@
-from flask import Blueprint, jsonify, request
+import base64
+import json
+import os
+import secrets
+from functools import wraps
+
+from flask import Blueprint, Response, g, jsonify, request, stream_with_context
 from werkzeug.security import generate_password_hash, check_password_hash
 
+from routes.caching import cached_response, conditional_response
+from routes.encoding import compress_response, encoded_rows
+from services.auth_tokens import SessionTokens
+from services.change_events import ChangeListener
+from services.crawl import CrawlQueue
 from services.data_sync import FPLDataSync
+from services.gameweek_winners import league_winners
+from services.live import LIVE_CHANNEL, LiveBroker, LiveFeed, LivePoller
+from services.live_scoring import LiveLeagueScorer
+from services.ownership import (
+    LeagueOwnership,
+    entry_differential_rows,
+    league_differential_rows,
+    league_ownership_rows,
+)
+from services.player_index import joined_players_query
+from services.reference import ReferenceStore
+from services.scheduler import SyncScheduler
+from services.simulation import LeagueSimulator
+from services.transfers import (
+    DEFAULT_BUDGET,
+    best_squad,
+    best_transfers,
+    candidates,
+    load_squad,
+)
+from services.xpoints import XPointsPipeline
 from db.connector import SQLAlchemyConnector
 from db.schema import (
     players,
     mini_leagues,
     mini_league_entries,
     mini_league_gameweek_scores,
-    teams,
-    positions,
     overview,
-    gameweeks,
     gameweek_history,
     users,
+    player_xpoints,
+    player_gameweek_stats,
 )
-from sqlalchemy import select, func, desc
+from sqlalchemy import select, func, asc, desc, or_, tuple_
+from sqlalchemy.dialects import postgresql
 
 api_bp = Blueprint("api", __name__)
 
 auth_bp = Blueprint("auth", __name__)
 
+# Long-lived streams, served apart from the API workers (see stream.py)
+stream_bp = Blueprint("stream", __name__)
+
+api_bp.after_request(compress_response)
+
 db = SQLAlchemyConnector(
     user="bcheye",
     password="password",
@@ -29,13 +66,59 @@ db = SQLAlchemyConnector(
     debug=True,
 )
 
-data_sync = FPLDataSync(db)
+data_sync = FPLDataSync(db, base_url=os.environ.get("FPL_BASE_URL"))
+
+# Set SECRET_KEY in production; a random key invalidates tokens on restart
+tokens = SessionTokens(os.environ.get("SECRET_KEY") or secrets.token_hex(32))
+
+# Created at import so a preforking server can preload it in the master
+reference = ReferenceStore(db)
+
+live_broker = LiveBroker()
+# Every process follows the live feed; only the scheduler leader's poller
+# fetches upstream and broadcasts what changed
+live_feed = LiveFeed(db, live_broker)
+live_poller = LivePoller(data_sync, live_feed)
+live_scorer = LiveLeagueScorer(
+    db, live_feed, live_broker, lambda: reference.get().players
+)
+live_feed.listeners.append(live_scorer.on_tick)
+
+simulator = LeagueSimulator(db)
+xpoints_pipeline = XPointsPipeline(db)
+ownership = LeagueOwnership(db)
+# Leagues queued here are crawled by `python -m services.crawl` workers
+crawl_queue = CrawlQueue(db)
+
+# Started by run.py and gunicorn's post_fork unless FPL_SCHEDULER=0
+scheduler = SyncScheduler(
+    data_sync,
+    xpoints_pipeline,
+    ownership=ownership,
+    live=live_poller,
+)
+
+# One per process, started alongside the scheduler: applies other
+# processes' sync writes to this process's data versions
+change_listener = ChangeListener(db)
+change_listener.listen(LIVE_CHANNEL, live_feed.apply, on_reconnect=live_feed.reset)
+
+
+@api_bp.before_request
+def _refresh_reference():
+    # Picks up snapshots published by other workers before any cached
+    # response is looked up
+    reference.get()
 
 
 @api_bp.route("/sync/bootstrap", methods=["POST"])
 def sync_bootstrap():
     try:
-        data_sync.sync_bootstrap_data()
+        stored = data_sync.sync_bootstrap_data()
+        # Publish now so the first reader after a sync doesn't pay for it
+        reference.get()
+        if not stored:
+            return jsonify({"status": "partial"}), 207
         return jsonify({"status": "success"}), 200
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 500
@@ -61,69 +144,394 @@ def sync_gameweeks_history(entry_id):
         return jsonify({"status": "error", "message": str(e)})
 
 
+@api_bp.route("/sync/fixtures", methods=["POST"])
+def sync_fixtures():
+    try:
+        if not data_sync.sync_fixtures():
+            return jsonify({"status": "failed"}), 400
+        xpoints_pipeline.run()
+        return jsonify({"status": "success"}), 200
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+
+@api_bp.route("/sync/live/<int:gameweek>", methods=["POST"])
+def sync_live_gameweek(gameweek):
+    try:
+        if not data_sync.sync_live_gameweek_data(gameweek):
+            return jsonify({"status": "partial"}), 207
+        return jsonify({"status": "success"}), 200
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+
+@api_bp.route("/sync/xpoints", methods=["POST"])
+def sync_xpoints():
+    gameweek = request.args.get("gameweek", type=int)
+    force = request.args.get("force", default="false") == "true"
+    try:
+        updated = xpoints_pipeline.run(gameweek, force=force)
+        return jsonify({"status": "success", "updated": updated}), 200
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+
+@api_bp.route("/sync/ownership", methods=["POST"])
+def sync_ownership():
+    gameweek = request.args.get("gameweek", type=int)
+    force = request.args.get("force", default="false") == "true"
+    try:
+        leagues = ownership.run(gameweek, force=force)
+        return jsonify({"status": "success", "leagues": leagues}), 200
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+
+@api_bp.route("/sync/element-summaries", methods=["POST"])
+def sync_element_summaries():
+    force = request.args.get("force", default="false") == "true"
+    try:
+        fetched = data_sync.sync_element_summaries(force=force)
+        return jsonify({"status": "success", "fetched": fetched}), 200
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+
+@api_bp.route("/sync/crawl", methods=["POST"])
+def enqueue_crawl():
+    """Queue league crawls for the crawl workers. Body: {"league_ids": [...]}"""
+    league_ids = (request.get_json(silent=True) or {}).get("league_ids")
+    if not league_ids or not all(isinstance(i, int) for i in league_ids):
+        return (
+            jsonify({"status": "error", "message": "league_ids must be integers"}),
+            400,
+        )
+    try:
+        queued = crawl_queue.enqueue_leagues(league_ids)
+        return jsonify({"status": "success", "queued": queued}), 202
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+
+@api_bp.route("/sync/crawl", methods=["GET"])
+def get_crawl_status():
+    """Crawl items by kind and status, and how many workers hold leases."""
+    return jsonify(crawl_queue.status())
+
+
+@api_bp.route("/sync/schedule", methods=["GET"])
+def get_sync_schedule():
+    """Scheduled sync jobs as seen by this process (only the leader runs them)."""
+    return jsonify(scheduler.status())
+
+
+def _query_gameweek_history(conn, entry_id):
+    result = conn.execute(
+        gameweek_history.select().where(gameweek_history.c.entry_id == entry_id)
+    )
+    return [dict(row) for row in result.mappings()]
+
+
+def _query_overview(conn, entry_id, current_gw):
+    query = select(overview).where(
+        (overview.c.entry_id == entry_id) & (overview.c.current_gameweek == current_gw)
+    )
+    row = conn.execute(query).mappings().first()
+    return dict(row) if row else None
+
+
+PLAYER_SORT_COLUMNS = ("total_points", "cost", "minutes")
+MAX_PLAYERS_PAGE = 500
+
+
+def _encode_cursor(sort, order, row):
+    payload = json.dumps([sort, order, row[sort], row["player_id"]])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def _decode_cursor(cursor, sort, order):
+    try:
+        c_sort, c_order, value, player_id = json.loads(
+            base64.urlsafe_b64decode(cursor.encode())
+        )
+    except (ValueError, TypeError):
+        raise ValueError("Malformed cursor")
+    if (c_sort, c_order) != (sort, order):
+        raise ValueError("Cursor does not match the requested sort")
+    return value, player_id
+
+
+@api_bp.route("/sync/picks/<int:league_id>/<int:gameweek>", methods=["POST"])
+def sync_league_picks(league_id, gameweek):
+    # Ownership is recomputed by the scheduler or POST /sync/ownership
+    try:
+        synced = data_sync.sync_league_picks(league_id, gameweek)
+        if synced:
+            return jsonify({"status": "success"}), 200
+        return jsonify({"status": "partial"}), 207
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+
+@api_bp.route("/leagues/<int:league_id>/live", methods=["GET"])
+def get_league_live_scores(league_id):
+    """
+    Live standings for a league in the current gameweek, scored from the
+    latest live data the scheduler stored (and rescored only when it changed)
+    """
+    gameweek = reference.get().current_gameweek
+    standings = live_scorer.league(league_id, gameweek) if gameweek else None
+    if standings is None:
+        return (
+            jsonify({"success": False, "message": "No live scores for this league"}),
+            404,
+        )
+    return jsonify(standings)
+
+
+@api_bp.route("/leagues/<int:league_id>/winners", methods=["GET"])
+@conditional_response(
+    ("league_gameweek_winners", "league_id"),
+    "mini_league_entries",
+    "mini_league_gameweek_scores",
+)
+@cached_response(
+    ("league_gameweek_winners", "league_id"),
+    "mini_league_entries",
+    "mini_league_gameweek_scores",
+)
+def get_league_winners(league_id):
+    """
+    Gameweek winners of a mini-league, ranked on points net of transfer costs
+    Optional query parameters:
+    - top: entries to return per gameweek, ties included (default: 1)
+    """
+    top = request.args.get("top", default=1, type=int)
+    if top < 1:
+        return jsonify({"success": False, "message": "top must be at least 1"}), 400
+
+    with db.engine.connect() as conn:
+        return jsonify(league_winners(conn, league_id, top))
+
+
+@api_bp.route("/leagues/<int:league_id>/ownership", methods=["GET"])
+@conditional_response(("league_ownership", "league_id"), "players")
+@cached_response(("league_ownership", "league_id"), "players")
+def get_league_ownership(league_id):
+    """
+    Players a mini-league owns, by effective ownership (mean multiplier, so
+    captains count double), with ownership and captaincy shares
+    Optional query parameters:
+    - gameweek: gameweek of the picks (default: latest computed)
+    - limit: number of players to return (default: 100, max: 1000)
+    - format: rows, columnar or msgpack (or negotiate via the Accept header)
+    """
+    gameweek = request.args.get("gameweek", type=int)
+    limit = min(request.args.get("limit", default=100, type=int), 1000)
+    if limit < 1:
+        return jsonify({"success": False, "message": "limit must be at least 1"}), 400
+    with db.engine.connect() as conn:
+        return encoded_rows(league_ownership_rows(conn, league_id, gameweek, limit))
+
+
+@api_bp.route("/leagues/<int:league_id>/differentials", methods=["GET"])
+@conditional_response(("league_differentials", "league_id"), "mini_league_entries")
+@cached_response(("league_differentials", "league_id"), "mini_league_entries")
+def get_league_differentials(league_id):
+    """
+    Each entry's exposure above (gain) and below (loss) the league's
+    effective ownership, and its biggest differential
+    Optional query parameters:
+    - gameweek: gameweek of the picks (default: latest computed)
+    - format: rows, columnar or msgpack (or negotiate via the Accept header)
+    """
+    gameweek = request.args.get("gameweek", type=int)
+    with db.engine.connect() as conn:
+        return encoded_rows(league_differential_rows(conn, league_id, gameweek))
+
+
+@api_bp.route("/leagues/<int:league_id>/differentials/<int:entry_id>", methods=["GET"])
+@conditional_response(("league_ownership", "league_id"), ("entry_picks", "entry_id"))
+@cached_response(("league_ownership", "league_id"), ("entry_picks", "entry_id"))
+def get_entry_differentials(league_id, entry_id):
+    """
+    An entry's multiplier against the league's effective ownership for each
+    player the league owns, biggest differentials first
+    Optional query parameters:
+    - gameweek: gameweek of the picks (default: latest computed)
+    - format: rows, columnar or msgpack (or negotiate via the Accept header)
+    """
+    gameweek = request.args.get("gameweek", type=int)
+    with db.engine.connect() as conn:
+        return encoded_rows(
+            entry_differential_rows(conn, league_id, entry_id, gameweek)
+        )
+
+
+# Public and uncached for every new seed, so each request's cost is capped
+MAX_SIMULATION_TRIALS = 100_000
+
+
+@api_bp.route("/leagues/<int:league_id>/simulation", methods=["GET"])
+@conditional_response(
+    "gameweeks",
+    "gameweek_history",
+    "mini_league_entries",
+    "mini_league_gameweek_scores",
+)
+def get_league_simulation(league_id):
+    """
+    Each entry's chance of winning the league or finishing top 3, simulated
+    over the remaining gameweeks
+    Optional query parameters:
+    - trials: number of simulated seasons (default and max: 100000)
+    - seed: non-negative random seed for reproducible results
+    """
+    trials = request.args.get("trials", default=MAX_SIMULATION_TRIALS, type=int)
+    seed = request.args.get("seed", type=int)
+    if not 1 <= trials <= MAX_SIMULATION_TRIALS:
+        return (
+            jsonify(
+                {
+                    "success": False,
+                    "message": f"trials must be 1 to {MAX_SIMULATION_TRIALS}",
+                }
+            ),
+            400,
+        )
+    if seed is not None and seed < 0:
+        return jsonify({"success": False, "message": "seed must be >= 0"}), 400
+
+    gameweek = reference.get().current_gameweek
+    return jsonify(simulator.simulate(league_id, gameweek, trials, seed))
+
+
 @api_bp.route("/players", methods=["GET"])
+@conditional_response("players")
+@cached_response("players")
 def get_players():
+    """
+    Returns a page of players in a stable sort order using keyset pagination.
+    Optional query parameters:
+    - sort: total_points, cost or minutes (default: total_points)
+    - order: asc or desc (default: desc)
+    - position: filter by position type ID
+    - team: filter by team ID
+    - fields: comma-separated columns to return (default: all)
+    - limit: page size (default: 100, max: 500)
+    - cursor: next_cursor from the previous page
+    """
+    sort = request.args.get("sort", default="total_points")
+    order = request.args.get("order", default="desc")
+    limit = min(request.args.get("limit", default=100, type=int), MAX_PLAYERS_PAGE)
+    position = request.args.get("position", type=int)
+    team = request.args.get("team", type=int)
+    fields = [f for f in request.args.get("fields", default="").split(",") if f]
+
+    if sort not in PLAYER_SORT_COLUMNS or order not in ("asc", "desc"):
+        return jsonify({"success": False, "message": "Invalid sort or order"}), 400
+    if limit < 1:
+        return jsonify({"success": False, "message": "limit must be at least 1"}), 400
+    unknown = [f for f in fields if f not in players.c]
+    if unknown:
+        return (
+            jsonify(
+                {"success": False, "message": f"Unknown fields: {', '.join(unknown)}"}
+            ),
+            400,
+        )
+
+    sort_column = players.c[sort]
+    sort_key = tuple_(sort_column, players.c.player_id)
+    direction = desc if order == "desc" else asc
+    # The sort key is always selected so the next cursor can be built
+    names = list(fields) or [c.name for c in players.c]
+    names += [n for n in (sort, "player_id") if n not in names]
+    columns = [players.c[n] for n in names]
+
+    # Players without a value (e.g. inserted by a live sync) come last either way
+    query = select(*columns).order_by(
+        direction(sort_column).nulls_last(), direction(players.c.player_id)
+    )
+    if position:
+        query = query.where(players.c.position_type_id == position)
+    if team:
+        query = query.where(players.c.team == team)
+
+    cursor = request.args.get("cursor")
+    if cursor:
+        try:
+            value, player_id = _decode_cursor(cursor, sort, order)
+        except ValueError as e:
+            return jsonify({"success": False, "message": str(e)}), 400
+        if value is None:
+            # Already among the NULLs; only the player_id tie-break remains
+            after_id = (
+                players.c.player_id < player_id
+                if order == "desc"
+                else players.c.player_id > player_id
+            )
+            query = query.where(sort_column.is_(None) & after_id)
+        else:
+            after = tuple_(value, player_id)
+            # The row comparison is NULL for rows without a value, so they
+            # are matched separately
+            query = query.where(
+                or_(
+                    sort_key < after if order == "desc" else sort_key > after,
+                    sort_column.is_(None),
+                )
+            )
+
     with db.engine.connect() as conn:
-        result = conn.execute(players.select().limit(100))
-        return jsonify([dict(row) for row in result.mappings()])
+        # Fetch one extra row to learn whether another page exists
+        rows = [dict(row) for row in conn.execute(query.limit(limit + 1)).mappings()]
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(sort, order, rows[-1])
+    if fields:
+        rows = [{f: row[f] for f in fields} for row in rows]
+
+    return jsonify({"players": rows, "next_cursor": next_cursor})
 
 
 @api_bp.route("/gameweeks/<int:entry_id>", methods=["GET"])
+@conditional_response(("gameweek_history", "entry_id"))
 def get_gameweeks_history_data(entry_id):
     with db.engine.connect() as conn:
-        result = conn.execute(
-            gameweek_history.select().where(gameweek_history.c.entry_id == entry_id)
-        )
-        return jsonify([dict(row) for row in result.mappings()])
+        return encoded_rows(_query_gameweek_history(conn, entry_id))
 
 
 @api_bp.route("/top_performing_players", methods=["GET"])
+@conditional_response("players", "positions", "teams")
+@cached_response("players", "positions", "teams")
 def get_top_performing_players():
     """
     Returns top performing players with their position and team names
     Optional query parameters:
     - limit: number of players to return (default: 10)
     - position: filter by position type ID
+    - team: filter by team ID
+    - sort: total_points, cost, minutes or selected_by_percent (default: total_points)
+    - order: asc or desc (default: desc)
+    - format: rows, columnar or msgpack (or negotiate via the Accept header)
     """
     try:
         # Get query parameters
         limit = request.args.get("limit", default=10, type=int)
         position = request.args.get("position", type=int)
+        team = request.args.get("team", type=int)
+        sort = request.args.get("sort", default="total_points")
+        order = request.args.get("order", default="desc")
 
-        with db.engine.connect() as conn:
-            query = (
-                select(
-                    players.c.player_id,
-                    players.c.name.label("player_name"),
-                    players.c.total_points,
-                    players.c.cost,
-                    positions.c.singular_name.label("position"),
-                    teams.c.name.label("team"),
-                )
-                .select_from(
-                    players.join(
-                        positions,
-                        players.c.position_type_id == positions.c.position_type_id,
-                    ).join(teams, players.c.team == teams.c.team_id)
-                )
-                .order_by(desc(players.c.total_points))
-            )
-
-            # Apply filters if provided
-            if position:
-                query = query.where(players.c.position_type_id == position)
-
-            # Apply limit
-            query = query.limit(limit)
+        top_players = reference.get().players.top(limit, sort, order, position, team)
 
-            result = conn.execute(query)
-            top_players = [dict(row) for row in result.mappings()]
-
-            return (
-                jsonify(top_players),
-                200,
-            )
+        return encoded_rows(top_players)
 
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
     except Exception as e:
         return (
             jsonify(
@@ -133,13 +541,126 @@ def get_top_performing_players():
         )
 
 
+@api_bp.route("/players/compare", methods=["GET"])
+@conditional_response("players", "positions", "teams")
+def compare_players():
+    """
+    Side-by-side stats with percentile ranks within each player's position
+    Query parameters:
+    - ids: comma-separated player IDs (2 to 5)
+    """
+    try:
+        player_ids = [int(pid) for pid in request.args.get("ids", "").split(",")]
+    except ValueError:
+        return jsonify({"success": False, "message": "ids must be integers"}), 400
+    if not 2 <= len(player_ids) <= 5:
+        return jsonify({"success": False, "message": "Compare 2 to 5 players"}), 400
+
+    try:
+        return jsonify(reference.get().profiles.compare(player_ids))
+    except KeyError as e:
+        return jsonify({"success": False, "message": f"Unknown player {e}"}), 404
+
+
+@api_bp.route("/players/<int:player_id>/similar", methods=["GET"])
+@conditional_response("players", "positions", "teams")
+def get_similar_players(player_id):
+    """
+    Players with the most similar per-90 output, minutes and price
+    Optional query parameters:
+    - k: number of players to return (default: 10, max: 50)
+    - position: position type ID to search (default: the player's own)
+    """
+    k = min(request.args.get("k", default=10, type=int), 50)
+    position = request.args.get("position", type=int)
+    profiles = reference.get().profiles
+
+    try:
+        return jsonify(
+            {
+                "player": profiles.profile(player_id),
+                "similar": profiles.similar(player_id, max(k, 0), position),
+            }
+        )
+    except KeyError:
+        return jsonify({"success": False, "message": "Unknown player"}), 404
+
+
+@api_bp.route("/players/<int:player_id>/history", methods=["GET"])
+@conditional_response(("player_gameweek_stats", "player_id"))
+@cached_response(("player_gameweek_stats", "player_id"))
+def get_player_history(player_id):
+    """Per-gameweek stats for a player, stored by the element-summary sync."""
+    with db.engine.connect() as conn:
+        result = conn.execute(
+            select(player_gameweek_stats)
+            .where(player_gameweek_stats.c.player_id == player_id)
+            .order_by(player_gameweek_stats.c.gameweek)
+        )
+        return encoded_rows([dict(row) for row in result.mappings()])
+
+
+@api_bp.route("/xpoints", methods=["GET"])
+@conditional_response("player_xpoints", "players", "positions", "teams")
+@cached_response("player_xpoints", "players", "positions", "teams")
+def get_xpoints():
+    """
+    Precomputed projected points, highest first
+    Optional query parameters:
+    - gameweek: gameweek projected (default: latest projected)
+    - limit: number of players to return (default: 50, max: 1000)
+    - position: filter by position type ID
+    - team: filter by team ID
+    - format: rows, columnar or msgpack (or negotiate via the Accept header)
+    """
+    gameweek = request.args.get("gameweek", type=int)
+    limit = min(request.args.get("limit", default=50, type=int), 1000)
+    position = request.args.get("position", type=int)
+    team = request.args.get("team", type=int)
+    if limit < 1:
+        return jsonify({"success": False, "message": "limit must be at least 1"}), 400
+
+    players_query = joined_players_query().subquery()
+    with db.engine.connect() as conn:
+        if gameweek is None:
+            gameweek = conn.execute(
+                select(func.max(player_xpoints.c.gameweek))
+            ).scalar()
+
+        query = (
+            select(
+                player_xpoints.c.gameweek,
+                player_xpoints.c.xpoints,
+                players_query.c.player_id,
+                players_query.c.player_name,
+                players_query.c.cost,
+                players_query.c.position,
+                players_query.c.team,
+            )
+            .select_from(
+                player_xpoints.join(
+                    players_query,
+                    player_xpoints.c.player_id == players_query.c.player_id,
+                )
+            )
+            .where(player_xpoints.c.gameweek == gameweek)
+            .order_by(desc(player_xpoints.c.xpoints), players_query.c.player_id)
+            .limit(limit)
+        )
+        if position:
+            query = query.where(players_query.c.position_type_id == position)
+        if team:
+            query = query.where(players_query.c.team_id == team)
+
+        return encoded_rows([dict(row) for row in conn.execute(query).mappings()])
+
+
 @api_bp.route("/overview/<int:entry_id>", methods=["GET"])
+@conditional_response("gameweeks", ("overview", "entry_id"))
+@cached_response("gameweeks", ("overview", "entry_id"))
 def get_overview(entry_id):
     with db.engine.connect() as conn:
-        # Get current gameweek
-        current_gw = conn.execute(
-            select(gameweeks.c.gameweek_id).where(gameweeks.c.is_current == True)
-        ).scalar()
+        current_gw = reference.get().current_gameweek
 
         if not current_gw:
             return (
@@ -147,14 +668,7 @@ def get_overview(entry_id):
                 404,
             )
 
-        # Get overview for entry_id and current gameweek
-        query = select(overview).where(
-            (overview.c.entry_id == entry_id)
-            & (overview.c.current_gameweek == current_gw)
-        )
-
-        result = conn.execute(query)
-        data = [dict(row) for row in result.mappings()]
+        data = _query_overview(conn, entry_id, current_gw)
 
         if not data:
             return (
@@ -167,10 +681,88 @@ def get_overview(entry_id):
                 404,
             )
 
-        return jsonify(data[0])
+        return jsonify(data)
+
+
+DASHBOARD_PANELS = ("overview", "top_players", "gameweeks")
+
+
+@api_bp.route("/dashboard/<int:entry_id>", methods=["GET"])
+@conditional_response(
+    "gameweeks",
+    ("overview", "entry_id"),
+    "players",
+    "positions",
+    "teams",
+    ("gameweek_history", "entry_id"),
+)
+@cached_response(
+    "gameweeks",
+    ("overview", "entry_id"),
+    "players",
+    "positions",
+    "teams",
+    ("gameweek_history", "entry_id"),
+)
+def get_dashboard(entry_id):
+    """
+    Returns every dashboard panel for an entry in one response, queried on a
+    single connection with one current-gameweek lookup.
+    Optional query parameters:
+    - panels: comma-separated subset of overview, top_players, gameweeks
+    - fields: comma-separated panel.column pairs to project (e.g. overview.overall_rank)
+    - limit: number of top players to return (default: 10)
+    - position: filter top players by position type ID
+    """
+    limit = request.args.get("limit", default=10, type=int)
+    if limit < 1:
+        return jsonify({"success": False, "message": "limit must be at least 1"}), 400
+    panels = request.args.get("panels", default=",".join(DASHBOARD_PANELS))
+    panels = [p for p in panels.split(",") if p]
+    unknown = [p for p in panels if p not in DASHBOARD_PANELS]
+    if unknown:
+        return (
+            jsonify(
+                {"success": False, "message": f"Unknown panels: {', '.join(unknown)}"}
+            ),
+            400,
+        )
+
+    fields = {}
+    for field in request.args.get("fields", default="").split(","):
+        if "." in field:
+            panel, column = field.split(".", 1)
+            fields.setdefault(panel, set()).add(column)
+
+    def project(panel, row):
+        if row is None or panel not in fields:
+            return row
+        return {k: v for k, v in row.items() if k in fields[panel]}
+
+    data = {}
+    with db.engine.connect() as conn:
+        if "overview" in panels:
+            current_gw = reference.get().current_gameweek
+            row = _query_overview(conn, entry_id, current_gw) if current_gw else None
+            data["overview"] = project("overview", row)
+
+        if "top_players" in panels:
+            rows = reference.get().players.top(
+                limit, position=request.args.get("position", type=int)
+            )
+            data["top_players"] = [project("top_players", r) for r in rows]
+
+        if "gameweeks" in panels:
+            rows = _query_gameweek_history(conn, entry_id)
+            data["gameweeks"] = [project("gameweeks", r) for r in rows]
+
+    return jsonify(data)
 
 
 @api_bp.route("/minileagues/<int:entry_id>", methods=["GET"])
+@conditional_response(
+    "mini_leagues", "mini_league_entries", "mini_league_gameweek_scores"
+)
 def get_minileagues(entry_id):
     with db.engine.connect() as conn:
         # Subquery to get the latest gameweek for each league
@@ -216,7 +808,115 @@ def get_minileagues(entry_id):
         )
 
         result = conn.execute(query)
-        return jsonify([dict(row) for row in result.mappings()])
+        return encoded_rows([dict(row) for row in result.mappings()])
+
+
+@stream_bp.route("/live/stream", methods=["GET"])
+def live_stream():
+    """
+    Server-sent events with live gameweek updates. Every client gets the
+    ``players`` topic (a snapshot, then per-player stat deltas); ``league``
+    and ``entry`` query parameters add that league's or entry's topic.
+    Clients follow this process's live feed, which the scheduler leader's
+    poller updates; open streams wait in the streaming server's threads,
+    not the API workers'.
+    """
+    topics = ["players"]
+    for group in ("league", "entry"):
+        group_id = request.args.get(group, type=int)
+        if group_id:
+            topics.append(f"{group}:{group_id}")
+
+    gameweek = reference.get().current_gameweek
+    if gameweek:
+        live_feed.follow(gameweek)
+        league_id = request.args.get("league", type=int)
+        standings = live_scorer.league(league_id, gameweek) if league_id else None
+        if standings:
+            # Seed the snapshot for leagues nobody here was watching
+            live_broker.set_snapshot(f"league:{league_id}", standings)
+
+    sub = live_broker.subscribe(topics)
+    return Response(
+        stream_with_context(live_broker.stream(sub)),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def require_auth(view):
+    """
+    Require a valid ``Authorization: Bearer <token>`` header and expose its
+    claims as ``g.user_id`` and ``g.entry_id``. Verified in memory only.
+    """
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+        claims = tokens.verify(token) if scheme == "Bearer" and token else None
+        if claims is None:
+            return jsonify({"error": "Invalid or expired token"}), 401
+        g.user_id = claims["uid"]
+        g.entry_id = claims["entry"]
+        return view(*args, **kwargs)
+
+    return wrapper
+
+
+@api_bp.route("/transfers/suggestions", methods=["GET"])
+@require_auth
+def get_transfer_suggestions():
+    """
+    Best transfers for the signed-in user's latest synced squad
+    Optional query parameters:
+    - mode: transfers or rebuild (default: transfers)
+    - transfers: most transfers to suggest, 1 or 2 (default: 2)
+    - projection: player score to maximize (default: total_points)
+    - bank: money in the bank in £m (default: synced value)
+    - budget: squad budget in £m for a rebuild (default: squad value + bank)
+    """
+    mode = request.args.get("mode", default="transfers")
+    max_transfers = request.args.get("transfers", default=2, type=int)
+    projection = request.args.get("projection", default="total_points")
+    bank = request.args.get("bank", type=float)
+    budget = request.args.get("budget", type=float)
+
+    if g.entry_id is None:
+        return jsonify({"success": False, "message": "No FPL entry linked"}), 400
+
+    try:
+        cands = candidates(reference.get().players, projection)
+        squad_ids, synced_bank, gameweek = load_squad(db, g.entry_id)
+        bank_tenths = round(bank * 10) if bank is not None else synced_bank
+
+        if mode == "rebuild":
+            if budget is not None:
+                budget_tenths = round(budget * 10)
+            elif squad_ids:
+                budget_tenths = bank_tenths + sum(
+                    int(cands.cost[cands.row_of[pid]])
+                    for pid in squad_ids
+                    if pid in cands.row_of
+                )
+            else:
+                budget_tenths = DEFAULT_BUDGET
+            result = best_squad(cands, budget_tenths)
+        elif mode == "transfers":
+            if not squad_ids:
+                return (
+                    jsonify({"success": False, "message": "No synced squad"}),
+                    404,
+                )
+            result = {
+                "options": best_transfers(cands, squad_ids, bank_tenths, max_transfers)
+            }
+        else:
+            raise ValueError(f"Unknown mode {mode}")
+
+        return jsonify({"gameweek": gameweek, "projection": projection, **result})
+
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
 
 
 @auth_bp.route("/login", methods=["POST"])
@@ -230,7 +930,20 @@ def login():
         if not user or not check_password_hash(user.password_hash, data["password"]):
             return jsonify({"error": "Invalid credentials"}), 401
 
-        return jsonify({"message": "Login successful", "entryId": user.fpl_entry_id})
+        return jsonify(
+            {
+                "message": "Login successful",
+                "entryId": user.fpl_entry_id,
+                "token": tokens.issue(user.id, user.fpl_entry_id),
+                "expiresIn": tokens.max_age,
+            }
+        )
+
+
+@auth_bp.route("/me", methods=["GET"])
+@require_auth
+def me():
+    return jsonify({"userId": g.user_id, "entryId": g.entry_id})
 
 
 @auth_bp.route("/signup", methods=["POST"])
@@ -239,21 +952,29 @@ def signup():
 
     if not data or not all(k in data for k in ("email", "password", "entryId")):
         return jsonify({"error": "Missing fields"}), 400
+    if not all(isinstance(data[k], str) for k in ("email", "password")):
+        return jsonify({"error": "email and password must be strings"}), 400
+
+    # Hash outside the transaction; it is deliberately slow
+    password_hash = generate_password_hash(data["password"])
 
     try:
-        with db.engine.begin() as conn:  # use .begin() for transaction context
-            if conn.execute(
-                users.select().where(users.c.email == data["email"])
-            ).first():
-                return jsonify({"error": "Email already exists"}), 400
-
-            conn.execute(
-                users.insert().values(
+        # A single insert that the unique email constraint arbitrates, so
+        # concurrent signups for one email can't both succeed
+        with db.engine.begin() as conn:
+            created = conn.execute(
+                postgresql.insert(users)
+                .values(
                     email=data["email"],
-                    password_hash=generate_password_hash(data["password"]),
+                    password_hash=password_hash,
                     fpl_entry_id=data["entryId"],
                 )
-            )
+                .on_conflict_do_nothing(index_elements=["email"])
+                .returning(users.c.id)
+            ).first()
+
+        if created is None:
+            return jsonify({"error": "Email already exists"}), 400
         return jsonify({"message": "Registration successful"}), 201
 
     except Exception as e:
@@ -0,0 +1,125 @@
+import hashlib
+from datetime import datetime, timezone
+from functools import wraps
+
+from flask import current_app, request
+
+from routes.encoding import accepted_encoding, compress_response
+from services.cache import data_versions, response_cache
+
+
+def _resolve(deps, view_kwargs):
+    """
+    Turn declared dependencies into data version keys. A ``(table, arg)``
+    pair is keyed by the value of the view argument ``arg``, so
+    ``("gameweek_history", "entry_id")`` tracks each entry separately.
+    """
+    return [
+        (dep[0], view_kwargs[dep[1]]) if isinstance(dep, tuple) else dep for dep in deps
+    ]
+
+
+def cached_response(*deps):
+    """
+    Cache a view's serialized response, keyed by route, URL/query parameters
+    and the current data version of ``deps``. A sync that writes to any of
+    the tables bumps its version, so stale entries are never served.
+
+    Entries keep the response headers (e.g. ``Vary``) and are stored
+    compressed, one per negotiated content encoding, so a hit is neither
+    stripped of its headers nor compressed again.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            key = (
+                request.endpoint,
+                tuple(sorted(kwargs.items())),
+                tuple(sorted(request.args.items(multi=True))),
+                request.headers.get("Accept", ""),
+                accepted_encoding(),
+                data_versions.get(*_resolve(deps, kwargs)),
+            )
+
+            def compute():
+                response = compress_response(
+                    current_app.make_response(view(*args, **kwargs))
+                )
+                headers = [
+                    (name, value)
+                    for name, value in response.headers
+                    if name != "Content-Length"
+                ]
+                return response.get_data(), response.status_code, headers
+
+            body, status, headers = response_cache.get_or_compute(
+                key, compute, should_cache=lambda value: value[1] < 500
+            )
+            return current_app.response_class(body, status=status, headers=headers)
+
+        return wrapper
+
+    return decorator
+
+
+def conditional_response(*deps):
+    """
+    Send ETag and Last-Modified headers derived from the last sync times of
+    ``deps`` and answer matching conditional requests with 304 before the
+    view (and its queries) run.
+
+    Sync times are shared by every process (see ``sync_watermarks``), so a
+    validator from one worker is honoured by all of them and across
+    restarts. Until this process has them, responses carry no validators.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not data_versions.in_sync:
+                return view(*args, **kwargs)
+
+            resolved = _resolve(deps, kwargs)
+            fingerprint = repr(
+                (
+                    request.endpoint,
+                    sorted(kwargs.items()),
+                    sorted(request.args.items(multi=True)),
+                    request.headers.get("Accept", ""),
+                    data_versions.synced(*resolved),
+                )
+            )
+            etag = hashlib.sha1(fingerprint.encode()).hexdigest()
+            synced_at = data_versions.last_synced(*resolved)
+            # HTTP dates have whole seconds; the ETag tells writes apart within one
+            last_modified = (
+                datetime.fromtimestamp(int(synced_at), tz=timezone.utc)
+                if synced_at
+                else None
+            )
+
+            if request.if_none_match:
+                not_modified = request.if_none_match.contains_weak(etag)
+            elif request.if_modified_since and last_modified:
+                not_modified = last_modified <= request.if_modified_since
+            else:
+                not_modified = False
+
+            if not_modified:
+                response = current_app.response_class(status=304)
+            else:
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag, weak=True)
+            if last_modified:
+                response.last_modified = last_modified
+            # Let clients keep the body but revalidate on every use.
+            response.cache_control.no_cache = True
+            return response
+
+        return wrapper
+
+    return decorator
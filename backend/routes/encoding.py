@@ -0,0 +1,102 @@
+import gzip
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+from flask import current_app, jsonify, request
+
+try:
+    import msgpack
+except ImportError:  # optional: only needed for format=msgpack
+    msgpack = None
+
+try:
+    import brotli
+except ImportError:  # optional: gzip is used when brotli is unavailable
+    brotli = None
+
+JSON = "application/json"
+COLUMNAR_JSON = "application/vnd.fantasy-foundry.columnar+json"
+MSGPACK = "application/x-msgpack"
+
+FORMATS = {"rows": JSON, "columnar": COLUMNAR_JSON, "msgpack": MSGPACK}
+
+# Responses smaller than this aren't worth compressing
+MIN_COMPRESS_SIZE = 1024
+
+
+def _requested_mimetype() -> str:
+    fmt = request.args.get("format")
+    if fmt in FORMATS:
+        return FORMATS[fmt]
+    # Plain JSON first so */* (browsers, axios) keeps the row format
+    return request.accept_mimetypes.best_match(
+        [JSON, COLUMNAR_JSON, MSGPACK], default=JSON
+    )
+
+
+def _msgpack_default(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Cannot encode {type(value).__name__}")
+
+
+def to_columns(rows: List[Dict[str, Any]]) -> Dict[str, List[Any]]:
+    """Row dicts -> one array per column, so key names appear once."""
+    return {key: [row[key] for row in rows] for key in (rows[0] if rows else {})}
+
+
+def encoded_rows(rows: List[Dict[str, Any]]):
+    """
+    Encode a list of rows as requested by ``?format=`` or the Accept header:
+    row-oriented JSON (default), column-oriented JSON, or column-oriented
+    MessagePack.
+    """
+    mimetype = _requested_mimetype()
+    if mimetype == JSON:
+        response = jsonify(rows)
+    elif mimetype == COLUMNAR_JSON:
+        response = jsonify(to_columns(rows))
+        response.mimetype = COLUMNAR_JSON
+    elif msgpack is None:
+        return jsonify({"success": False, "message": "MessagePack unavailable"}), 406
+    else:
+        response = current_app.response_class(
+            msgpack.packb(to_columns(rows), default=_msgpack_default),
+            mimetype=MSGPACK,
+        )
+    response.vary.add("Accept")
+    return response
+
+
+def accepted_encoding() -> Optional[str]:
+    """The compression ``compress_response`` applies for this request, if any."""
+    encodings = request.accept_encodings
+    if brotli is not None and encodings["br"]:
+        return "br"
+    if encodings["gzip"]:
+        return "gzip"
+    return None
+
+
+def compress_response(response):
+    """Compress large responses with brotli or gzip, as the client accepts."""
+    if (
+        response.status_code != 200
+        or response.is_streamed
+        or "Content-Encoding" in response.headers
+        or (response.content_length or 0) < MIN_COMPRESS_SIZE
+    ):
+        return response
+
+    encoding = accepted_encoding()
+    if encoding == "br":
+        body = brotli.compress(response.get_data(), quality=5)
+    elif encoding == "gzip":
+        body = gzip.compress(response.get_data(), compresslevel=6)
+    else:
+        return response
+
+    response.set_data(body)
+    response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    return response
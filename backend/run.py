@@ -1,5 +1,7 @@
+import os
+
 from flask import Flask
-from routes.api import api_bp, auth_bp
+from routes.api import api_bp, auth_bp, change_listener, scheduler, stream_bp
 from flask_cors import CORS
 
 app = Flask(__name__)
@@ -9,4 +11,13 @@ app.register_blueprint(api_bp, url_prefix="/api")
 app.register_blueprint(auth_bp, url_prefix="/auth")
 
 if __name__ == "__main__":
+    # Development server only; in production run `gunicorn -c gunicorn.conf.py run:app`
+    # and stream from `gunicorn -c gunicorn_stream.conf.py stream:app`
+    app.register_blueprint(stream_bp, url_prefix="/api")
+    # The reloader runs this block in a watcher process that serves nothing;
+    # only the serving child (WERKZEUG_RUN_MAIN) listens and schedules
+    if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        change_listener.start()
+        if os.environ.get("FPL_SCHEDULER", "1") != "0":
+            scheduler.start()
     app.run(debug=True)
@@ -0,0 +1,45 @@
+import time
+from typing import Any, Dict, Optional
+
+from itsdangerous import BadSignature, SignatureExpired, URLSafeTimedSerializer
+
+from services.cache import ResponseCache
+
+
+class SessionTokens:
+    """
+    Stateless signed access tokens.
+
+    A token carries the user's id and FPL entry id, signed with the app
+    secret and stamped with its issue time. Verifying one is an HMAC check
+    in memory; recently verified tokens are cached so repeat requests skip
+    even that. No database lookup or password hash is involved.
+    """
+
+    def __init__(self, secret: str, max_age: int = 12 * 3600, cache_size: int = 4096):
+        self.max_age = max_age
+        self._serializer = URLSafeTimedSerializer(secret, salt="session")
+        self._verified = ResponseCache(maxsize=cache_size, ttl=300)
+
+    def issue(self, user_id: int, entry_id: Optional[int]) -> str:
+        return self._serializer.dumps(
+            {"uid": user_id, "entry": entry_id, "exp": int(time.time()) + self.max_age}
+        )
+
+    def verify(self, token: str) -> Optional[Dict[str, Any]]:
+        """Return the token's claims, or None if it is invalid or expired."""
+        claims = self._verified.get_or_compute(
+            token,
+            lambda: self._load(token),
+            should_cache=lambda claims: claims is not None,
+        )
+        # Cached claims may outlive the token itself
+        if claims is None or claims["exp"] <= time.time():
+            return None
+        return claims
+
+    def _load(self, token: str) -> Optional[Dict[str, Any]]:
+        try:
+            return self._serializer.loads(token, max_age=self.max_age)
+        except (SignatureExpired, BadSignature):
+            return None
@@ -0,0 +1,194 @@
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple, Union
+
+
+Dependency = Union[str, Tuple[str, Hashable]]
+
+_ALL = "*"
+
+
+class DataVersions:
+    """
+    Data versions and last sync times, bumped whenever a sync writes to a table.
+
+    A dependency is either a table name or a ``(table, key)`` pair. Keyed
+    dependencies (e.g. ``("gameweek_history", entry_id)``) only change when
+    a sync writes rows for that key or rewrites the table without keys.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Versions are local to the process (they restart at zero and drift
+        # apart between forked workers); the token tells this process's
+        # change events from those of others.
+        self.token = uuid.uuid4().hex[:12]
+        os.register_at_fork(after_in_child=self._new_token)
+        # Sync times, unlike versions, are the same in every process: the
+        # commit time travels with each change event and is stored in
+        # sync_watermarks. ``in_sync`` is set while they are known to be
+        # complete (the change listener is connected and has loaded them).
+        self.in_sync = False
+        self._versions: Dict[Hashable, int] = {}
+        self._synced_at: Dict[Hashable, float] = {}
+
+    def _new_token(self):
+        self.token = uuid.uuid4().hex[:12]
+
+    @staticmethod
+    def _watermark(slot: Hashable) -> Hashable:
+        # Sync times are keyed by key text, as sync_watermarks stores them
+        return (slot[0], str(slot[1])) if isinstance(slot, tuple) else slot
+
+    def bump(
+        self, table: str, keys: Iterable[Hashable] = (), at: Optional[float] = None
+    ) -> int:
+        """Record a write committed at ``at`` (without it, only versions move)."""
+        slots = [(table, key) for key in keys] or [(table, _ALL)]
+        with self._lock:
+            for slot in [table, *slots]:
+                self._versions[slot] = self._versions.get(slot, 0) + 1
+                if at is not None:
+                    mark = self._watermark(slot)
+                    self._synced_at[mark] = max(self._synced_at.get(mark, 0.0), at)
+            return self._versions[table]
+
+    def load_synced(self, rows: Iterable[Tuple[str, str, float]]):
+        """
+        Merge stored ``(table, key, commit time)`` watermarks; key ``*``
+        marks unkeyed writes.
+        """
+        with self._lock:
+            for table, key, at in rows:
+                for mark in (table, (table, key)):
+                    self._synced_at[mark] = max(self._synced_at.get(mark, 0.0), at)
+
+    def _slots(self, dep: Dependency) -> List[Hashable]:
+        if isinstance(dep, tuple):
+            return [(dep[0], _ALL), dep]
+        return [dep]
+
+    def get(self, *deps: Dependency) -> Tuple[int, ...]:
+        with self._lock:
+            return tuple(
+                self._versions.get(slot, 0) for dep in deps for slot in self._slots(dep)
+            )
+
+    def synced(self, *deps: Dependency) -> Tuple[int, ...]:
+        """Commit times of the latest writes to ``deps``, in microseconds."""
+        with self._lock:
+            return tuple(
+                round(self._synced_at.get(self._watermark(slot), 0.0) * 1_000_000)
+                for dep in deps
+                for slot in self._slots(dep)
+            )
+
+    def last_synced(self, *deps: Dependency) -> float:
+        """Unix time of the latest write to any of ``deps`` (0 if none is known)."""
+        with self._lock:
+            return max(
+                [0.0]
+                + [
+                    self._synced_at.get(self._watermark(slot), 0.0)
+                    for dep in deps
+                    for slot in self._slots(dep)
+                ]
+            )
+
+
+class _Flight:
+    """A computation in progress that concurrent callers can wait on."""
+
+    __slots__ = ("event", "value", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache with per-entry TTL and single-flight misses.
+
+    Concurrent misses on the same key run ``compute`` once; the other
+    callers block until the leader finishes and share its result.
+    """
+
+    def __init__(self, maxsize: int = 512, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, _Flight] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Any],
+        should_cache: Callable[[Any], bool] = lambda value: True,
+    ) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+
+            self.misses += 1
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._inflight[key] = flight
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            value = compute()
+            flight.value = value
+            if should_cache(value):
+                self._store(key, value)
+            return value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.event.set()
+
+    def _store(self, key: Hashable, value: Any):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+data_versions = DataVersions()
+response_cache = ResponseCache()
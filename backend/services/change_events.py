@@ -0,0 +1,211 @@
+import json
+import logging
+import os
+import select
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Hashable, Iterable, List, Optional
+
+from sqlalchemy import func, select as sql_select, text
+from sqlalchemy.dialects import postgresql
+
+from db.connector import SQLAlchemyConnector
+from db.schema import metadata, sync_watermarks
+from services.cache import ResponseCache, data_versions, response_cache
+
+CHANNEL = "fpl_changes"
+
+# NOTIFY payloads are capped at 8000 bytes; bigger key sets invalidate the table
+MAX_PAYLOAD = 7900
+
+
+def _origin() -> str:
+    # Unique per process: forked workers get a new token
+    return data_versions.token
+
+
+def notify(db: SQLAlchemyConnector, channel: str, payload: str) -> bool:
+    """NOTIFY ``channel`` with ``payload``; failures are logged, not raised."""
+    try:
+        with db.engine.begin() as conn:
+            conn.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": channel, "payload": payload},
+            )
+        return True
+    except Exception as e:
+        logging.warning(f"Notification on {channel} not sent: {e}")
+        return False
+
+
+def store_watermarks(
+    db: SQLAlchemyConnector, table: str, keys: List[str], at: float
+) -> bool:
+    """Advance ``table``'s sync watermarks to ``at``; failures are logged."""
+    w = sync_watermarks
+    synced_at = datetime.fromtimestamp(at, tz=timezone.utc)
+    upsert = postgresql.insert(w).values(
+        [{"table_name": table, "key": key, "synced_at": synced_at} for key in keys]
+    )
+    upsert = upsert.on_conflict_do_update(
+        index_elements=[c.name for c in w.primary_key.columns],
+        set_={"synced_at": func.greatest(w.c.synced_at, upsert.excluded.synced_at)},
+    )
+    try:
+        with db.engine.begin() as conn:
+            conn.execute(upsert)
+        return True
+    except Exception as e:
+        logging.warning(f"Sync watermarks for {table} not stored: {e}")
+        return False
+
+
+def load_watermarks(db: SQLAlchemyConnector):
+    """Merge every stored sync watermark into this process's sync times."""
+    w = sync_watermarks
+    with db.engine.connect() as conn:
+        rows = conn.execute(sql_select(w.c.table_name, w.c.key, w.c.synced_at))
+        data_versions.load_synced(
+            (table, key, synced_at.timestamp()) for table, key, synced_at in rows
+        )
+
+
+def record_change(
+    db: SQLAlchemyConnector, table: str, keys: Iterable[Hashable] = ()
+) -> int:
+    """
+    Bump ``table``'s data version here, store its sync watermarks and NOTIFY
+    every listening process. Call once the write has committed. Returns the
+    new local version.
+    """
+    # Microseconds, so the time survives a round trip through Postgres
+    keys, now = list(keys), round(time.time(), 6)
+    event = {"table": table, "keys": keys, "at": now, "origin": _origin()}
+    payload = json.dumps(event, default=str)
+    if len(payload) > MAX_PAYLOAD:
+        # Recorded as a table-wide write everywhere, here and in the watermarks
+        keys = []
+        payload = json.dumps({**event, "keys": None})
+    version = data_versions.bump(table, keys, at=now)
+    store_watermarks(db, table, [str(key) for key in keys] or ["*"], now)
+    # If it isn't sent, other processes catch up when cached entries expire
+    notify(db, CHANNEL, payload)
+    return version
+
+
+class ChangeListener:
+    """
+    Applies change events NOTIFYed by other processes (API workers, the
+    scheduler, a standalone sync) to this process's data versions, so
+    cached responses, the reference snapshot and other version-keyed state
+    refresh within about a second of a commit anywhere.
+
+    While connected, cached responses live ``connected_ttl`` seconds: the
+    events, not the TTL, keep them fresh. If the connection drops, the TTL
+    falls back and everything is invalidated on reconnect, since events
+    sent in between were missed. Each time it connects it loads the stored
+    sync watermarks, so every process derives the same HTTP validators.
+
+    Other channels (e.g. live gameweek deltas) can be added with ``listen``
+    before ``start``; their handlers get each payload, and ``on_reconnect``
+    is called after a gap in which notifications may have been missed.
+    """
+
+    def __init__(
+        self,
+        db: SQLAlchemyConnector,
+        cache: ResponseCache = response_cache,
+        connected_ttl: float = 600.0,
+        poll_interval: float = 1.0,
+    ):
+        self.db = db
+        self.cache = cache
+        self.connected_ttl = connected_ttl
+        self.poll_interval = poll_interval
+        self.received = 0
+        self._fallback_ttl = cache.ttl
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._handlers: Dict[str, Callable[[str], None]] = {CHANNEL: self.apply}
+        self._reconnect_hooks = [self._invalidate_all]
+
+    def listen(
+        self,
+        channel: str,
+        handler: Callable[[str], None],
+        on_reconnect: Optional[Callable[[], None]] = None,
+    ):
+        self._handlers[channel] = handler
+        if on_reconnect:
+            self._reconnect_hooks.append(on_reconnect)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="change-listener", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def apply(self, payload: str):
+        event = json.loads(payload)
+        if event.get("origin") == _origin():
+            return
+        data_versions.bump(event["table"], event.get("keys") or (), at=event.get("at"))
+        self.received += 1
+
+    def _invalidate_all(self):
+        for table in metadata.sorted_tables:
+            data_versions.bump(table.name)
+        # The writes' commit times come back with the watermarks
+        load_watermarks(self.db)
+
+    def _run(self):
+        backoff, connected_before = 1.0, False
+        while not self._stop.is_set():
+            raw = None
+            try:
+                # Inside the try, so an unreachable database is retried too
+                raw = self.db.engine.raw_connection()
+                conn = raw.driver_connection
+                conn.autocommit = True
+                with conn.cursor() as cursor:
+                    for channel in self._handlers:
+                        cursor.execute(f"LISTEN {channel}")
+                if connected_before:
+                    for hook in self._reconnect_hooks:
+                        hook()
+                else:
+                    load_watermarks(self.db)
+                data_versions.in_sync = True
+                connected_before, backoff = True, 1.0
+                self.cache.ttl = self.connected_ttl
+                print(f"🔔 Listening for change events in process {os.getpid()}")
+
+                while not self._stop.is_set():
+                    if select.select([conn], [], [], self.poll_interval)[0]:
+                        conn.poll()
+                        while conn.notifies:
+                            notification = conn.notifies.pop(0)
+                            self._dispatch(notification.channel, notification.payload)
+            except Exception as e:
+                self.cache.ttl = self._fallback_ttl
+                data_versions.in_sync = False
+                print(f"❌ Change listener error, retrying in {backoff:.0f}s: {e}")
+                if raw is not None:
+                    raw.invalidate()
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 30.0)
+            else:
+                # Still in autocommit and LISTENing; don't hand it to the pool
+                raw.invalidate()
+
+    def _dispatch(self, channel: str, payload: str):
+        try:
+            self._handlers[channel](payload)
+        except Exception as e:
+            # A bad payload mustn't drop the connection and its LISTENs
+            logging.warning(f"Bad notification on {channel}: {e}")
@@ -0,0 +1,445 @@
+"""
+Distributed league crawl: standings pages and member fetches as work items
+in Postgres, leased by any number of worker processes on any number of
+machines with FOR UPDATE SKIP LOCKED. No broker is involved; the database
+the workers write to is also their queue.
+
+Run from backend/:
+    python -m services.crawl --enqueue 314 271828
+    python -m services.crawl --processes 8 --drain
+    python -m services.crawl --status
+"""
+
+import argparse
+import multiprocessing
+import os
+import socket
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+import requests
+from sqlalchemy import case, exists, func, select, update
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import SQLAlchemyError
+
+from db.connector import SQLAlchemyConnector
+from db.schema import crawl_items
+from services.data_sync import FPLDataSync
+from services.rate_limit import RateLimiter
+
+PAGE, ENTRY = "league_page", "entry"
+# Pages first: each one fans out into a page of entries for other workers
+PRIORITY = {PAGE: 0, ENTRY: 1}
+
+
+class CrawlQueue:
+    """
+    Work items in ``crawl_items``. A lease marks items ``leased`` by one
+    worker until ``lease_expires``; workers extend their leases with
+    ``heartbeat`` while they run. Items whose lease lapsed (the worker died
+    or stalled) go back to ``pending`` on the next ``lease`` by anyone, and
+    fail for good after ``max_attempts``.
+    """
+
+    def __init__(
+        self,
+        db: SQLAlchemyConnector,
+        lease_seconds: float = 60.0,
+        max_attempts: int = 5,
+    ):
+        self.db = db
+        self.lease_duration = timedelta(seconds=lease_seconds)
+        self.max_attempts = max_attempts
+
+    def _retry_status(self):
+        return case(
+            (crawl_items.c.attempts >= self.max_attempts, "failed"), else_="pending"
+        )
+
+    def enqueue(self, conn, items: List[Dict[str, Any]]) -> int:
+        """
+        Add items keyed by ``item_key``. Finished items with the same key
+        (from an earlier crawl) are queued again; pending or leased ones
+        are left alone, so enqueueing is idempotent.
+        """
+        if not items:
+            return 0
+        rows = [
+            {
+                "priority": PRIORITY[item["kind"]],
+                "page": None,
+                "entry_id": None,
+                "rank": None,
+                "total": None,
+                "status": "pending",
+                "attempts": 0,
+                **item,
+            }
+            for item in items
+        ]
+        stmt = postgresql.insert(crawl_items).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["item_key"],
+            set_={
+                "status": "pending",
+                "attempts": 0,
+                "rank": stmt.excluded.rank,
+                "total": stmt.excluded.total,
+                "available_at": func.now(),
+                "last_error": None,
+            },
+            where=crawl_items.c.status.in_(("done", "failed")),
+        )
+        return conn.execute(stmt).rowcount
+
+    def enqueue_leagues(self, league_ids: Iterable[int]) -> int:
+        """Queue a crawl of each league, starting from its first page."""
+        with self.db.engine.begin() as conn:
+            return self.enqueue(
+                conn,
+                [
+                    {
+                        "item_key": f"{PAGE}:{league_id}:1",
+                        "kind": PAGE,
+                        "league_id": league_id,
+                        "page": 1,
+                    }
+                    for league_id in league_ids
+                ],
+            )
+
+    def requeue_expired(self, conn) -> int:
+        """Release items whose lease lapsed, skipping rows others hold."""
+        c = crawl_items.c
+        expired = (
+            select(c.item_id)
+            .where((c.status == "leased") & (c.lease_expires < func.now()))
+            .with_for_update(skip_locked=True)
+            .cte("expired")
+        )
+        return conn.execute(
+            update(crawl_items)
+            .where(c.item_id.in_(select(expired.c.item_id)))
+            .values(status=self._retry_status(), leased_by=None, lease_expires=None)
+        ).rowcount
+
+    def lease(self, worker_id: str, limit: int) -> List[Dict[str, Any]]:
+        """Lease up to ``limit`` available items, skipping rows others hold."""
+        c = crawl_items.c
+        picked = (
+            select(c.item_id)
+            .where((c.status == "pending") & (c.available_at <= func.now()))
+            .order_by(c.priority, c.item_id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .cte("picked")
+        )
+        with self.db.engine.begin() as conn:
+            self.requeue_expired(conn)
+            rows = conn.execute(
+                update(crawl_items)
+                .where(c.item_id.in_(select(picked.c.item_id)))
+                .values(
+                    status="leased",
+                    leased_by=worker_id,
+                    lease_expires=func.now() + self.lease_duration,
+                    attempts=c.attempts + 1,
+                )
+                .returning(*crawl_items.columns)
+            )
+            return sorted(
+                (dict(row) for row in rows.mappings()),
+                key=lambda item: (item["priority"], item["item_id"]),
+            )
+
+    def heartbeat(self, worker_id: str) -> int:
+        """Extend every lease the worker holds; returns how many."""
+        c = crawl_items.c
+        with self.db.engine.begin() as conn:
+            return conn.execute(
+                update(crawl_items)
+                .where((c.status == "leased") & (c.leased_by == worker_id))
+                .values(lease_expires=func.now() + self.lease_duration)
+            ).rowcount
+
+    def complete(self, conn, worker_id: str, item_ids: List[int]) -> int:
+        """Mark items done, unless their lease was lost to another worker."""
+        c = crawl_items.c
+        return conn.execute(
+            update(crawl_items)
+            .where(
+                c.item_id.in_(item_ids)
+                & (c.status == "leased")
+                & (c.leased_by == worker_id)
+            )
+            .values(status="done", leased_by=None, lease_expires=None)
+        ).rowcount
+
+    def fail(self, worker_id: str, item_id: int, error: str):
+        """Release a failed item for a retry after a backoff, or give up."""
+        c = crawl_items.c
+        backoff = func.power(2, func.least(c.attempts, 8)) * timedelta(seconds=1)
+        with self.db.engine.begin() as conn:
+            conn.execute(
+                update(crawl_items)
+                .where((c.item_id == item_id) & (c.leased_by == worker_id))
+                .values(
+                    status=self._retry_status(),
+                    leased_by=None,
+                    lease_expires=None,
+                    available_at=func.now() + backoff,
+                    last_error=error[:500],
+                )
+            )
+
+    def league_done(self, league_id: int) -> bool:
+        """Whether every item of the league's current crawl succeeded."""
+        c = crawl_items.c
+        with self.db.engine.connect() as conn:
+            return not conn.execute(
+                select(
+                    exists().where((c.league_id == league_id) & (c.status != "done"))
+                )
+            ).scalar()
+
+    def status(self) -> Dict[str, Any]:
+        c = crawl_items.c
+        with self.db.engine.connect() as conn:
+            rows = conn.execute(
+                select(c.kind, c.status, func.count()).group_by(c.kind, c.status)
+            ).all()
+            workers = conn.execute(
+                select(func.count(c.leased_by.distinct())).where(c.status == "leased")
+            ).scalar()
+        counts: Dict[str, Dict[str, int]] = {}
+        for kind, status, count in rows:
+            counts.setdefault(kind, {})[status] = count
+        return {"items": counts, "active_workers": workers}
+
+
+class CrawlWorker:
+    """
+    Leases batches of items and runs them: a standings page upserts the
+    league and queues its members and the next page; member fetches are
+    written in one batch per lease. The worker that finishes a league's
+    last item stores its gameweek winners.
+    """
+
+    def __init__(
+        self,
+        queue: CrawlQueue,
+        data_sync: FPLDataSync,
+        batch_size: int = 50,
+        rate: Optional[float] = None,
+        worker_id: Optional[str] = None,
+    ):
+        self.queue = queue
+        self.data_sync = data_sync
+        self.batch_size = batch_size
+        self.limiter = RateLimiter(rate) if rate else None
+        self.worker_id = (
+            worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        )
+        self.processed: Counter = Counter()
+        self._stop = threading.Event()
+
+    def stop(self):
+        self._stop.set()
+
+    def _heartbeat(self):
+        interval = self.queue.lease_duration.total_seconds() / 3
+        while not self._stop.wait(interval):
+            try:
+                self.queue.heartbeat(self.worker_id)
+            except Exception as e:
+                print(f"⚠ Heartbeat failed for {self.worker_id}: {e}")
+
+    def run(self, drain: bool = False, idle_sleep: float = 1.0):
+        """Work until stopped, or with ``drain`` until nothing is left to lease."""
+        print(f"👷 Crawl worker {self.worker_id} started")
+        threading.Thread(target=self._heartbeat, daemon=True).start()
+        try:
+            while not self._stop.is_set():
+                try:
+                    items = self.queue.lease(self.worker_id, self.batch_size)
+                    if items:
+                        self.process(items)
+                    elif drain and not self._outstanding():
+                        break
+                    else:
+                        self._stop.wait(idle_sleep)
+                except SQLAlchemyError as e:
+                    # Unfinished leases lapse and are retried by any worker
+                    print(f"❌ Crawl worker {self.worker_id} database error: {e}")
+                    self._stop.wait(idle_sleep)
+        finally:
+            self._stop.set()
+        print(f"👷 Crawl worker {self.worker_id} stopped: {dict(self.processed)}")
+
+    def _outstanding(self) -> bool:
+        # Others may still be leasing pages that will queue more entries
+        c = crawl_items.c
+        with self.queue.db.engine.connect() as conn:
+            return conn.execute(
+                select(exists().where(c.status.in_(("pending", "leased"))))
+            ).scalar()
+
+    def _fetch(self, fn, *args):
+        if self.limiter:
+            self.limiter.acquire()
+        return fn(*args)
+
+    def process(self, items: List[Dict[str, Any]]):
+        for item in items:
+            if item["kind"] == PAGE:
+                self._run_item(item, self._page)
+
+        entries = [item for item in items if item["kind"] == ENTRY]
+        fetched, entry_rows, score_rows = [], [], []
+        for item in entries:
+            result = self._run_item(item, self._entry)
+            if result:
+                fetched.append(item["item_id"])
+                entry_rows.append(result[0])
+                score_rows.extend(result[1])
+        if fetched:
+            try:
+                stored = self.data_sync.store_league_entries(entry_rows, score_rows)
+                if stored:
+                    with self.queue.db.engine.begin() as conn:
+                        self.queue.complete(conn, self.worker_id, fetched)
+                    self.processed[ENTRY] += len(fetched)
+                error = "upsert failed"
+            except SQLAlchemyError as e:
+                stored, error = False, str(e)
+            if not stored:
+                for item_id in fetched:
+                    self.queue.fail(self.worker_id, item_id, error)
+
+        for league_id in {item["league_id"] for item in items}:
+            if self.queue.league_done(league_id):
+                self.data_sync.persist_league_winners(league_id)
+
+    def _run_item(self, item: Dict[str, Any], fn):
+        try:
+            return fn(item)
+        except (
+            requests.exceptions.RequestException,
+            SQLAlchemyError,
+            KeyError,
+            ValueError,
+        ) as e:
+            print(f"  ❌ {item['item_key']} failed: {e}")
+            self.queue.fail(self.worker_id, item["item_id"], str(e))
+            self.processed["failed"] += 1
+            return None
+
+    def _page(self, item: Dict[str, Any]) -> bool:
+        league_id, page = item["league_id"], item["page"]
+        league_data = self._fetch(self.data_sync.fetch_league_page, league_id, page)
+        if "league" in league_data:
+            self.data_sync.store_league_info(league_data["league"])
+        standings = league_data.get("standings", {})
+        queued = [
+            {
+                "item_key": f"{ENTRY}:{league_id}:{entry['entry']}",
+                "kind": ENTRY,
+                "league_id": league_id,
+                "entry_id": entry["entry"],
+                "rank": entry["rank"],
+                "total": entry["total"],
+            }
+            for entry in standings.get("results", [])
+        ]
+        if standings.get("has_next"):
+            queued.append(
+                {
+                    "item_key": f"{PAGE}:{league_id}:{page + 1}",
+                    "kind": PAGE,
+                    "league_id": league_id,
+                    "page": page + 1,
+                }
+            )
+        # Queue the fan-out and finish the page atomically
+        with self.queue.db.engine.begin() as conn:
+            self.queue.enqueue(conn, queued)
+            self.queue.complete(conn, self.worker_id, [item["item_id"]])
+        self.processed[PAGE] += 1
+        return True
+
+    def _entry(self, item: Dict[str, Any]):
+        return self._fetch(
+            self.data_sync.fetch_league_entry,
+            item["league_id"],
+            item["entry_id"],
+            item["rank"],
+            item["total"],
+        )
+
+
+def _connect(args) -> SQLAlchemyConnector:
+    return SQLAlchemyConnector(
+        user=args.db_user,
+        password=args.db_password,
+        host=args.db_host,
+        database=args.db_name,
+    )
+
+
+def _work(args):
+    db = _connect(args)
+    queue = CrawlQueue(db, lease_seconds=args.lease)
+    data_sync = FPLDataSync(db, base_url=args.base_url)
+    CrawlWorker(queue, data_sync, batch_size=args.batch_size, rate=args.rate).run(
+        drain=args.drain
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--enqueue", type=int, nargs="+", help="league ids to crawl")
+    parser.add_argument("--status", action="store_true", help="print queue counts")
+    parser.add_argument("--processes", type=int, default=1, help="workers to run")
+    parser.add_argument(
+        "--drain", action="store_true", help="exit once the queue is empty"
+    )
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--lease", type=float, default=60.0, help="lease seconds")
+    parser.add_argument(
+        "--rate", type=float, help="upstream requests per second, per worker"
+    )
+    parser.add_argument("--base-url", default=os.environ.get("FPL_BASE_URL"))
+    parser.add_argument("--db-host", default=os.environ.get("DB_HOST", "localhost"))
+    parser.add_argument("--db-name", default=os.environ.get("DB_NAME", "fpl_db"))
+    parser.add_argument("--db-user", default=os.environ.get("DB_USER", "bcheye"))
+    parser.add_argument(
+        "--db-password", default=os.environ.get("DB_PASSWORD", "password")
+    )
+    args = parser.parse_args()
+
+    if args.enqueue or args.status:
+        queue = CrawlQueue(_connect(args))
+        if args.enqueue:
+            print(f"📥 Queued {queue.enqueue_leagues(args.enqueue)} league crawls")
+        if args.status:
+            print(queue.status())
+        return
+
+    start = time.perf_counter()
+    processes = [
+        multiprocessing.Process(target=_work, args=(args,))
+        for _ in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    print(f"⏱ {args.processes} workers finished in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
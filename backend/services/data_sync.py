@@ -1,7 +1,15 @@
+import contextvars
 import requests
-from datetime import datetime
-from sqlalchemy import select, and_
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime, timezone
+from requests.adapters import HTTPAdapter
+from sqlalchemy import select, and_, func
 from db.connector import SQLAlchemyConnector
+from services.change_events import record_change
+from services.gameweek_winners import persist_gameweek_winners
+from services.rate_limit import RateLimiter
+from services.tracing import Tracer, traced
 from db.schema import (
     players,
     teams,
@@ -12,22 +20,97 @@ from db.schema import (
     mini_league_gameweek_scores,
     overview,
     gameweek_history,
+    entry_picks,
+    entry_chips,
+    league_gameweek_winners,
+    fixtures,
+    player_gameweek_stats,
+    player_history_syncs,
+)
+
+# Per-fixture element-summary stats summed into one row per gameweek
+SUMMED_HISTORY_STATS = (
+    "minutes",
+    "goals_scored",
+    "assists",
+    "clean_sheets",
+    "goals_conceded",
+    "saves",
+    "bonus",
+    "bps",
+    "yellow_cards",
+    "red_cards",
+    "total_points",
 )
 
 
 class FPLDataSync:
     BASE_URL = "https://fantasy.premierleague.com/api"
 
-    def __init__(self, db: SQLAlchemyConnector):
+    def __init__(
+        self,
+        db: SQLAlchemyConnector,
+        base_url: Optional[str] = None,
+        tracer: Optional[Tracer] = None,
+    ):
         self.db = db
+        # Point at a mirror or a local stub (see benchmarks/stub_fpl.py)
+        if base_url:
+            self.BASE_URL = base_url.rstrip("/")
+        # Spans go to FPL_TRACE_FILE; summarize with `python -m services.tracing`
+        self.tracer = tracer or Tracer.from_env()
+        # Pooled keep-alive connections, enough for the concurrent fetches
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_maxsize=32))
+        self.session.mount("http://", HTTPAdapter(pool_maxsize=32))
+
+    def _get_json(self, path: str, timeout: int = 10, **kwargs):
+        """GET an API path, raising for HTTP errors, and decode the JSON body."""
+        with self.tracer.span("http.get", path=path) as span:
+            with self.tracer.span("http.wait"):
+                response = self.session.get(
+                    f"{self.BASE_URL}{path}", timeout=timeout, **kwargs
+                )
+            span.set(status_code=response.status_code, bytes=len(response.content))
+            response.raise_for_status()
+            with self.tracer.span("json.decode"):
+                return response.json()
+
+    def _upsert(self, table, data, conflict_target, key: Optional[str] = None) -> bool:
+        """
+        Upsert rows and, if any changed, record the change so cached reads
+        refresh in every process. With ``key``, the change also names each
+        distinct value of that column.
 
-    def sync_bootstrap_data(self) -> bool:
-        """Sync all static data from bootstrap-static endpoint into the database."""
+        Only the columns present in the rows are updated: live and history
+        payloads carry a subset of a table's columns, and the rest must keep
+        the values other syncs stored.
+        """
+        with self.tracer.span("db.upsert", table=table.name, rows=len(data)) as span:
+            changed = self.db.batch_upsert_on_conflict(
+                table, data, conflict_target, partial=True
+            )
+            span.set(changed=changed)
+        if changed:
+            keys = {row[key] for row in data} if key else ()
+            record_change(self.db, table.name, keys)
+        return changed is not None
+
+    def fetch_bootstrap_data(self) -> dict:
+        """Fetch the raw bootstrap-static payload."""
+        return self._get_json("/bootstrap-static/")
+
+    @traced("sync.bootstrap")
+    def sync_bootstrap_data(self, data: Optional[dict] = None) -> bool:
+        """
+        Sync all static data from bootstrap-static endpoint into the database.
+        Pass ``data`` to store a payload that was already fetched. Returns
+        False if any table failed to store.
+        """
 
         try:
-            response = requests.get(f"{self.BASE_URL}/bootstrap-static/", timeout=10)
-            response.raise_for_status()
-            data = response.json()
+            if data is None:
+                data = self.fetch_bootstrap_data()
 
             teams_data = [
                 {
@@ -39,7 +122,7 @@ class FPLDataSync:
                 }
                 for t in data["teams"]
             ]
-            self.db.batch_upsert_on_conflict(teams, teams_data, ["team_id"])
+            stored = self._upsert(teams, teams_data, ["team_id"])
 
             positions_data = [
                 {
@@ -49,9 +132,7 @@ class FPLDataSync:
                 }
                 for p in data["element_types"]
             ]
-            self.db.batch_upsert_on_conflict(
-                positions, positions_data, ["position_type_id"]
-            )
+            stored &= self._upsert(positions, positions_data, ["position_type_id"])
 
             players_data = [
                 {
@@ -73,7 +154,7 @@ class FPLDataSync:
                 }
                 for p in data["elements"]
             ]
-            self.db.batch_upsert_on_conflict(players, players_data, ["player_id"])
+            stored &= self._upsert(players, players_data, ["player_id"])
 
             gameweeks_data = [
                 {
@@ -88,9 +169,9 @@ class FPLDataSync:
                 }
                 for gw in data["events"]
             ]
-            self.db.batch_upsert_on_conflict(gameweeks, gameweeks_data, ["gameweek_id"])
+            stored &= self._upsert(gameweeks, gameweeks_data, ["gameweek_id"])
 
-            return True
+            return stored
 
         except requests.exceptions.RequestException as req_err:
             print(f"❌ Network or API error syncing bootstrap data: {req_err}")
@@ -99,6 +180,7 @@ class FPLDataSync:
             print(f"❌ Error syncing bootstrap data: {e}")
             raise e
 
+    @traced("sync.user", "entry_id")
     def sync_user_data(self, entry_id: int) -> bool:
         """
         Syncs general user/team (entry_id) data, specifically their
@@ -106,11 +188,7 @@ class FPLDataSync:
         This function no longer handles gameweek scores.
         """
         try:
-            entry_response = requests.get(
-                f"{self.BASE_URL}/entry/{entry_id}/", timeout=10
-            )
-            entry_response.raise_for_status()
-            entry_data = entry_response.json()
+            entry_data = self._get_json(f"/entry/{entry_id}/")
 
             leagues_data = entry_data.get("leagues", {})
 
@@ -159,16 +237,17 @@ class FPLDataSync:
                     )
 
             if overview_data:
-                self.db.batch_upsert_on_conflict(
-                    overview, overview_data, ["entry_id", "current_gameweek"]
+                self._upsert(
+                    overview,
+                    overview_data,
+                    ["entry_id", "current_gameweek"],
+                    key="entry_id",
                 )
             if mini_leagues_data:
-                self.db.batch_upsert_on_conflict(
-                    mini_leagues, mini_leagues_data, ["entry_id", "league_id"]
-                )
+                self._upsert(mini_leagues, mini_leagues_data, ["entry_id", "league_id"])
 
             if mini_league_entries_data:
-                self.db.batch_upsert_on_conflict(
+                self._upsert(
                     mini_league_entries,
                     mini_league_entries_data,
                     ["entry_id", "league_id"],
@@ -183,16 +262,24 @@ class FPLDataSync:
             print(f"Unexpected error syncing entry {entry_id}: {e}")
             raise e
 
-    def sync_live_gameweek_data(self, event_id: int) -> bool:
-        """Sync live stats data for a specific gameweek into the players table."""
+    def fetch_live_gameweek_data(self, event_id: int) -> dict:
+        """Fetch the raw live payload for a gameweek."""
+        return self._get_json(f"/event/{event_id}/live/")
+
+    @traced("sync.live", "event_id")
+    def sync_live_gameweek_data(
+        self, event_id: int, live_data: Optional[dict] = None
+    ) -> bool:
+        """
+        Sync live stats data for a specific gameweek into the players table.
+        Pass ``live_data`` to store a payload that was already fetched.
+        """
         try:
-            live_response = requests.get(
-                f"{self.BASE_URL}/event/{event_id}/live/", timeout=10
-            )
-            live_response.raise_for_status()
-            live_data = live_response.json()
+            if live_data is None:
+                live_data = self.fetch_live_gameweek_data(event_id)
 
             player_stats = []
+            gameweek_stats = []
             for player in live_data["elements"]:
                 stats = player["stats"]
                 player_stats.append(
@@ -206,11 +293,38 @@ class FPLDataSync:
                         "red_cards": stats["red_cards"],
                     }
                 )
+                gameweek_stats.append(
+                    {
+                        "player_id": player["id"],
+                        "gameweek": event_id,
+                        "minutes": stats["minutes"],
+                        "goals_scored": stats["goals_scored"],
+                        "assists": stats["assists"],
+                        "clean_sheets": stats["clean_sheets"],
+                        "goals_conceded": stats.get("goals_conceded"),
+                        "saves": stats.get("saves"),
+                        "bonus": stats.get("bonus"),
+                        "bps": stats.get("bps"),
+                        "yellow_cards": stats["yellow_cards"],
+                        "red_cards": stats["red_cards"],
+                        "total_points": stats["total_points"],
+                        "expected_goals": float(stats.get("expected_goals") or 0),
+                        "expected_assists": float(stats.get("expected_assists") or 0),
+                    }
+                )
 
+            stored = True
             if player_stats:
-                self.db.batch_upsert_on_conflict(players, player_stats, ["player_id"])
+                stored = self._upsert(players, player_stats, ["player_id"])
+            if gameweek_stats:
+                stored &= self._upsert(
+                    player_gameweek_stats,
+                    gameweek_stats,
+                    ["player_id", "gameweek"],
+                    key="player_id",
+                )
 
-            return True
+            return stored
 
         except requests.exceptions.RequestException as req_err:
             print(
@@ -221,15 +335,42 @@ class FPLDataSync:
             print(f"Unexpected error syncing live data for gameweek {event_id}: {e}")
             raise e
 
-    def sync_fixtures(self) -> bool:
-        """Sync fixture data"""
+    def fetch_gameweek_fixtures(self, event_id: int) -> list:
+        """Fetch the fixtures of one gameweek, including their finished flags."""
+        return self._get_json("/fixtures/", params={"event": event_id})
+
+    def fetch_fixtures(self) -> list:
+        """Fetch every fixture of the season."""
+        return self._get_json("/fixtures/")
+
+    @traced("sync.fixtures")
+    def sync_fixtures(self, fixtures_data: Optional[list] = None) -> bool:
+        """Sync fixture data. Pass ``fixtures_data`` to store a fetched payload."""
         try:
-            fixtures_response = requests.get(f"{self.BASE_URL}/fixtures/", timeout=10)
-            fixtures_response.raise_for_status()
-            fixtures_data = fixtures_response.json()
+            if fixtures_data is None:
+                fixtures_data = self.fetch_fixtures()
 
             print(f"Received {len(fixtures_data)} fixtures")
-            return True
+            fixture_rows = [
+                {
+                    "fixture_id": f["id"],
+                    "gameweek": f["event"],
+                    "kickoff_time": (
+                        datetime.fromisoformat(f["kickoff_time"])
+                        if f.get("kickoff_time")
+                        else None
+                    ),
+                    "team_h": f["team_h"],
+                    "team_a": f["team_a"],
+                    "team_h_difficulty": f["team_h_difficulty"],
+                    "team_a_difficulty": f["team_a_difficulty"],
+                    "team_h_score": f["team_h_score"],
+                    "team_a_score": f["team_a_score"],
+                    "finished": f["finished"],
+                }
+                for f in fixtures_data
+            ]
+            return self._upsert(fixtures, fixture_rows, ["fixture_id"])
 
         except requests.exceptions.RequestException as req_err:
             print(f"Network or API error syncing fixtures: {req_err}")
@@ -238,16 +379,13 @@ class FPLDataSync:
             print(f"Error syncing fixtures: {e}")
             return False
 
+    @traced("sync.history", "entry_id")
     def sync_gameweeks_history_data(self, entry_id: int) -> bool:
         try:
             gameweek_history_data = []
 
             # Fetch gameweek history
-            history_resp = requests.get(
-                f"{self.BASE_URL}/entry/{entry_id}/history/", timeout=10
-            )
-            history_resp.raise_for_status()
-            history_data = history_resp.json()
+            history_data = self._get_json(f"/entry/{entry_id}/history/")
 
             for gw in history_data.get("current", []):
                 gameweek_history_data.append(
@@ -263,10 +401,11 @@ class FPLDataSync:
                     }
                 )
             if gameweek_history_data:
-                self.db.batch_upsert_on_conflict(
+                self._upsert(
                     gameweek_history,
                     gameweek_history_data,
                     ["entry_id", "gameweek"],
+                    key="entry_id",
                 )
             return True
         except requests.exceptions.RequestException as e:
@@ -277,6 +416,338 @@ class FPLDataSync:
             raise ex
             return False
 
+    def _fetch_picks(self, entry_id: int, gameweek: int):
+        """Fetch an entry's picks for a gameweek as (pick rows, chip row)."""
+        picks_data = self._get_json(f"/entry/{entry_id}/event/{gameweek}/picks/")
+
+        pick_rows = [
+            {
+                "entry_id": entry_id,
+                "gameweek": gameweek,
+                "position": pick["position"],
+                "player_id": pick["element"],
+                "multiplier": pick["multiplier"],
+                "is_captain": pick["is_captain"],
+                "is_vice_captain": pick["is_vice_captain"],
+            }
+            for pick in picks_data.get("picks", [])
+        ]
+        chip_row = {
+            "entry_id": entry_id,
+            "gameweek": gameweek,
+            "active_chip": picks_data.get("active_chip"),
+            "transfers_cost": picks_data.get("entry_history", {}).get(
+                "event_transfers_cost", 0
+            ),
+            "bank": picks_data.get("entry_history", {}).get("bank"),
+        }
+        return pick_rows, chip_row
+
+    @traced("sync.picks", "entry_id", "gameweek")
+    def sync_entry_picks(self, entry_id: int, gameweek: int) -> bool:
+        """Sync one entry's picks, captaincy and active chip for a gameweek."""
+        try:
+            pick_rows, chip_row = self._fetch_picks(entry_id, gameweek)
+            if pick_rows:
+                self._upsert(
+                    entry_picks,
+                    pick_rows,
+                    ["entry_id", "gameweek", "position"],
+                    key="entry_id",
+                )
+            self._upsert(entry_chips, [chip_row], ["entry_id", "gameweek"])
+            return True
+        except requests.exceptions.RequestException as req_err:
+            print(f"Network/API error syncing picks for entry {entry_id}: {req_err}")
+            raise req_err
+
+    @traced("sync.league_picks", "league_id", "gameweek")
+    def sync_league_picks(
+        self, league_id: int, gameweek: int, batch_size: int = 500
+    ) -> bool:
+        """
+        Sync picks for every synced entry of a league. Picks are locked at the
+        deadline, so this runs once per gameweek, not per live update.
+        """
+        with self.db.engine.connect() as conn:
+            entry_ids = (
+                conn.execute(
+                    select(mini_league_entries.c.entry_id).where(
+                        mini_league_entries.c.league_id == league_id
+                    )
+                )
+                .scalars()
+                .all()
+            )
+
+        print(
+            f"🔄 Syncing GW{gameweek} picks for {len(entry_ids)} entries in league {league_id}"
+        )
+        all_synced = True
+        pick_batch, chip_batch = [], []
+        for i, entry_id in enumerate(entry_ids, start=1):
+            try:
+                pick_rows, chip_row = self._fetch_picks(entry_id, gameweek)
+                pick_batch.extend(pick_rows)
+                chip_batch.append(chip_row)
+            except requests.exceptions.HTTPError as http_err:
+                # Entries created after the gameweek have no picks for it
+                print(f"  ⚠ No picks for entry {entry_id}: {http_err}")
+                all_synced = False
+            except requests.exceptions.RequestException as req_err:
+                # A timeout or dropped connection skips this entry, not the rest
+                print(f"  ⚠ Failed to fetch picks for entry {entry_id}: {req_err}")
+                all_synced = False
+
+            if len(chip_batch) >= batch_size or (i == len(entry_ids) and chip_batch):
+                if pick_batch:
+                    self._upsert(
+                        entry_picks,
+                        pick_batch,
+                        ["entry_id", "gameweek", "position"],
+                        key="entry_id",
+                    )
+                self._upsert(entry_chips, chip_batch, ["entry_id", "gameweek"])
+                pick_batch, chip_batch = [], []
+
+        return all_synced
+
+    def fetch_element_summary(self, player_id: int) -> dict:
+        """Fetch a player's fixture-by-fixture history and upcoming fixtures."""
+        return self._get_json(f"/element-summary/{player_id}/")
+
+    def _history_behind(
+        self, conn, player_ids: List[int], through: int
+    ) -> Tuple[List[int], List[int]]:
+        """
+        Players whose stored history stops before gameweek ``through``, and
+        the subset that needs fetching: never fetched, or played (or have no
+        live stats) in one of the missing gameweeks. Those who sat every
+        missing gameweek out already have their zero rows from live syncs.
+        """
+        synced = dict(
+            conn.execute(
+                select(
+                    player_history_syncs.c.player_id,
+                    player_history_syncs.c.synced_through,
+                )
+            ).all()
+        )
+        behind = [pid for pid in player_ids if synced.get(pid, 0) < through]
+        oldest = min((synced.get(pid, 0) for pid in behind), default=through)
+        minutes = {
+            (r.player_id, r.gameweek): r.minutes
+            for r in conn.execute(
+                select(
+                    player_gameweek_stats.c.player_id,
+                    player_gameweek_stats.c.gameweek,
+                    player_gameweek_stats.c.minutes,
+                ).where(
+                    player_gameweek_stats.c.gameweek > oldest,
+                    player_gameweek_stats.c.gameweek <= through,
+                )
+            )
+        }
+        due = [
+            pid
+            for pid in behind
+            if pid not in synced
+            or any(
+                minutes.get((pid, gw)) != 0
+                for gw in range(synced[pid] + 1, through + 1)
+            )
+        ]
+        return behind, due
+
+    @staticmethod
+    def _history_rows(
+        player_id: int, summary: dict, through: int
+    ) -> List[Dict[str, Any]]:
+        by_gameweek: Dict[int, Dict[str, Any]] = {}
+        for fixture in summary.get("history", []):
+            gameweek = fixture["round"]
+            # Unfinished gameweeks stay with the live sync
+            if gameweek > through:
+                continue
+            row = by_gameweek.setdefault(
+                gameweek,
+                {
+                    "player_id": player_id,
+                    "gameweek": gameweek,
+                    **{stat: 0 for stat in SUMMED_HISTORY_STATS},
+                    "expected_goals": 0.0,
+                    "expected_assists": 0.0,
+                    "fixture_count": 0,
+                },
+            )
+            for stat in SUMMED_HISTORY_STATS:
+                row[stat] += fixture.get(stat) or 0
+            row["expected_goals"] += float(fixture.get("expected_goals") or 0)
+            row["expected_assists"] += float(fixture.get("expected_assists") or 0)
+            row["fixture_count"] += 1
+            row["value"] = fixture.get("value")
+            row["selected"] = fixture.get("selected")
+        return list(by_gameweek.values())
+
+    @traced("sync.element_summaries")
+    def sync_element_summaries(
+        self,
+        player_ids: Optional[List[int]] = None,
+        force: bool = False,
+        workers: int = 8,
+        rate: float = 10.0,
+        batch_size: int = 5000,
+    ) -> int:
+        """
+        Fetch element summaries ``workers`` at a time, at most ``rate``
+        requests per second in total, for players whose stored history is
+        missing finished gameweeks they played in (every player with
+        ``force``). Their history is bulk-loaded into player_gameweek_stats,
+        one row per gameweek. Returns the number of players fetched.
+        """
+        with self.db.engine.connect() as conn:
+            through = conn.execute(
+                select(func.max(gameweeks.c.gameweek_id)).where(
+                    gameweeks.c.finished.is_(True)
+                )
+            ).scalar()
+            if player_ids is None:
+                player_ids = conn.execute(select(players.c.player_id)).scalars().all()
+            if not through:
+                return 0
+            behind, due = self._history_behind(conn, player_ids, through)
+        if force:
+            behind = due = list(player_ids)
+        print(
+            f"🔄 Fetching element summaries for {len(due)} players "
+            f"({len(behind)} behind GW{through})"
+        )
+
+        limiter = RateLimiter(rate)
+
+        def fetch(player_id):
+            limiter.acquire()
+            return self.fetch_element_summary(player_id)
+
+        rows, failed = [], set()
+        with ThreadPoolExecutor(workers, thread_name_prefix="element-summary") as pool:
+            # Each fetch runs in a copy of this context so its spans nest here
+            futures = {
+                pool.submit(contextvars.copy_context().run, fetch, pid): pid
+                for pid in due
+            }
+            for future in as_completed(futures):
+                player_id = futures[future]
+                try:
+                    rows.extend(self._history_rows(player_id, future.result(), through))
+                except requests.exceptions.RequestException as req_err:
+                    print(f"  ⚠ No element summary for player {player_id}: {req_err}")
+                    failed.add(player_id)
+
+        stored = all(
+            self._upsert(
+                player_gameweek_stats,
+                rows[start : start + batch_size],
+                ["player_id", "gameweek"],
+                key="player_id",
+            )
+            for start in range(0, len(rows), batch_size)
+        )
+        # synced_at is a naive column holding UTC
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        watermarks = [
+            {"player_id": pid, "synced_through": through, "synced_at": now}
+            for pid in behind
+            if pid not in failed
+        ]
+        if stored and watermarks:
+            self._upsert(player_history_syncs, watermarks, ["player_id"])
+        print(
+            f"✅ Stored {len(rows)} gameweek rows for {len(due) - len(failed)} players"
+        )
+        return len(due) - len(failed)
+
+    def fetch_league_page(self, league_id: int, page: int) -> dict:
+        """Fetch one page of a classic league's standings."""
+        league_path = f"/leagues-classic/{league_id}/standings/?page={page}"
+        print(f"➡ Fetching standings page {page}: {self.BASE_URL}{league_path}")
+        return self._get_json(league_path, timeout=15)
+
+    @staticmethod
+    def league_info_row(league_info: dict) -> Dict[str, Any]:
+        return {
+            "league_id": league_info["id"],
+            "name": league_info["name"],
+            "created": (
+                datetime.fromisoformat(league_info["created"][:-1])
+                if league_info["created"]
+                else None
+            ),
+            "league_type": "x",
+        }
+
+    def fetch_league_entry(
+        self, league_id: int, entry_id: int, rank: int, total: int
+    ) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        Fetch a league member's metadata and gameweek history as its
+        mini_league_entries row and mini_league_gameweek_scores rows.
+        """
+        entry_data = self._get_json(f"/entry/{entry_id}/")
+        history_data = self._get_json(f"/entry/{entry_id}/history/")
+
+        entry_row = {
+            "entry_id": entry_id,
+            "entry_name": entry_data["name"],
+            "player_name": f"{entry_data['player_first_name']} {entry_data['player_last_name']}",
+            "rank": rank,
+            "total": total,
+            "league_id": league_id,
+        }
+        score_rows = [
+            {
+                "entry_id": entry_id,
+                "league_id": league_id,
+                "gameweek": gw["event"],
+                "points": gw["points"],
+                "cost": gw["event_transfers_cost"],
+            }
+            for gw in history_data.get("current", [])
+        ]
+        return entry_row, score_rows
+
+    def store_league_info(self, league_info: dict) -> bool:
+        return self._upsert(
+            mini_leagues, [self.league_info_row(league_info)], ["league_id"]
+        )
+
+    def store_league_entries(
+        self, entry_rows: List[Dict[str, Any]], score_rows: List[Dict[str, Any]]
+    ) -> bool:
+        """Upsert rows from ``fetch_league_entry`` for any number of entries."""
+        stored = True
+        if entry_rows:
+            stored = self._upsert(
+                mini_league_entries, entry_rows, ["entry_id", "league_id"]
+            )
+        if score_rows:
+            stored &= self._upsert(
+                mini_league_gameweek_scores,
+                score_rows,
+                ["entry_id", "gameweek", "league_id"],
+            )
+        return stored
+
+    def persist_league_winners(self, league_id: int) -> int:
+        """Store or correct the league's finished gameweek winners after a full sync."""
+        with self.tracer.span("db.winners") as span:
+            stored = persist_gameweek_winners(self.db, league_id)
+            span.set(rows=stored)
+        if stored:
+            record_change(self.db, league_gameweek_winners.name, [league_id])
+        return stored
+
+    @traced("sync.league", "league_id")
     def sync_league_managers_data(self, league_id: int) -> bool:
         """
         Sync data for all managers (entries) within a specified mini-league.
@@ -289,133 +760,90 @@ class FPLDataSync:
         print(f"🔄 Starting sync for league ID: {league_id}")
 
         while has_next:
-            try:
-                league_url = f"{self.BASE_URL}/leagues-classic/{league_id}/standings/?page={page}"
-                print(f"➡ Fetching standings page {page}: {league_url}")
-                response = requests.get(league_url, timeout=15)
-                response.raise_for_status()
-                league_data = response.json()
-
-                # Upsert basic league info
-                if "standings" in league_data and "league" in league_data:
-                    league_info = league_data["league"]
-                    self.db.batch_upsert_on_conflict(
-                        mini_leagues,
-                        [
-                            {
-                                "league_id": league_info["id"],
-                                "name": league_info["name"],
-                                "created": (
-                                    datetime.fromisoformat(league_info["created"][:-1])
-                                    if league_info["created"]
-                                    else None
-                                ),
-                                "league_type": "x",
-                            }
-                        ],
-                        ["league_id"],
-                    )
-
-                if "standings" in league_data and "results" in league_data["standings"]:
-                    entries = league_data["standings"]["results"]
-                    print(f"📄 Page {page} contains {len(entries)} entries.")
-
-                    mini_league_entries_batch = []
-                    mini_league_gameweek_scores_batch = []
-
-                    for entry in entries:
-                        entry_id = entry["entry"]
-                        entry_name = entry["entry_name"]
-                        player_name = entry["player_name"]
-                        print(f"  ➕ Processing entry: {entry_name} ({entry_id})")
-
-                        try:
-                            # Fetch entry metadata
-                            entry_resp = requests.get(
-                                f"{self.BASE_URL}/entry/{entry_id}/", timeout=10
-                            )
-                            entry_resp.raise_for_status()
-                            entry_data = entry_resp.json()
-
-                            # Fetch gameweek history
-                            history_resp = requests.get(
-                                f"{self.BASE_URL}/entry/{entry_id}/history/", timeout=10
-                            )
-                            history_resp.raise_for_status()
-                            history_data = history_resp.json()
-
-                            # Add entry to batch
-                            mini_league_entries_batch.append(
-                                {
-                                    "entry_id": entry_id,
-                                    "entry_name": entry_data["name"],
-                                    "player_name": f"{entry_data['player_first_name']} {entry_data['player_last_name']}",
-                                    "rank": entry["rank"],
-                                    "total": entry["total"],
-                                    "league_id": league_id,
-                                }
-                            )
-
-                            # Add gameweek scores to batch
-                            for gw in history_data.get("current", []):
-                                mini_league_gameweek_scores_batch.append(
-                                    {
-                                        "entry_id": entry_id,
-                                        "league_id": league_id,
-                                        "gameweek": gw["event"],
-                                        "points": gw["points"],
-                                        "cost": gw["event_transfers_cost"],
-                                    }
-                                )
-
-                        except requests.exceptions.RequestException as ind_err:
-                            print(f"  ❌ Request error for entry {entry_id}: {ind_err}")
-                            all_entries_synced = False
-                            raise ind_err
-                        except Exception as ex:
-                            print(f"  ❌ Processing error for entry {entry_id}: {ex}")
-                            all_entries_synced = False
-                            raise ex
-
-                    # Perform batch upserts
-                    if mini_league_entries_batch:
-                        self.db.batch_upsert_on_conflict(
-                            mini_league_entries,
+            with self.tracer.span("page", page=page) as page_span:
+                try:
+                    league_data = self.fetch_league_page(league_id, page)
+
+                    # Upsert basic league info
+                    if "standings" in league_data and "league" in league_data:
+                        self.store_league_info(league_data["league"])
+
+                    if (
+                        "standings" in league_data
+                        and "results" in league_data["standings"]
+                    ):
+                        entries = league_data["standings"]["results"]
+                        print(f"📄 Page {page} contains {len(entries)} entries.")
+                        page_span.set(entries=len(entries))
+
+                        mini_league_entries_batch = []
+                        mini_league_gameweek_scores_batch = []
+
+                        for entry in entries:
+                            entry_id = entry["entry"]
+                            entry_name = entry["entry_name"]
+                            player_name = entry["player_name"]
+                            print(f"  ➕ Processing entry: {entry_name} ({entry_id})")
+
+                            with self.tracer.span("entry", entry_id=entry_id):
+                                try:
+                                    entry_row, score_rows = self.fetch_league_entry(
+                                        league_id,
+                                        entry_id,
+                                        entry["rank"],
+                                        entry["total"],
+                                    )
+                                    mini_league_entries_batch.append(entry_row)
+                                    mini_league_gameweek_scores_batch.extend(score_rows)
+
+                                except requests.exceptions.RequestException as ind_err:
+                                    print(
+                                        f"  ❌ Request error for entry {entry_id}: {ind_err}"
+                                    )
+                                    all_entries_synced = False
+                                    raise ind_err
+                                except Exception as ex:
+                                    print(
+                                        f"  ❌ Processing error for entry {entry_id}: {ex}"
+                                    )
+                                    all_entries_synced = False
+                                    raise ex
+
+                        self.store_league_entries(
                             mini_league_entries_batch,
-                            ["entry_id", "league_id"],
+                            mini_league_gameweek_scores_batch,
                         )
 
-                    if mini_league_gameweek_scores_batch:
-                        self.db.batch_upsert_on_conflict(
-                            mini_league_gameweek_scores,
-                            mini_league_gameweek_scores_batch,
-                            ["entry_id", "gameweek", "league_id"],
+                        has_next = league_data["standings"]["has_next"]
+                        page += 1 if has_next else 0
+                    else:
+                        print(
+                            f"⚠ No standings found for league {league_id} on page {page}."
                         )
+                        has_next = False
 
-                    has_next = league_data["standings"]["has_next"]
-                    page += 1 if has_next else 0
-                else:
+                except requests.exceptions.RequestException as req_err:
                     print(
-                        f"⚠ No standings found for league {league_id} on page {page}."
+                        f"❌ Network error on league {league_id}, page {page}: {req_err}"
                     )
+                    all_entries_synced = False
                     has_next = False
+                    raise req_err
+                except Exception as e:
+                    print(f"❌ General error on league {league_id}, page {page}: {e}")
+                    all_entries_synced = False
+                    has_next = False
+                    raise e
 
-            except requests.exceptions.RequestException as req_err:
-                print(f"❌ Network error on league {league_id}, page {page}: {req_err}")
-                all_entries_synced = False
-                has_next = False
-                raise req_err
-            except Exception as e:
-                print(f"❌ General error on league {league_id}, page {page}: {e}")
-                all_entries_synced = False
-                has_next = False
-                raise e
+        if all_entries_synced:
+            self.persist_league_winners(league_id)
 
         print(
             f"{'✅ All entries synced successfully' if all_entries_synced else '⚠ Sync completed with some issues'} for league {league_id}."
         )
         return all_entries_synced
 
+    @traced("sync.invitational", "user_entry_id")
     def sync_all_invitational_classic_leagues_for_user(
         self, user_entry_id: int
     ) -> bool:
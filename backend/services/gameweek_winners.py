@@ -0,0 +1,141 @@
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import and_, delete, exists, func, or_, select
+from sqlalchemy.dialects import postgresql
+
+from db.connector import SQLAlchemyConnector
+from db.schema import (
+    gameweeks,
+    league_gameweek_winners,
+    mini_league_entries,
+    mini_league_gameweek_scores,
+)
+
+# Ranks persisted per league and gameweek; deeper top-K is computed on demand
+PERSISTED_TOP_K = 3
+
+
+def ranked_scores():
+    """
+    Every entry's net gameweek points with its rank inside its league and
+    gameweek, in one window-function pass. Equal points share a rank (RANK)
+    and are flagged as tied.
+    """
+    s = mini_league_gameweek_scores
+    net = s.c.points - func.coalesce(s.c.cost, 0)
+    return select(
+        s.c.league_id,
+        s.c.gameweek,
+        s.c.entry_id,
+        net.label("points"),
+        func.rank()
+        .over(partition_by=(s.c.league_id, s.c.gameweek), order_by=net.desc())
+        .label("rank"),
+        (func.count().over(partition_by=(s.c.league_id, s.c.gameweek, net)) > 1).label(
+            "tied"
+        ),
+    )
+
+
+def _finished_gameweeks():
+    return select(gameweeks.c.gameweek_id).where(gameweeks.c.finished == True)
+
+
+def persist_gameweek_winners(
+    db: SQLAlchemyConnector,
+    league_id: Optional[int] = None,
+    top_k: int = PERSISTED_TOP_K,
+) -> int:
+    """
+    Store the top-K of every finished gameweek, for one league or all of
+    them, and bring stored gameweeks up to date after score corrections:
+    rows whose rank, points or tie changed are updated and entries that
+    fell out of the top-K are deleted. Returns rows written or deleted, so
+    an unchanged table reports 0.
+    """
+    s = mini_league_gameweek_scores
+    w = league_gameweek_winners
+    ranked = ranked_scores().where(s.c.gameweek.in_(_finished_gameweeks()))
+    if league_id is not None:
+        ranked = ranked.where(s.c.league_id == league_id)
+    ranked = ranked.subquery()
+
+    columns = ["league_id", "gameweek", "entry_id", "rank", "points", "tied"]
+    top = select(*(ranked.c[c] for c in columns)).where(ranked.c.rank <= top_k)
+    current = top.subquery()
+
+    stale = delete(w).where(
+        w.c.gameweek.in_(_finished_gameweeks())
+        & ~exists().where(
+            and_(
+                current.c.league_id == w.c.league_id,
+                current.c.gameweek == w.c.gameweek,
+                current.c.entry_id == w.c.entry_id,
+            )
+        )
+    )
+    if league_id is not None:
+        stale = stale.where(w.c.league_id == league_id)
+
+    upsert = postgresql.insert(w).from_select(columns, top)
+    upsert = upsert.on_conflict_do_update(
+        index_elements=[c.name for c in w.primary_key.columns],
+        set_={c: upsert.excluded[c] for c in ("rank", "points", "tied")},
+        where=or_(
+            *(
+                w.c[c].is_distinct_from(upsert.excluded[c])
+                for c in ("rank", "points", "tied")
+            )
+        ),
+    )
+    with db.engine.begin() as conn:
+        written = conn.execute(stale).rowcount + conn.execute(upsert).rowcount
+
+    print(
+        f"🏆 Stored {written} gameweek winner rows"
+        + (f" for league {league_id}" if league_id is not None else "")
+    )
+    return written
+
+
+def league_winners(conn, league_id: int, top_k: int = 1) -> List[Dict[str, Any]]:
+    """
+    Top-K entries of each finished gameweek of a league, grouped by
+    gameweek. Reads the persisted results when they go deep enough,
+    otherwise ranks live over the same gameweeks.
+    """
+    if top_k <= PERSISTED_TOP_K:
+        ranked = select(league_gameweek_winners).subquery()
+    else:
+        ranked = (
+            ranked_scores()
+            .where(mini_league_gameweek_scores.c.gameweek.in_(_finished_gameweeks()))
+            .subquery()
+        )
+
+    query = (
+        select(
+            ranked.c.gameweek,
+            ranked.c.rank,
+            ranked.c.entry_id,
+            mini_league_entries.c.entry_name,
+            mini_league_entries.c.player_name,
+            ranked.c.points,
+            ranked.c.tied,
+        )
+        .select_from(
+            ranked.outerjoin(
+                mini_league_entries,
+                (mini_league_entries.c.entry_id == ranked.c.entry_id)
+                & (mini_league_entries.c.league_id == ranked.c.league_id),
+            )
+        )
+        .where((ranked.c.league_id == league_id) & (ranked.c.rank <= top_k))
+        .order_by(ranked.c.gameweek, ranked.c.rank, ranked.c.entry_id)
+    )
+
+    by_gameweek: Dict[int, List[Dict[str, Any]]] = {}
+    for row in conn.execute(query).mappings():
+        row = dict(row)
+        by_gameweek.setdefault(row.pop("gameweek"), []).append(row)
+    return [{"gameweek": gw, "winners": rows} for gw, rows in by_gameweek.items()]
@@ -0,0 +1,331 @@
+import json
+import queue
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from sqlalchemy import select
+
+from db.connector import SQLAlchemyConnector
+from db.schema import fixtures, player_gameweek_stats
+from services.cache import data_versions
+from services.change_events import MAX_PAYLOAD, notify
+from services.data_sync import FPLDataSync
+
+# Live deltas from the scheduler leader's poller to every process
+LIVE_CHANNEL = "fpl_live"
+
+# Per-player live stats pushed to clients
+LIVE_FIELDS = (
+    "minutes",
+    "goals_scored",
+    "assists",
+    "clean_sheets",
+    "yellow_cards",
+    "red_cards",
+    "bonus",
+    "total_points",
+)
+
+
+def _sse(event: str, data: Any) -> bytes:
+    return (
+        f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n".encode()
+    )
+
+
+class Subscription:
+    def __init__(self, topics: List[str], queue_size: int):
+        self.topics = topics
+        self.queue: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize=queue_size)
+
+
+class LiveBroker:
+    """
+    Fans messages out to subscribers grouped by topic (e.g. ``players``,
+    ``league:<id>``, ``entry:<id>``). Each message is serialized once per
+    topic, however many clients are listening. The latest snapshot per topic
+    is kept so new subscribers start from current state.
+    """
+
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._topics: Dict[str, List[Subscription]] = {}
+        self._snapshots: Dict[str, bytes] = {}
+
+    def subscribe(self, topics: Iterable[str]) -> Subscription:
+        sub = Subscription(list(topics), self.queue_size)
+        with self._lock:
+            for topic in sub.topics:
+                self._topics.setdefault(topic, []).append(sub)
+                if topic in self._snapshots:
+                    sub.queue.put_nowait(self._snapshots[topic])
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        with self._lock:
+            for topic in sub.topics:
+                subs = self._topics.get(topic, [])
+                if sub in subs:
+                    subs.remove(sub)
+                if not subs:
+                    self._topics.pop(topic, None)
+
+    def has_subscribers(self, topic: Optional[str] = None) -> bool:
+        with self._lock:
+            return bool(self._topics.get(topic) if topic else self._topics)
+
+    def topics(self) -> List[str]:
+        with self._lock:
+            return list(self._topics)
+
+    def set_snapshot(self, topic: str, data: Any):
+        with self._lock:
+            self._snapshots[topic] = _sse("snapshot", data)
+
+    def publish(self, topic: str, event: str, data: Any):
+        message = _sse(event, data)
+        with self._lock:
+            subs = list(self._topics.get(topic, []))
+        for sub in subs:
+            try:
+                sub.queue.put_nowait(message)
+            except queue.Full:
+                # A client that can't keep up is dropped rather than
+                # buffering without bound; it will reconnect and resnapshot
+                self.unsubscribe(sub)
+                with sub.queue.mutex:
+                    sub.queue.queue.clear()
+                sub.queue.put_nowait(None)
+
+    def stream(self, sub: Subscription, heartbeat: float = 15.0) -> Iterator[bytes]:
+        """Yield SSE frames for a subscription until the client goes away."""
+        try:
+            while True:
+                try:
+                    message = sub.queue.get(timeout=heartbeat)
+                except queue.Empty:
+                    yield b": keep-alive\n\n"
+                    continue
+                if message is None:
+                    return
+                yield message
+        finally:
+            self.unsubscribe(sub)
+
+
+class LiveFeed:
+    """
+    This process's copy of the current gameweek's live player stats.
+
+    Only the sync scheduler's leader polls upstream (see ``LivePoller``);
+    every other process follows the deltas it broadcasts on
+    ``LIVE_CHANNEL``. A process starts following once something needs the
+    feed (a stream subscriber, a live league request): it seeds from the
+    stored live data and applies deltas from then on, publishing the
+    ``players`` snapshot and deltas to ``broker``. ``listeners`` are called
+    with ``(event_id, changed_ids)`` after each complete tick.
+    """
+
+    def __init__(self, db: SQLAlchemyConnector, broker: LiveBroker):
+        self.db = db
+        self.broker = broker
+        self.listeners: List[Callable[[int, List[int]], None]] = []
+        self.version = 0  # complete ticks applied
+        self._lock = threading.Lock()
+        self._gameweek: Optional[int] = None
+        self._state: Dict[int, Dict[str, Any]] = {}
+        self._fixtures: List[Dict[str, Any]] = []
+        self._pending: List[int] = []
+
+    def follow(self, event_id: int):
+        """Start (or move) following ``event_id``, seeding from the database."""
+        with self._lock:
+            if self._gameweek == event_id:
+                return
+            self._seed(event_id)
+        self._notify_listeners(event_id, [])
+
+    def reset(self):
+        """Reseed after a gap in which deltas may have been missed."""
+        with self._lock:
+            event_id = self._gameweek
+            if event_id is None:
+                return
+            self._seed(event_id)
+        self._notify_listeners(event_id, [])
+
+    def _seed(self, event_id: int):
+        s = player_gameweek_stats
+        with self.db.engine.connect() as conn:
+            rows = conn.execute(
+                select(s.c.player_id, *(s.c[f] for f in LIVE_FIELDS)).where(
+                    s.c.gameweek == event_id
+                )
+            ).all()
+            fixture_rows = conn.execute(
+                select(fixtures.c.team_h, fixtures.c.team_a, fixtures.c.finished).where(
+                    fixtures.c.gameweek == event_id
+                )
+            ).all()
+        self._gameweek = event_id
+        self._state = {row[0]: dict(zip(LIVE_FIELDS, row[1:])) for row in rows}
+        self._fixtures = [
+            {"team_h": h, "team_a": a, "finished": bool(done)}
+            for h, a, done in fixture_rows
+        ]
+        self._pending = []
+        self.version += 1
+        snapshot = {"gameweek": event_id, "players": self._state}
+        self.broker.set_snapshot("players", snapshot)
+        # Clients already streaming replace their state with this one
+        self.broker.publish("players", "snapshot", snapshot)
+
+    def apply(self, payload: str):
+        """LISTEN handler for ``LIVE_CHANNEL``."""
+        event = json.loads(payload)
+        if event.get("origin") != data_versions.token:
+            self.apply_event(event)
+
+    def apply_event(self, event: Dict[str, Any]):
+        event_id = event["gameweek"]
+        completed: Optional[List[int]] = None
+        with self._lock:
+            if self._gameweek is None:
+                return  # not following
+            if event_id != self._gameweek:
+                # The leader stored the new gameweek before broadcasting it
+                self._seed(event_id)
+                completed = []
+            else:
+                completed = self._apply_delta(event)
+        if completed is not None:
+            self._notify_listeners(event_id, completed)
+
+    def _apply_delta(self, event: Dict[str, Any]) -> Optional[List[int]]:
+        """Apply one notification; returns the tick's changes once it's complete."""
+        if event.get("fixtures") is not None:
+            self._fixtures = [
+                {"team_h": h, "team_a": a, "finished": done}
+                for h, a, done in event["fixtures"]
+            ]
+        changed = {}
+        for player_id, *values in event["players"]:
+            stats = dict(zip(LIVE_FIELDS, values))
+            if self._state.get(player_id) != stats:
+                self._state[player_id] = stats
+                changed[player_id] = stats
+        self._pending.extend(changed)
+
+        event_id = self._gameweek
+        self.broker.set_snapshot(
+            "players", {"gameweek": event_id, "players": self._state}
+        )
+        if changed:
+            self.broker.publish(
+                "players", "delta", {"gameweek": event_id, "players": changed}
+            )
+        if not event.get("last"):
+            return None
+        completed, self._pending = self._pending, []
+        self.version += 1
+        return completed
+
+    def _notify_listeners(self, event_id: int, changed_ids: List[int]):
+        for listener in self.listeners:
+            listener(event_id, changed_ids)
+
+    def live_data(self):
+        """
+        ``(gameweek, live payload, fixtures, version)`` as of the last
+        complete tick, in the shapes the upstream endpoints return.
+        """
+        with self._lock:
+            elements = [
+                {"id": player_id, "stats": dict(stats)}
+                for player_id, stats in self._state.items()
+            ]
+            return (
+                self._gameweek,
+                {"elements": elements},
+                list(self._fixtures),
+                self.version,
+            )
+
+
+class LivePoller:
+    """
+    The single upstream consumer of ``/event/{id}/live/``, driven by the
+    sync scheduler in the one process that holds its leader lock, so
+    upstream and database load are per poll, not per process or viewer.
+
+    Each tick diffs the (already stored) payload against the previous one
+    and broadcasts only the players whose stats changed, plus the
+    fixtures' finished flags, to every process's ``LiveFeed`` over
+    ``LIVE_CHANNEL``, split into as many notifications as the payload
+    limit requires.
+    """
+
+    def __init__(self, data_sync: FPLDataSync, feed: LiveFeed):
+        self.data_sync = data_sync
+        self.feed = feed
+        self._state: Dict[int, List[Any]] = {}
+        self._state_event: Optional[int] = None
+        self._fixtures: Optional[List[List[Any]]] = None
+
+    def tick(self, event_id: int, live_data: dict) -> List[int]:
+        if event_id != self._state_event:
+            self._state, self._state_event, self._fixtures = {}, event_id, None
+
+        changed = []
+        for element in live_data["elements"]:
+            values = [element["stats"].get(f) for f in LIVE_FIELDS]
+            if self._state.get(element["id"]) != values:
+                self._state[element["id"]] = values
+                changed.append([element["id"], *values])
+
+        fixture_flags = [
+            [
+                f["team_h"],
+                f["team_a"],
+                bool(f.get("finished_provisional") or f.get("finished")),
+            ]
+            for f in self.data_sync.fetch_gameweek_fixtures(event_id)
+        ]
+        if fixture_flags == self._fixtures:
+            fixture_flags = None
+        else:
+            self._fixtures = fixture_flags
+
+        for event in self._events(event_id, changed, fixture_flags):
+            # Followers in this process don't hear their own notifications
+            self.feed.apply_event(event)
+            notify(self.feed.db, LIVE_CHANNEL, json.dumps(event, separators=(",", ":")))
+        return [row[0] for row in changed]
+
+    def _events(
+        self,
+        event_id: int,
+        rows: List[List[Any]],
+        fixture_flags: Optional[List[List[Any]]],
+    ) -> List[Dict[str, Any]]:
+        def new_event(fixture_flags):
+            return {
+                "gameweek": event_id,
+                "origin": data_versions.token,
+                "fixtures": fixture_flags,
+                "players": [],
+                "last": False,
+            }
+
+        events = [new_event(fixture_flags)]
+        size = len(json.dumps(events[0]))
+        for row in rows:
+            row_size = len(json.dumps(row, separators=(",", ":"))) + 1
+            if size + row_size > MAX_PAYLOAD and events[-1]["players"]:
+                events.append(new_event(None))
+                size = len(json.dumps(events[-1]))
+            events[-1]["players"].append(row)
+            size += row_size
+        events[-1]["last"] = True
+        return events
@@ -0,0 +1,354 @@
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import select
+
+from db.connector import SQLAlchemyConnector
+from db.schema import entry_chips, entry_picks, mini_league_entries
+from services.live import LiveBroker, LiveFeed
+from services.player_index import PlayerIndex
+
+GK, DEF, MID, FWD = 1, 2, 3, 4
+# Minimum outfield players per position a starting XI must keep
+MIN_FORMATION = {DEF: 3, MID: 2, FWD: 1}
+
+SQUAD_SIZE = 15
+STARTERS = 11
+BENCH_GK = 11  # zero-based slot of the substitute goalkeeper
+
+
+class PicksMatrix:
+    """
+    Picks of many entries for one gameweek as a sparse entry × player matrix
+    in ELL layout: every row holds exactly 15 (player, multiplier) slots in
+    squad order. Missing slots point at player 0 with multiplier 0.
+    """
+
+    def __init__(
+        self,
+        entry_ids: np.ndarray,
+        players: np.ndarray,
+        multipliers: np.ndarray,
+        captain: np.ndarray,
+        vice: np.ndarray,
+        bench_boost: np.ndarray,
+        transfers_cost: np.ndarray,
+    ):
+        self.entry_ids = entry_ids
+        self.players = players
+        self.multipliers = multipliers
+        self.captain = captain
+        self.vice = vice
+        self.bench_boost = bench_boost
+        self.transfers_cost = transfers_cost
+
+    def __len__(self):
+        return len(self.entry_ids)
+
+    @classmethod
+    def from_rows(
+        cls, pick_rows: List[Dict[str, Any]], chip_rows: List[Dict[str, Any]]
+    ) -> "PicksMatrix":
+        entry_ids, row = np.unique(
+            np.array([p["entry_id"] for p in pick_rows], dtype=np.int64),
+            return_inverse=True,
+        )
+        slot = np.array([p["position"] for p in pick_rows], dtype=np.int64) - 1
+        n = len(entry_ids)
+
+        players = np.zeros((n, SQUAD_SIZE), dtype=np.int64)
+        multipliers = np.zeros((n, SQUAD_SIZE), dtype=np.int64)
+        players[row, slot] = [p["player_id"] for p in pick_rows]
+        multipliers[row, slot] = [p["multiplier"] or 0 for p in pick_rows]
+
+        # Default to slot 0 when no armband is recorded; its multiplier is 1
+        captain = np.zeros(n, dtype=np.int64)
+        vice = np.zeros(n, dtype=np.int64)
+        is_captain = np.array([bool(p["is_captain"]) for p in pick_rows])
+        is_vice = np.array([bool(p["is_vice_captain"]) for p in pick_rows])
+        captain[row[is_captain]] = slot[is_captain]
+        vice[row[is_vice]] = slot[is_vice]
+
+        bench_boost = np.zeros(n, dtype=bool)
+        transfers_cost = np.zeros(n, dtype=np.int64)
+        chip_idx = np.searchsorted(entry_ids, [c["entry_id"] for c in chip_rows]).clip(
+            max=max(n - 1, 0)
+        )
+        for i, chip in zip(chip_idx, chip_rows):
+            if n and entry_ids[i] == chip["entry_id"]:
+                bench_boost[i] = chip["active_chip"] == "bboost"
+                transfers_cost[i] = chip["transfers_cost"] or 0
+
+        return cls(
+            entry_ids, players, multipliers, captain, vice, bench_boost, transfers_cost
+        )
+
+    @classmethod
+    def load(cls, db: SQLAlchemyConnector, gameweek: int) -> "PicksMatrix":
+        """Load the gameweek's picks of every entry in a synced mini-league."""
+        synced_entries = select(mini_league_entries.c.entry_id).distinct()
+        with db.engine.connect() as conn:
+            pick_rows = (
+                conn.execute(
+                    select(entry_picks)
+                    .where(
+                        (entry_picks.c.gameweek == gameweek)
+                        & entry_picks.c.entry_id.in_(synced_entries)
+                    )
+                    .order_by(entry_picks.c.entry_id, entry_picks.c.position)
+                )
+                .mappings()
+                .all()
+            )
+            chip_rows = (
+                conn.execute(
+                    select(entry_chips).where(entry_chips.c.gameweek == gameweek)
+                )
+                .mappings()
+                .all()
+            )
+        return cls.from_rows(pick_rows, chip_rows)
+
+
+class LiveVectors:
+    """Dense per-player live vectors indexed by player id (index 0 unused)."""
+
+    def __init__(self, points, minutes, done, position):
+        self.points = points
+        self.minutes = minutes
+        self.done = done
+        self.position = position
+
+    @classmethod
+    def from_live(
+        cls, live_data: dict, fixtures: List[dict], player_index: PlayerIndex
+    ) -> "LiveVectors":
+        """
+        ``done`` marks players whose matches are over, which is when FPL
+        applies automatic substitutions. Teams without a fixture (blanks)
+        count as done.
+        """
+        ids = player_index.columns["player_id"]
+        elements = live_data["elements"]
+        size = max([0, *ids.tolist(), *(e["id"] for e in elements)]) + 1
+
+        points = np.zeros(size, dtype=np.int64)
+        minutes = np.zeros(size, dtype=np.int64)
+        live_ids = [e["id"] for e in elements]
+        points[live_ids] = [e["stats"]["total_points"] for e in elements]
+        minutes[live_ids] = [e["stats"]["minutes"] for e in elements]
+
+        position = np.zeros(size, dtype=np.int64)
+        position[ids] = player_index.columns["position_type_id"]
+
+        team_ids = player_index.columns["team_id"]
+        team_done = np.ones(int(team_ids.max(initial=0)) + 1, dtype=bool)
+        for fixture in fixtures:
+            finished = bool(
+                fixture.get("finished_provisional") or fixture.get("finished")
+            )
+            for team in (fixture["team_h"], fixture["team_a"]):
+                if team < len(team_done):
+                    team_done[team] &= finished
+        done = np.ones(size, dtype=bool)
+        done[ids] = team_done[team_ids]
+
+        return cls(points, minutes, done, position)
+
+
+def score(picks: PicksMatrix, live: LiveVectors) -> np.ndarray:
+    """
+    Live gameweek points for every entry in ``picks``.
+
+    Automatic substitutions and the vice-captain fallback only rewrite the
+    multiplier matrix; the score itself is one sparse matrix-vector product
+    of the multipliers against the live points vector. All steps are
+    vectorized over entries, with fixed small loops over squad slots.
+    """
+    n = len(picks)
+    rows = np.arange(n)
+    # Players unknown to the live vectors score nothing (index 0)
+    P = np.where(picks.players < len(live.points), picks.players, 0)
+    M = picks.multipliers
+    minutes = live.minutes[P]
+    played = minutes > 0
+    absent = ~played & live.done[P]
+    pos = live.position[P]
+
+    in_xi = np.zeros((n, SQUAD_SIZE), dtype=bool)
+    in_xi[:, :STARTERS] = True
+    in_xi[picks.bench_boost] = True
+    subs = ~picks.bench_boost
+
+    # Goalkeeper: only the substitute keeper can replace the starter
+    gk_sub = subs & absent[:, 0] & played[:, BENCH_GK]
+    in_xi[gk_sub, 0] = False
+    in_xi[gk_sub, BENCH_GK] = True
+
+    # Outfield: bench in order, each replacing the first absent starter
+    # whose removal keeps a valid formation
+    counts = {
+        t: ((pos[:, 1:STARTERS] == t) & in_xi[:, 1:STARTERS]).sum(1)
+        for t in MIN_FORMATION
+    }
+    for b in range(BENCH_GK + 1, SQUAD_SIZE):
+        available = subs & played[:, b]
+        for s in range(1, STARTERS):
+            swap = available & in_xi[:, s] & absent[:, s]
+            for t, minimum in MIN_FORMATION.items():
+                after = counts[t] - (pos[:, s] == t) + (pos[:, b] == t)
+                swap &= after >= minimum
+            in_xi[swap, s] = False
+            in_xi[swap, b] = True
+            for t in MIN_FORMATION:
+                counts[t] += np.where(
+                    swap, (pos[:, b] == t).astype(int) - (pos[:, s] == t), 0
+                )
+            available &= ~swap
+
+    effective = np.where(in_xi, np.maximum(M, 1), 0)
+
+    # The vice-captain takes the armband if the captain won't play
+    cap_multiplier = M[rows, picks.captain]
+    vice_takes = (
+        absent[rows, picks.captain] & in_xi[rows, picks.vice] & played[rows, picks.vice]
+    )
+    effective[rows[vice_takes], picks.vice[vice_takes]] = cap_multiplier[vice_takes]
+
+    return (effective * live.points[P]).sum(axis=1) - picks.transfers_cost
+
+
+class LiveLeagueScorer:
+    """
+    Keeps every synced league's picks for the current gameweek in one
+    PicksMatrix and rescores all of them from this process's LiveFeed:
+    after each tick while anyone here streams a ``league:<id>`` or
+    ``entry:<id>`` topic (publishing standings and scores to them), and
+    otherwise on demand when a league's live standings are requested.
+    """
+
+    def __init__(
+        self,
+        db: SQLAlchemyConnector,
+        feed: LiveFeed,
+        broker: LiveBroker,
+        player_index: Callable[[], PlayerIndex],
+    ):
+        self.db = db
+        self.feed = feed
+        self.broker = broker
+        self.player_index = player_index
+        self._lock = threading.Lock()
+        self._gameweek: Optional[int] = None
+        self._picks: Optional[PicksMatrix] = None
+        self._leagues: Dict[int, np.ndarray] = {}
+        self._names: Dict[int, str] = {}
+        self._scores: Optional[np.ndarray] = None
+        self._scored_version: Optional[int] = None
+        self.latest: Dict[int, Dict[str, Any]] = {}
+
+    def load(self, gameweek: int):
+        picks = PicksMatrix.load(self.db, gameweek)
+        with self.db.engine.connect() as conn:
+            members = conn.execute(
+                select(
+                    mini_league_entries.c.league_id,
+                    mini_league_entries.c.entry_id,
+                    mini_league_entries.c.entry_name,
+                )
+            ).all()
+
+        by_league: Dict[int, List[int]] = {}
+        for league_id, entry_id, entry_name in members:
+            by_league.setdefault(league_id, []).append(entry_id)
+            self._names[entry_id] = entry_name
+
+        # Row indices into the shared matrix for each league's entries
+        self._leagues = {}
+        for league_id, entry_ids in by_league.items():
+            self._leagues[league_id] = self._rows(picks, entry_ids)
+
+        self._picks, self._gameweek = picks, gameweek
+        self._scores, self._scored_version = None, None
+        self.latest = {}
+        print(
+            f"🧮 Loaded GW{gameweek} picks for {len(picks)} entries in {len(self._leagues)} leagues"
+        )
+
+    @staticmethod
+    def _rows(picks: PicksMatrix, entry_ids) -> np.ndarray:
+        """Matrix rows of ``entry_ids``, skipping entries without picks."""
+        entry_ids = np.asarray(entry_ids, dtype=np.int64)
+        if not len(picks):
+            return np.zeros(0, dtype=np.int64)
+        idx = np.searchsorted(picks.entry_ids, entry_ids).clip(max=len(picks) - 1)
+        return idx[picks.entry_ids[idx] == entry_ids]
+
+    def league(self, league_id: int, event_id: int) -> Optional[Dict[str, Any]]:
+        """A league's live standings for ``event_id``, rescored if stale."""
+        self.feed.follow(event_id)
+        with self._lock:
+            self._rescore()
+            return self.latest.get(league_id)
+
+    def on_tick(self, event_id: int, changed: List[int]):
+        topics = [
+            t for t in self.broker.topics() if t.startswith(("league:", "entry:"))
+        ]
+        if not topics:
+            return  # nobody streams here; requests score on demand
+        with self._lock:
+            if self._rescore():
+                self._publish(topics)
+
+    def _rescore(self) -> bool:
+        """Score every entry against the feed's last complete tick, if newer."""
+        gameweek, live_data, fixtures, version = self.feed.live_data()
+        if gameweek is None or not live_data["elements"]:
+            return False
+        if gameweek != self._gameweek:
+            self.load(gameweek)
+        if version == self._scored_version:
+            return False
+        self._scored_version = version
+        if not len(self._picks):
+            return False
+
+        live = LiveVectors.from_live(live_data, fixtures, self.player_index())
+        scores = self._scores = score(self._picks, live)
+        for league_id, idx in self._leagues.items():
+            order = idx[np.argsort(-scores[idx], kind="stable")]
+            standings = [
+                {
+                    "entry_id": entry_id,
+                    "entry_name": self._names.get(entry_id),
+                    "live_points": points,
+                }
+                for entry_id, points in zip(
+                    self._picks.entry_ids[order].tolist(), scores[order].tolist()
+                )
+            ]
+            self.latest[league_id] = {"gameweek": gameweek, "standings": standings}
+        return True
+
+    def _publish(self, topics: List[str]):
+        for topic in topics:
+            group, group_id = topic.split(":", 1)
+            if group == "league":
+                standings = self.latest.get(int(group_id))
+                if standings:
+                    self.broker.set_snapshot(topic, standings)
+                    self.broker.publish(topic, "scores", standings)
+                continue
+            entry_id = int(group_id)
+            for i in self._rows(self._picks, [entry_id]):
+                self.broker.publish(
+                    topic,
+                    "score",
+                    {
+                        "gameweek": self._gameweek,
+                        "entry_id": entry_id,
+                        "live_points": int(self._scores[i]),
+                    },
+                )
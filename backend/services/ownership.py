@@ -0,0 +1,276 @@
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import delete, func, insert, select
+
+from db.connector import SQLAlchemyConnector
+from db.schema import (
+    entry_picks,
+    gameweeks,
+    league_differentials,
+    league_ownership,
+    mini_league_entries,
+)
+from services.cache import data_versions
+from services.change_events import record_change
+from services.live_scoring import SQUAD_SIZE, PicksMatrix
+from services.player_index import joined_players_query
+
+DEPENDENCIES = ("entry_picks", "mini_league_entries")
+
+# pg_advisory_xact_lock class id; the gameweek is the object id
+ADVISORY_LOCK = 0x0E0E
+
+
+def league_ownership_arrays(
+    picks: PicksMatrix, member_league: np.ndarray, member_row: np.ndarray
+) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Ownership per (league, player) and differential exposure per (league,
+    entry) for every league at once.
+
+    ``member_league`` and ``member_row`` list memberships: a league id and
+    the entry's row in ``picks``, so an entry in several leagues appears
+    once per league. Gathering the members' rows of the ELL matrix gives a
+    membership × player matrix; aggregating it by league is a sparse
+    product with the league × membership indicator, done as a bincount over
+    the distinct (league, player) pairs so cost grows with the picks, not
+    with leagues × players.
+    """
+    league_ids, league = np.unique(member_league, return_inverse=True)
+    size = np.bincount(league, minlength=len(league_ids))
+
+    P = picks.players[member_row]
+    M = picks.multipliers[member_row]
+    # Slot 0 stands in for a missing armband, so require a captain's multiplier
+    captained = (np.arange(SQUAD_SIZE) == picks.captain[member_row][:, None]) & (M > 1)
+    valid = P > 0
+
+    stride = int(P.max(initial=0)) + 1
+    pairs, pair = np.unique((league[:, None] * stride + P)[valid], return_inverse=True)
+    pair_league = pairs // stride
+    members = size[pair_league]
+    ownership = np.bincount(pair) / members
+    effective = np.bincount(pair, weights=M[valid]) / members
+    captaincy = np.bincount(pair, weights=captained[valid]) / members
+
+    # Exposure above the league on players the entry holds; the loss side
+    # follows from sum((m - eo)+) - sum((eo - m)+) = sum(m) - sum(eo)
+    over = np.full(P.shape, -np.inf)
+    over[valid] = M[valid] - effective[pair]
+    gain = np.where(valid, np.maximum(over, 0), 0).sum(axis=1)
+    league_eo = np.bincount(pair_league, weights=effective, minlength=len(league_ids))
+    loss = np.maximum(gain - M.sum(axis=1) + league_eo[league], 0)
+
+    best = over.argmax(axis=1)
+    rows = np.arange(len(member_row))
+    top = np.where(over[rows, best] > 0, P[rows, best], 0)
+
+    return {
+        "ownership": {
+            "league_id": league_ids[pair_league],
+            "player_id": pairs % stride,
+            "ownership": ownership,
+            "effective_ownership": effective,
+            "captaincy": captaincy,
+        },
+        "differentials": {
+            "league_id": member_league,
+            "entry_id": picks.entry_ids[member_row],
+            "gain_exposure": gain,
+            "loss_exposure": loss,
+            "top_differential": top,
+        },
+    }
+
+
+def _records(columns: Dict[str, np.ndarray], gameweek: int) -> List[Dict[str, Any]]:
+    values = {
+        name: (
+            array.round(4).tolist()
+            if array.dtype.kind == "f"
+            else array.astype(int).tolist()
+        )
+        for name, array in columns.items()
+    }
+    names = list(values)
+    return [
+        {"gameweek": gameweek, **dict(zip(names, row))}
+        for row in zip(*(values[name] for name in names))
+    ]
+
+
+class LeagueOwnership:
+    """
+    Effective ownership, captaincy and per-entry differential exposure of
+    every synced mini-league, computed in one vectorized pass over the
+    gameweek's picks and stored for instant reads. Picks lock at the
+    deadline, so a gameweek is recomputed only when its picks or league
+    memberships were synced again. Runs for the same gameweek, from any
+    process, are serialized with a transaction-level advisory lock held
+    from the reads to the commit, so they can't interleave their writes.
+    """
+
+    def __init__(self, db: SQLAlchemyConnector):
+        self.db = db
+        self._last_versions = None
+
+    def current_gameweek(self, conn) -> Optional[int]:
+        return conn.execute(
+            select(gameweeks.c.gameweek_id).where(gameweeks.c.is_current.is_(True))
+        ).scalar()
+
+    def run(self, gameweek: Optional[int] = None, force: bool = False) -> int:
+        """Recompute ``gameweek`` (default: current) for all synced leagues."""
+        versions = data_versions.get(*DEPENDENCIES)
+        default = gameweek is None
+        if not force and default and versions == self._last_versions:
+            return 0
+
+        with self.db.engine.connect() as conn:
+            gameweek = gameweek or self.current_gameweek(conn)
+        if gameweek is None:
+            return 0
+
+        with self.db.engine.begin() as conn:
+            conn.execute(select(func.pg_advisory_xact_lock(ADVISORY_LOCK, gameweek)))
+            leagues = self._recompute(conn, gameweek)
+        record_change(self.db, league_ownership.name, leagues)
+        record_change(self.db, league_differentials.name, leagues)
+        if default:
+            # Only the default target is skipped when unchanged
+            self._last_versions = versions
+        return len(leagues)
+
+    def _recompute(self, conn, gameweek: int) -> List[int]:
+        """Replace the gameweek's rows on ``conn``; returns the leagues stored."""
+        members = conn.execute(
+            select(mini_league_entries.c.league_id, mini_league_entries.c.entry_id)
+        ).all()
+        # Read after taking the lock, so the last run stores the newest picks
+        picks = PicksMatrix.load(self.db, gameweek)
+
+        member_league = np.array([m[0] for m in members], dtype=np.int64)
+        member_entry = np.array([m[1] for m in members], dtype=np.int64)
+        # Matrix row of each membership; entries without picks are left out
+        idx = np.searchsorted(picks.entry_ids, member_entry).clip(
+            max=max(len(picks) - 1, 0)
+        )
+        has_picks = np.zeros(len(members), dtype=bool)
+        if len(picks):
+            has_picks = picks.entry_ids[idx] == member_entry
+        arrays = league_ownership_arrays(
+            picks, member_league[has_picks], idx[has_picks]
+        )
+        ownership_rows = _records(arrays["ownership"], gameweek)
+        differential_rows = _records(arrays["differentials"], gameweek)
+
+        # Replace the whole gameweek so players nobody holds any more drop out
+        for table, rows in (
+            (league_ownership, ownership_rows),
+            (league_differentials, differential_rows),
+        ):
+            conn.execute(delete(table).where(table.c.gameweek == gameweek))
+            if rows:
+                conn.execute(insert(table), rows)
+
+        league_ids = np.unique(arrays["ownership"]["league_id"]).tolist()
+        print(
+            f"👥 Ownership for GW{gameweek}: {len(league_ids)} leagues, "
+            f"{len(differential_rows)} entries"
+        )
+        return league_ids
+
+
+def _latest_gameweek(conn, table, league_id: int) -> Optional[int]:
+    return conn.execute(
+        select(func.max(table.c.gameweek)).where(table.c.league_id == league_id)
+    ).scalar()
+
+
+def league_ownership_rows(
+    conn, league_id: int, gameweek: Optional[int] = None, limit: int = 100
+) -> List[Dict[str, Any]]:
+    """A league's most owned players by effective ownership."""
+    gameweek = gameweek or _latest_gameweek(conn, league_ownership, league_id)
+    o = league_ownership
+    p = joined_players_query().subquery()
+    query = (
+        select(
+            o.c.gameweek,
+            o.c.player_id,
+            p.c.player_name,
+            p.c.position,
+            p.c.team,
+            o.c.ownership,
+            o.c.effective_ownership,
+            o.c.captaincy,
+        )
+        .select_from(o.outerjoin(p, p.c.player_id == o.c.player_id))
+        .where((o.c.league_id == league_id) & (o.c.gameweek == gameweek))
+        .order_by(o.c.effective_ownership.desc(), o.c.player_id)
+        .limit(limit)
+    )
+    return [dict(row) for row in conn.execute(query).mappings()]
+
+
+def league_differential_rows(
+    conn, league_id: int, gameweek: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """Every entry of a league, most exposed above the league first."""
+    gameweek = gameweek or _latest_gameweek(conn, league_differentials, league_id)
+    d = league_differentials
+    query = (
+        select(
+            d.c.gameweek,
+            d.c.entry_id,
+            mini_league_entries.c.entry_name,
+            mini_league_entries.c.player_name,
+            d.c.gain_exposure,
+            d.c.loss_exposure,
+            d.c.top_differential,
+        )
+        .select_from(
+            d.outerjoin(
+                mini_league_entries,
+                (mini_league_entries.c.entry_id == d.c.entry_id)
+                & (mini_league_entries.c.league_id == d.c.league_id),
+            )
+        )
+        .where((d.c.league_id == league_id) & (d.c.gameweek == gameweek))
+        .order_by(d.c.gain_exposure.desc(), d.c.entry_id)
+    )
+    return [dict(row) for row in conn.execute(query).mappings()]
+
+
+def entry_differential_rows(
+    conn, league_id: int, entry_id: int, gameweek: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    An entry's multiplier against the league's effective ownership for every
+    player the league owns: positive rows gain ground when the player
+    scores, negative rows lose it.
+    """
+    gameweek = gameweek or _latest_gameweek(conn, league_ownership, league_id)
+    o = league_ownership
+    held = (
+        select(entry_picks.c.player_id, entry_picks.c.multiplier)
+        .where(
+            (entry_picks.c.entry_id == entry_id) & (entry_picks.c.gameweek == gameweek)
+        )
+        .subquery()
+    )
+    multiplier = func.coalesce(held.c.multiplier, 0)
+    differential = multiplier - o.c.effective_ownership
+    query = (
+        select(
+            o.c.player_id,
+            multiplier.label("multiplier"),
+            o.c.effective_ownership,
+            differential.label("differential"),
+        )
+        .select_from(o.outerjoin(held, held.c.player_id == o.c.player_id))
+        .where((o.c.league_id == league_id) & (o.c.gameweek == gameweek))
+        .order_by(differential.desc(), o.c.player_id)
+    )
+    return [dict(row) for row in conn.execute(query).mappings()]
@@ -0,0 +1,132 @@
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import select
+
+from db.connector import SQLAlchemyConnector
+from db.schema import players, positions, teams
+
+SORT_COLUMNS = ("total_points", "cost", "minutes", "selected_by_percent")
+
+# Output columns, in the order served by /api/top_performing_players
+RESULT_COLUMNS = (
+    "player_id",
+    "player_name",
+    "total_points",
+    "cost",
+    "position",
+    "team",
+)
+
+
+def joined_players_query():
+    """Players joined with their position and team names."""
+    return select(
+        players.c.player_id,
+        players.c.name.label("player_name"),
+        players.c.total_points,
+        players.c.cost,
+        players.c.minutes,
+        players.c.selected_by_percent,
+        players.c.goals_scored,
+        players.c.assists,
+        players.c.clean_sheets,
+        players.c.yellow_cards,
+        players.c.red_cards,
+        players.c.position_type_id,
+        players.c.team.label("team_id"),
+        positions.c.singular_name.label("position"),
+        teams.c.name.label("team"),
+    ).select_from(
+        players.join(
+            positions,
+            players.c.position_type_id == positions.c.position_type_id,
+        ).join(teams, players.c.team == teams.c.team_id)
+    )
+
+
+def _string_column(values) -> np.ndarray:
+    # Fixed-width unicode rather than object dtype so snapshots can be mmapped
+    return np.array([v or "" for v in values], dtype=str)
+
+
+class PlayerIndex:
+    """
+    Columnar in-memory snapshot of the joined players table.
+
+    Every column is a NumPy array and each sortable column has a precomputed
+    order in each direction, so a filtered top-N is a boolean mask over one
+    permutation instead of a join and sort per request. Columns may be
+    read-only memory maps shared between processes.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray]):
+        self.columns = columns
+        self.size = len(columns["player_id"])
+
+    @classmethod
+    def from_rows(cls, rows: List[Dict[str, Any]]) -> "PlayerIndex":
+        def ints(name):
+            return np.array([r[name] or 0 for r in rows], dtype=np.int64)
+
+        def floats(name):
+            return np.array([float(r[name] or 0) for r in rows], dtype=np.float64)
+
+        columns = {
+            "player_id": ints("player_id"),
+            "total_points": ints("total_points"),
+            "cost": floats("cost"),
+            "minutes": ints("minutes"),
+            "selected_by_percent": floats("selected_by_percent"),
+            "goals_scored": ints("goals_scored"),
+            "assists": ints("assists"),
+            "clean_sheets": ints("clean_sheets"),
+            "yellow_cards": ints("yellow_cards"),
+            "red_cards": ints("red_cards"),
+            "position_type_id": ints("position_type_id"),
+            "team_id": ints("team_id"),
+            "player_name": _string_column(r["player_name"] for r in rows),
+            "position": _string_column(r["position"] for r in rows),
+            "team": _string_column(r["team"] for r in rows),
+        }
+        # By value in each direction, ties broken by ascending player_id
+        for col in SORT_COLUMNS:
+            columns[f"order_{col}"] = np.lexsort((columns["player_id"], -columns[col]))
+            columns[f"order_asc_{col}"] = np.lexsort(
+                (columns["player_id"], columns[col])
+            )
+        return cls(columns)
+
+    @classmethod
+    def load(cls, db: SQLAlchemyConnector) -> "PlayerIndex":
+        with db.engine.connect() as conn:
+            rows = [dict(r) for r in conn.execute(joined_players_query()).mappings()]
+        return cls.from_rows(rows)
+
+    def top(
+        self,
+        limit: int = 10,
+        sort: str = "total_points",
+        order: str = "desc",
+        position: Optional[int] = None,
+        team: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"Cannot sort by {sort}")
+        if order not in ("asc", "desc"):
+            raise ValueError(f"Cannot order {order}")
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+
+        prefix = "order_" if order == "desc" else "order_asc_"
+        ranked = self.columns[prefix + sort]
+
+        mask = np.ones(self.size, dtype=bool)
+        if position:
+            mask &= self.columns["position_type_id"] == position
+        if team:
+            mask &= self.columns["team_id"] == team
+
+        selected = ranked[mask[ranked]][:limit]
+        columns = {col: self.columns[col][selected].tolist() for col in RESULT_COLUMNS}
+        return [dict(zip(columns, values)) for values in zip(*columns.values())]
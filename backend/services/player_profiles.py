@@ -0,0 +1,147 @@
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+# Stats ranked against the player's position
+PERCENTILE_STATS = (
+    "total_points",
+    "minutes",
+    "goals_scored",
+    "assists",
+    "clean_sheets",
+    "cost",
+    "selected_by_percent",
+    "points_per_90",
+)
+
+# Per-90 rates, playing time and price describe a player for similarity
+SIMILARITY_STATS = (
+    "points_per_90",
+    "goals_per_90",
+    "assists_per_90",
+    "clean_sheets_per_90",
+    "minutes",
+    "cost",
+)
+
+# Below this many minutes per-90 rates are noise, so they count as zero
+MIN_MINUTES = 90
+
+
+def _per_90(players: Dict[str, np.ndarray], stat: str) -> np.ndarray:
+    minutes = players["minutes"].astype(np.float64)
+    return np.divide(
+        players[stat] * 90.0,
+        minutes,
+        out=np.zeros(len(minutes)),
+        where=minutes >= MIN_MINUTES,
+    )
+
+
+def build_profile_columns(players: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Per-position percentile ranks (``pct_<stat>``, 0-100) and standardized
+    similarity vectors (``vectors``, players × SIMILARITY_STATS) for the
+    columns of a PlayerIndex. Row order matches the index.
+    """
+    stats = {name: players[name].astype(np.float64) for name in PERCENTILE_STATS[:-1]}
+    stats["points_per_90"] = _per_90(players, "total_points")
+    stats["goals_per_90"] = _per_90(players, "goals_scored")
+    stats["assists_per_90"] = _per_90(players, "assists")
+    stats["clean_sheets_per_90"] = _per_90(players, "clean_sheets")
+
+    n = len(players["player_id"])
+    columns = {f"pct_{name}": np.zeros(n) for name in PERCENTILE_STATS}
+    vectors = np.zeros((n, len(SIMILARITY_STATS)), dtype=np.float32)
+
+    position = players["position_type_id"]
+    for p in np.unique(position):
+        rows = np.flatnonzero(position == p)
+        for name in PERCENTILE_STATS:
+            values = stats[name][rows]
+            ranked = np.sort(values)
+            # Midpoint rank, so ties share a percentile
+            below = np.searchsorted(ranked, values, side="left")
+            at_or_below = np.searchsorted(ranked, values, side="right")
+            columns[f"pct_{name}"][rows] = (below + at_or_below) * 50.0 / len(rows)
+        block = np.column_stack([stats[name][rows] for name in SIMILARITY_STATS])
+        spread = block.std(axis=0)
+        vectors[rows] = (block - block.mean(axis=0)) / np.where(spread > 0, spread, 1)
+
+    columns["vectors"] = vectors
+    columns["points_per_90"] = stats["points_per_90"]
+    return columns
+
+
+class PlayerProfiles:
+    """
+    Percentile and similarity lookups over precomputed profile columns.
+
+    The columns are built once per reference snapshot (after each bootstrap
+    sync), so a comparison is a handful of array reads and a similarity
+    search is one distance computation over the position's vectors.
+    """
+
+    def __init__(self, players: Dict[str, np.ndarray], profiles: Dict[str, np.ndarray]):
+        self.players = players
+        self.profiles = profiles
+        self._rows = {int(pid): row for row, pid in enumerate(players["player_id"])}
+
+    def row(self, player_id: int) -> int:
+        if player_id not in self._rows:
+            raise KeyError(player_id)
+        return self._rows[player_id]
+
+    def profile(self, player_id: int) -> Dict[str, Any]:
+        row = self.row(player_id)
+        p = self.players
+        return {
+            "player_id": player_id,
+            "player_name": str(p["player_name"][row]),
+            "position": str(p["position"][row]),
+            "team": str(p["team"][row]),
+            "stats": {
+                name: (
+                    float(self.profiles[name][row])
+                    if name in self.profiles
+                    else p[name][row].item()
+                )
+                for name in PERCENTILE_STATS
+            },
+            "percentiles": {
+                name: round(float(self.profiles[f"pct_{name}"][row]), 1)
+                for name in PERCENTILE_STATS
+            },
+        }
+
+    def compare(self, player_ids: List[int]) -> List[Dict[str, Any]]:
+        return [self.profile(pid) for pid in player_ids]
+
+    def similar(
+        self, player_id: int, k: int = 10, position: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        The ``k`` nearest players by Euclidean distance between standardized
+        stat vectors, within ``position`` (default: the player's own).
+        """
+        row = self.row(player_id)
+        if position is None:
+            position = int(self.players["position_type_id"][row])
+        rows = np.flatnonzero(self.players["position_type_id"] == position)
+        rows = rows[rows != row]
+
+        vectors = self.profiles["vectors"]
+        distance = np.linalg.norm(vectors[rows] - vectors[row], axis=1)
+        k = min(k, len(rows))
+        nearest = np.argpartition(distance, k - 1)[:k] if k else rows[:0]
+        nearest = nearest[np.argsort(distance[nearest], kind="stable")]
+
+        return [
+            {
+                "player_id": int(self.players["player_id"][r]),
+                "player_name": str(self.players["player_name"][r]),
+                "team": str(self.players["team"][r]),
+                "distance": round(float(d), 3),
+            }
+            for r, d in zip(rows[nearest].tolist(), distance[nearest].tolist())
+        ]
@@ -0,0 +1,204 @@
+import atexit
+import fcntl
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+import numpy as np
+from sqlalchemy import Boolean, DateTime, Float, Integer
+
+from db.connector import SQLAlchemyConnector
+from db.schema import gameweeks, positions, teams
+from services.cache import data_versions
+from services.player_index import PlayerIndex
+from services.player_profiles import PlayerProfiles, build_profile_columns
+
+# Tables copied verbatim into the snapshot; players goes through PlayerIndex
+TABLES = {"teams": teams, "positions": positions, "gameweeks": gameweeks}
+
+
+def _column_array(column, values) -> np.ndarray:
+    if isinstance(column.type, Boolean):
+        return np.array([bool(v) for v in values], dtype=bool)
+    if isinstance(column.type, Integer):
+        return np.array([v or 0 for v in values], dtype=np.int64)
+    if isinstance(column.type, Float):
+        return np.array([v or 0.0 for v in values], dtype=np.float64)
+    if isinstance(column.type, DateTime):
+        return np.array(values, dtype="datetime64[s]")
+    # Fixed-width unicode rather than object dtype so it can be mmapped
+    return np.array([v or "" for v in values], dtype=str)
+
+
+class ReferenceSnapshot:
+    """
+    Read-only columnar copy of the read-mostly reference tables: players
+    (as a PlayerIndex, plus derived PlayerProfiles), teams, positions and
+    gameweeks.
+    """
+
+    def __init__(self, tables: Dict[str, Dict[str, np.ndarray]]):
+        self.tables = tables
+        self.players = PlayerIndex(tables["players"])
+        self.profiles = PlayerProfiles(tables["players"], tables["profiles"])
+
+    @classmethod
+    def load(cls, db: SQLAlchemyConnector) -> "ReferenceSnapshot":
+        tables = {"players": PlayerIndex.load(db).columns}
+        tables["profiles"] = build_profile_columns(tables["players"])
+        with db.engine.connect() as conn:
+            for name, table in TABLES.items():
+                rows = conn.execute(table.select()).all()
+                tables[name] = {
+                    column.name: _column_array(column, [row[i] for row in rows])
+                    for i, column in enumerate(table.columns)
+                }
+        return cls(tables)
+
+    def save(self, directory: str):
+        for table, columns in self.tables.items():
+            for column, values in columns.items():
+                np.save(os.path.join(directory, f"{table}.{column}.npy"), values)
+
+    @classmethod
+    def open(cls, directory: str) -> "ReferenceSnapshot":
+        """Memory-map a saved snapshot; the pages are shared by every process."""
+        tables: Dict[str, Dict[str, np.ndarray]] = {}
+        for filename in os.listdir(directory):
+            table, column, _ = filename.split(".")
+            tables.setdefault(table, {})[column] = np.load(
+                os.path.join(directory, filename), mmap_mode="r"
+            )
+        return cls(tables)
+
+    @property
+    def current_gameweek(self) -> Optional[int]:
+        gws = self.tables["gameweeks"]
+        current = np.flatnonzero(gws["is_current"])
+        return int(gws["gameweek_id"][current[0]]) if len(current) else None
+
+
+class ReferenceStore:
+    """
+    Publishes ReferenceSnapshots as .npy files in a shared directory (tmpfs
+    where available) that every process memory-maps read-only.
+
+    Create the store and call ``preload`` in the master before forking:
+    workers inherit the mapping, so one physical copy serves them all.
+    The published generation lives in shared memory allocated before the
+    fork. When any process refreshes after a sync, the others notice the new
+    generation on their next request and map it without being reloaded.
+
+    With change events every worker learns of a sync at once. Builds are
+    serialized under the publish lock, and a worker whose pending writes are
+    older than the published snapshot maps it instead of building its own.
+    """
+
+    DEPENDENCIES = ("players", "positions", "teams", "gameweeks")
+
+    def __init__(self, db: SQLAlchemyConnector, directory: Optional[str] = None):
+        self.db = db
+        if directory is None:
+            shm = "/dev/shm" if os.path.isdir("/dev/shm") else None
+            directory = tempfile.mkdtemp(prefix="fantasy-foundry-", dir=shm)
+            owner = os.getpid()
+
+            def cleanup():
+                # Forked workers inherit atexit hooks; only the creator cleans up
+                if os.getpid() == owner:
+                    shutil.rmtree(directory, ignore_errors=True)
+
+            atexit.register(cleanup)
+        self.directory = directory
+        self._generation = multiprocessing.RawValue("Q", 0)
+        # When the published generation started loading (unix time)
+        self._published_at = multiprocessing.RawValue("d", 0.0)
+        self._lock = threading.Lock()
+        self._snapshot: Optional[ReferenceSnapshot] = None
+        self._snapshot_generation = 0
+        self._version = None
+
+    def preload(self):
+        """Build and publish the first snapshot. Call before forking workers."""
+        with self._lock:
+            self._refresh()
+
+    def get(self) -> ReferenceSnapshot:
+        if not self._is_current():
+            with self._lock:
+                if not self._is_current():
+                    if self._version != data_versions.get(*self.DEPENDENCIES):
+                        # The reference tables changed, here or (via change events) elsewhere
+                        self._refresh()
+                    else:
+                        self._adopt()
+        return self._snapshot
+
+    def _is_current(self) -> bool:
+        return (
+            self._snapshot is not None
+            and self._snapshot_generation == self._generation.value
+            and self._version == data_versions.get(*self.DEPENDENCIES)
+        )
+
+    @contextmanager
+    def _publish_lock(self):
+        with open(os.path.join(self.directory, ".lock"), "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _path(self, generation: int) -> str:
+        return os.path.join(self.directory, f"gen-{generation}")
+
+    def _refresh(self):
+        version = data_versions.get(*self.DEPENDENCIES)
+        synced_at = data_versions.last_synced(*self.DEPENDENCIES)
+
+        with self._publish_lock():
+            generation = self._generation.value
+            if generation and self._published_at.value >= synced_at:
+                # Another process loaded after these writes; share its build
+                self._snapshot = ReferenceSnapshot.open(self._path(generation))
+                self._snapshot_generation = generation
+                self._version = version
+                return
+
+            started = time.time()
+            snapshot = ReferenceSnapshot.load(self.db)
+            generation += 1
+            staging = tempfile.mkdtemp(dir=self.directory)
+            snapshot.save(staging)
+            os.rename(staging, self._path(generation))
+            self._generation.value = generation
+            self._published_at.value = started
+
+            # Processes still on the previous generation keep their mappings
+            # valid even once its files are unlinked
+            for name in os.listdir(self.directory):
+                if name.startswith("gen-") and int(name[4:]) < generation - 1:
+                    shutil.rmtree(os.path.join(self.directory, name))
+
+        self._snapshot = ReferenceSnapshot.open(self._path(generation))
+        self._snapshot_generation = generation
+        self._version = version
+        print(
+            f"📦 Published reference snapshot generation {generation} "
+            f"({snapshot.players.size} players)"
+        )
+
+    def _adopt(self):
+        # Hold the lock so the generation can't be pruned before it is mapped
+        with self._publish_lock():
+            generation = self._generation.value
+            self._snapshot = ReferenceSnapshot.open(self._path(generation))
+        self._snapshot_generation = generation
+        # The writes behind it reach our data versions as change events
+        self._version = data_versions.get(*self.DEPENDENCIES)
@@ -0,0 +1,447 @@
+import bisect
+import fcntl
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import select
+
+from db.schema import fixtures, gameweeks, mini_league_entries
+from services.data_sync import FPLDataSync
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+
+# Prices change once a day, shortly after 01:30 UK time
+PRICE_CHANGE_TZ = ZoneInfo("Europe/London")
+PRICE_CHANGE_WINDOW = (timedelta(hours=1, minutes=20), timedelta(hours=2, minutes=30))
+
+# Kickoff to final whistle, stoppage time included
+MATCH_LENGTH = timedelta(minutes=120)
+# Bonus points and final stats settle within this long of the final whistle
+SETTLE_TIME = timedelta(hours=2)
+# Team news and transfers cluster around the deadline
+DEADLINE_WINDOW = (timedelta(hours=3), timedelta(hours=1))
+# Nothing kicks off and no deadline passes within this long: between gameweeks
+QUIET_HORIZON = timedelta(hours=24)
+
+TICK = 15.0
+CALENDAR_TTL = MINUTE
+LEADER_RETRY = MINUTE
+
+Bounds = Tuple[float, float]
+
+
+def _utc(value: datetime) -> datetime:
+    # Naive timestamps from the database are stored in UTC
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+class Calendar:
+    """Gameweek deadlines and fixture kickoffs, which drive the schedule."""
+
+    def __init__(
+        self,
+        deadlines: List[datetime],
+        kickoffs: List[datetime],
+        current: Optional[int] = None,
+        current_checked: bool = False,
+    ):
+        self.deadlines = sorted(_utc(d) for d in deadlines)
+        self.kickoffs = sorted(_utc(k) for k in kickoffs)
+        self.current = current
+        self.current_checked = current_checked
+
+    @classmethod
+    def load(cls, db) -> "Calendar":
+        with db.engine.connect() as conn:
+            gw_rows = conn.execute(
+                select(
+                    gameweeks.c.gameweek_id,
+                    gameweeks.c.deadline_time,
+                    gameweeks.c.is_current,
+                    gameweeks.c.data_checked,
+                )
+            ).all()
+            kickoffs = (
+                conn.execute(
+                    select(fixtures.c.kickoff_time).where(
+                        fixtures.c.kickoff_time.is_not(None)
+                    )
+                )
+                .scalars()
+                .all()
+            )
+        current = next((r for r in gw_rows if r.is_current), None)
+        return cls(
+            [r.deadline_time for r in gw_rows if r.deadline_time],
+            kickoffs,
+            current.gameweek_id if current else None,
+            bool(current and current.data_checked),
+        )
+
+    @property
+    def state(self) -> Tuple[Optional[int], bool]:
+        """Changes when a deadline passes and when its points are confirmed."""
+        return self.current, self.current_checked
+
+    def _between(self, times: List[datetime], start: datetime, end: datetime) -> bool:
+        i = bisect.bisect_left(times, start)
+        return i < len(times) and times[i] <= end
+
+    def match_phase(self, now: datetime) -> Optional[str]:
+        """'live' while a match is being played, 'settling' until bonus is final."""
+        if self._between(self.kickoffs, now - MATCH_LENGTH, now):
+            return "live"
+        if self._between(self.kickoffs, now - MATCH_LENGTH - SETTLE_TIME, now):
+            return "settling"
+        return None
+
+    def near_deadline(self, now: datetime) -> bool:
+        before, after = DEADLINE_WINDOW
+        return self._between(self.deadlines, now - after, now + before)
+
+    def near_price_change(self, now: datetime) -> bool:
+        local = now.astimezone(PRICE_CHANGE_TZ)
+        since_midnight = local - local.replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        return PRICE_CHANGE_WINDOW[0] <= since_midnight <= PRICE_CHANGE_WINDOW[1]
+
+    def quiet(self, now: datetime) -> bool:
+        return (
+            self.match_phase(now) is None
+            and not self._between(self.kickoffs, now, now + QUIET_HORIZON)
+            and not self._between(self.deadlines, now, now + QUIET_HORIZON)
+        )
+
+
+def polling_plan(calendar: Calendar, now: datetime) -> Dict[str, Optional[Bounds]]:
+    """
+    (fastest, slowest) polling interval in seconds for each job at ``now``;
+    None pauses the job. Within its bounds a job doubles its interval every
+    time the upstream data comes back unchanged and snaps back to the
+    fastest rate when it changes.
+    """
+    phase = calendar.match_phase(now)
+    deadline = calendar.near_deadline(now)
+    quiet = calendar.quiet(now)
+
+    if phase == "live":
+        # Also paces the live feed that server-sent event streams follow
+        live = (MINUTE // 2, 2 * MINUTE)
+    elif phase == "settling":
+        live = (5 * MINUTE, 15 * MINUTE)
+    else:
+        live = None
+
+    if phase:
+        fixture_bounds = (5 * MINUTE, 15 * MINUTE)
+    elif deadline:
+        fixture_bounds = (30 * MINUTE, HOUR)
+    elif quiet:
+        fixture_bounds = (12 * HOUR, 24 * HOUR)
+    else:
+        fixture_bounds = (3 * HOUR, 6 * HOUR)
+
+    if deadline or calendar.near_price_change(now):
+        bootstrap = (10 * MINUTE, 20 * MINUTE)
+    elif phase:
+        bootstrap = (15 * MINUTE, HOUR)
+    elif quiet:
+        bootstrap = (6 * HOUR, 24 * HOUR)
+    else:
+        bootstrap = (2 * HOUR, 6 * HOUR)
+
+    return {
+        "bootstrap": bootstrap,
+        "fixtures": fixture_bounds,
+        "live": live,
+        # Also run as soon as a deadline passes or its points are confirmed
+        "leagues": (24 * HOUR, 24 * HOUR),
+        # Only players who played in newly finished gameweeks are fetched
+        "element_summaries": (6 * HOUR, 24 * HOUR),
+        # Cheap when nothing changed: the pipeline skips unchanged inputs
+        "xpoints": (15 * MINUTE, 15 * MINUTE),
+    }
+
+
+@dataclass
+class Job:
+    name: str
+    run: Callable[[Calendar], bool]  # returns whether upstream data changed
+    on_state_change: bool = False
+    # False waits a full interval (or a state change) after startup
+    run_at_start: bool = True
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    interval: Optional[float] = None
+    next_due: float = 0.0
+    last_started: float = 0.0
+    last_finished: float = 0.0
+    last_changed: float = 0.0
+    runs: int = 0
+    errors: int = 0
+    last_error: Optional[str] = None
+
+
+class SyncScheduler:
+    """
+    Runs the syncs on a schedule derived from the gameweek calendar (see
+    ``polling_plan``) instead of on demand.
+
+    Every process may call ``start``; a file lock elects one leader, so
+    preforked workers don't multiply upstream traffic. The leader is also
+    the only process that polls live scores: with a ``live`` poller, each
+    changed live payload is broadcast to every process's live feed.
+
+    A job never overlaps itself: a run that comes due while the previous
+    one is still going is skipped. Fetched payloads are digested and only stored when they
+    differ from the last stored one, so quiet periods cause neither
+    database writes nor cache invalidation.
+    """
+
+    def __init__(
+        self,
+        data_sync: FPLDataSync,
+        xpoints=None,
+        ownership=None,
+        live=None,
+        leagues: Optional[Callable[[], List[int]]] = None,
+        lock_path: Optional[str] = None,
+    ):
+        self.data_sync = data_sync
+        self.xpoints = xpoints
+        self.ownership = ownership
+        self.live = live
+        self.leagues = leagues or self._synced_leagues
+        self.lock_path = lock_path or os.environ.get(
+            "FPL_SCHEDULER_LOCK",
+            os.path.join(tempfile.gettempdir(), "fantasy-foundry-scheduler.lock"),
+        )
+        self.jobs = {
+            job.name: job
+            for job in (
+                Job("bootstrap", self._bootstrap),
+                Job("fixtures", self._fixtures),
+                Job("live", self._live),
+                Job("leagues", self._leagues, on_state_change=True, run_at_start=False),
+                Job(
+                    "element_summaries",
+                    self._element_summaries,
+                    on_state_change=True,
+                ),
+                Job("xpoints", self._xpoints, on_state_change=True),
+            )
+        }
+        self._digests: Dict[str, str] = {}
+        self._picks_gameweek: Optional[int] = None
+        self._calendar: Optional[Calendar] = None
+        self._calendar_loaded = 0.0
+        self._state = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=len(self.jobs), thread_name_prefix="sync-job"
+        )
+        self._lock_file = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="sync-scheduler", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._executor.shutdown(wait=False)
+
+    @property
+    def leader(self) -> bool:
+        return self._lock_file is not None
+
+    def _acquire_leadership(self) -> bool:
+        lock_file = open(self.lock_path, "w")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            return False
+        # Held (and released by the OS) for the life of the process
+        self._lock_file = lock_file
+        print(f"⏰ Sync scheduler running in process {os.getpid()}")
+        return True
+
+    def _run(self):
+        while not self._stop.is_set():
+            if not self.leader and not self._acquire_leadership():
+                self._stop.wait(LEADER_RETRY)
+                continue
+            try:
+                self.tick(time.time())
+            except Exception as e:
+                print(f"❌ Scheduler error: {e}")
+            self._stop.wait(TICK)
+
+    def _load_calendar(self, now: float) -> Calendar:
+        if self._calendar is None or now - self._calendar_loaded >= CALENDAR_TTL:
+            self._calendar = Calendar.load(self.data_sync.db)
+            self._calendar_loaded = now
+        return self._calendar
+
+    def tick(self, now: float):
+        """Start every job that is due at ``now`` (unix time)."""
+        calendar = self._load_calendar(now)
+        plan = polling_plan(calendar, datetime.fromtimestamp(now, timezone.utc))
+        state_changed = self._state is not None and calendar.state != self._state
+        self._state = calendar.state
+
+        for job in self.jobs.values():
+            bounds = plan.get(job.name)
+            if bounds is None:
+                job.interval = None
+                continue
+            fastest, slowest = bounds
+            if job.interval is None:
+                job.interval = fastest
+                if not job.run_at_start and not job.last_started:
+                    job.last_started = now
+            job.interval = min(max(job.interval, fastest), slowest)
+            # A tighter window (e.g. kickoff) pulls the next run forward
+            due = job.last_started + job.interval
+            job.next_due = min(job.next_due, due) if job.next_due else due
+            if state_changed and job.on_state_change:
+                job.next_due = now
+            if now >= job.next_due and job.lock.acquire(blocking=False):
+                job.last_started = now
+                self._executor.submit(self._execute, job, bounds, calendar)
+
+    def _execute(self, job: Job, bounds: Bounds, calendar: Calendar):
+        try:
+            changed = job.run(calendar)
+            interval = job.interval or bounds[0]
+            job.interval = bounds[0] if changed else min(interval * 2, bounds[1])
+            if changed:
+                job.last_changed = time.time()
+        except Exception as e:
+            job.errors += 1
+            job.last_error = str(e)
+            print(f"❌ Scheduled {job.name} sync failed: {e}")
+        finally:
+            job.runs += 1
+            job.last_finished = time.time()
+            job.next_due = job.last_started + (job.interval or bounds[0])
+            job.lock.release()
+
+    def _store_if_changed(self, key: str, payload: Any, store: Callable[[], Any]):
+        digest = hashlib.blake2b(
+            json.dumps(payload, sort_keys=True).encode(), digest_size=16
+        ).hexdigest()
+        if self._digests.get(key) == digest:
+            return False
+        if not store():
+            # Not recorded, so the next run retries the same payload
+            raise RuntimeError(f"storing {key} failed")
+        self._digests[key] = digest
+        return True
+
+    def _bootstrap(self, calendar: Calendar) -> bool:
+        data = self.data_sync.fetch_bootstrap_data()
+        changed = self._store_if_changed(
+            "bootstrap", data, lambda: self.data_sync.sync_bootstrap_data(data)
+        )
+        if changed:
+            self._calendar_loaded = 0.0
+        return changed
+
+    def _fixtures(self, calendar: Calendar) -> bool:
+        data = self.data_sync.fetch_fixtures()
+        changed = self._store_if_changed(
+            "fixtures", data, lambda: self.data_sync.sync_fixtures(data)
+        )
+        if changed:
+            self._calendar_loaded = 0.0
+        return changed
+
+    def _live(self, calendar: Calendar) -> bool:
+        event_id = calendar.current
+        if not event_id:
+            return False
+        data = self.data_sync.fetch_live_gameweek_data(event_id)
+        changed = self._store_if_changed(
+            f"live:{event_id}",
+            data,
+            lambda: self.data_sync.sync_live_gameweek_data(event_id, data),
+        )
+        if changed and self.live:
+            # Stored first, so processes that start following now seed from it
+            self.live.tick(event_id, data)
+        return changed
+
+    def _synced_leagues(self) -> List[int]:
+        with self.data_sync.db.engine.connect() as conn:
+            return (
+                conn.execute(select(mini_league_entries.c.league_id).distinct())
+                .scalars()
+                .all()
+            )
+
+    def _leagues(self, calendar: Calendar) -> bool:
+        league_ids = self.leagues()
+        # Picks lock at the deadline, so they are fetched once per gameweek
+        picks = calendar.current if calendar.current != self._picks_gameweek else None
+        failed = []
+        for league_id in league_ids:
+            try:
+                self.data_sync.sync_league_managers_data(league_id)
+                if picks:
+                    self.data_sync.sync_league_picks(league_id, picks)
+            except Exception:
+                # One bad league shouldn't hold back the rest
+                failed.append(league_id)
+        if picks:
+            self._picks_gameweek = picks
+            if self.ownership:
+                self.ownership.run(picks)
+        if failed:
+            raise RuntimeError(f"{len(failed)} of {len(league_ids)} leagues failed")
+        return bool(league_ids)
+
+    def _element_summaries(self, calendar: Calendar) -> bool:
+        return self.data_sync.sync_element_summaries() > 0
+
+    def _xpoints(self, calendar: Calendar) -> bool:
+        return bool(self.xpoints and self.xpoints.run())
+
+    def status(self) -> Dict[str, Any]:
+        def iso(ts):
+            return datetime.fromtimestamp(ts, timezone.utc).isoformat() if ts else None
+
+        return {
+            "leader": self.leader,
+            "pid": os.getpid(),
+            "jobs": {
+                name: {
+                    "running": job.lock.locked(),
+                    "interval": job.interval,
+                    "next_due": iso(job.next_due) if job.interval else None,
+                    "last_started": iso(job.last_started),
+                    "last_finished": iso(job.last_finished),
+                    "last_changed": iso(job.last_changed),
+                    "runs": job.runs,
+                    "errors": job.errors,
+                    "last_error": job.last_error,
+                }
+                for name, job in self.jobs.items()
+            },
+        }
@@ -0,0 +1,321 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import func, select
+
+from db.connector import SQLAlchemyConnector
+from db.schema import (
+    gameweek_history,
+    gameweeks,
+    mini_league_entries,
+    mini_league_gameweek_scores,
+)
+from services.cache import ResponseCache, data_versions
+
+# Entries with fewer gameweeks than this draw from the whole league's scores
+MIN_HISTORY = 3
+# Trials per vectorized batch inside a worker; bounds memory per batch
+BATCH = 16384
+# Below this many trials the pool's overhead outweighs the parallelism
+INLINE_TRIALS = 20_000
+
+
+def default_workers() -> int:
+    """
+    This process's share of the CPUs. Every serving process (WEB_CONCURRENCY
+    of them, see gunicorn.conf.py) may run its own pool, so together they
+    use about one process per CPU.
+    """
+    processes = int(os.environ.get("WEB_CONCURRENCY", 1))
+    return max(1, (os.cpu_count() or 1) // processes)
+
+
+DEPENDENCIES = (
+    "gameweeks",
+    "gameweek_history",
+    "mini_league_entries",
+    "mini_league_gameweek_scores",
+)
+
+
+class LeagueModel:
+    """
+    A league's current standings and, per entry, the gameweek scores (net
+    of transfer costs) its remaining gameweeks are resampled from. Scores
+    are kept as a padded ``entries × history`` matrix with a length per row.
+    """
+
+    def __init__(
+        self,
+        entry_ids: np.ndarray,
+        names: List[str],
+        totals: np.ndarray,
+        history: np.ndarray,
+        counts: np.ndarray,
+        remaining: int,
+    ):
+        self.entry_ids = entry_ids
+        self.names = names
+        self.totals = totals
+        self.history = history
+        self.counts = counts
+        self.remaining = remaining
+
+    def __len__(self):
+        return len(self.entry_ids)
+
+    @classmethod
+    def from_rows(
+        cls,
+        standings: List[Dict[str, Any]],
+        scores: Dict[int, List[int]],
+        remaining: int,
+    ) -> "LeagueModel":
+        entry_ids = np.array([s["entry_id"] for s in standings], dtype=np.int64)
+        totals = np.array([s["total"] or 0 for s in standings], dtype=np.int64)
+        names = [s["entry_name"] for s in standings]
+
+        per_entry = [scores.get(int(e), []) for e in entry_ids]
+        pool = [points for entry in per_entry for points in entry] or [0]
+        per_entry = [e if len(e) >= MIN_HISTORY else pool for e in per_entry]
+
+        counts = np.array([len(e) for e in per_entry], dtype=np.int64)
+        history = np.zeros((len(entry_ids), int(counts.max(initial=1))), np.int64)
+        for row, entry in enumerate(per_entry):
+            history[row, : len(entry)] = entry
+        return cls(entry_ids, names, totals, history, counts, remaining)
+
+    @classmethod
+    def load(
+        cls, db: SQLAlchemyConnector, league_id: int, gameweek: Optional[int]
+    ) -> "LeagueModel":
+        """
+        Standings come from ``mini_league_entries``; score history merges the
+        league's stored scores with any synced ``gameweek_history``.
+        """
+        members = select(mini_league_entries.c.entry_id).where(
+            mini_league_entries.c.league_id == league_id
+        )
+        s = mini_league_gameweek_scores
+        h = gameweek_history
+        with db.engine.connect() as conn:
+            standings = (
+                conn.execute(
+                    select(
+                        mini_league_entries.c.entry_id,
+                        mini_league_entries.c.entry_name,
+                        mini_league_entries.c.total,
+                    )
+                    .where(mini_league_entries.c.league_id == league_id)
+                    .order_by(mini_league_entries.c.entry_id)
+                )
+                .mappings()
+                .all()
+            )
+            rows = conn.execute(
+                select(h.c.entry_id, h.c.gameweek, h.c.points, h.c.cost).where(
+                    h.c.entry_id.in_(members)
+                )
+            ).all()
+            rows += conn.execute(
+                select(s.c.entry_id, s.c.gameweek, s.c.points, s.c.cost).where(
+                    s.c.league_id == league_id
+                )
+            ).all()
+            remaining = conn.execute(
+                select(func.count()).where(gameweeks.c.gameweek_id > (gameweek or 0))
+            ).scalar()
+
+        by_gameweek = {
+            (entry_id, gw): (points or 0) - (cost or 0)
+            for entry_id, gw, points, cost in rows
+        }
+        scores: Dict[int, List[int]] = {}
+        for (entry_id, _), points in by_gameweek.items():
+            scores.setdefault(entry_id, []).append(points)
+        return cls.from_rows(standings, scores, remaining or 0)
+
+
+def season_distribution(model: LeagueModel):
+    """
+    Distribution of each entry's points over all remaining gameweeks.
+
+    Resampling one score per remaining gameweek is a sum of ``remaining``
+    independent draws from the entry's score history, so its distribution
+    is the history's pmf convolved with itself ``remaining`` times (done
+    once via FFT). A trial then needs a single draw per entry instead of
+    one per entry and gameweek. Returns the per-entry CDFs over
+    ``base + 0..L-1`` points, and ``base``.
+    """
+    n = len(model)
+    if not model.remaining:
+        return np.ones((n, 1)), 0
+
+    low = int(model.history.min())
+    width = int(model.history.max()) - low + 1
+    mask = np.arange(model.history.shape[1]) < model.counts[:, None]
+    pmf = np.zeros((n, width))
+    rows = np.broadcast_to(np.arange(n)[:, None], model.history.shape)
+    np.add.at(pmf, (rows[mask], model.history[mask] - low), 1.0)
+    pmf /= model.counts[:, None]
+
+    size = model.remaining * (width - 1) + 1
+    season = np.fft.irfft(np.fft.rfft(pmf, size, axis=1) ** model.remaining, size)
+    season = season.clip(min=0)
+    cdf = np.cumsum(season, axis=1)
+    cdf /= cdf[:, -1:]
+    return cdf, low * model.remaining
+
+
+def _simulate_chunk(
+    cdf: np.ndarray,
+    base: int,
+    totals: np.ndarray,
+    trials: int,
+    seed: np.random.SeedSequence,
+):
+    """
+    Run ``trials`` season finishes; returns per-entry win counts, top-3
+    counts and the sum of final totals. Top level so a process pool can
+    pickle it.
+    """
+    rng = np.random.default_rng(seed)
+    n, width = cdf.shape
+    podium = min(3, n)
+
+    wins = np.zeros(n, dtype=np.int64)
+    top3 = np.zeros(n, dtype=np.int64)
+    final_sum = np.zeros(n, dtype=np.float64)
+
+    for start in range(0, trials, BATCH):
+        size = min(BATCH, trials - start)
+        # Entries × trials, so each inverse-CDF lookup scans one short row
+        u = rng.random((n, size))
+        final = np.empty((n, size), dtype=np.float64)
+        for i in range(n):
+            final[i] = np.searchsorted(cdf[i], u[i]).clip(max=width - 1)
+        final += (totals + base)[:, None]
+        final_sum += final.sum(axis=1)
+
+        # Points are integers, so uniform noise below 1 breaks ties at random
+        final += rng.random((n, size))
+        wins += np.bincount(final.argmax(axis=0), minlength=n)
+        if podium < n:
+            top = np.argpartition(-final, podium - 1, axis=0)[:podium]
+            top3 += np.bincount(top.ravel(), minlength=n)
+        else:
+            top3 += size
+
+    return wins, top3, final_sum
+
+
+class LeagueSimulator:
+    """
+    Monte Carlo projection of each manager's chance to win a mini-league or
+    finish in the top 3.
+
+    Every trial adds one resampled gameweek score per remaining gameweek to
+    each entry's current total, drawn in one step from the distribution of
+    that sum. Trials are vectorized in batches and split across a process
+    pool sized to this process's share of the CPUs (inline when that is
+    one); results are cached per league and gameweek until any of the
+    underlying tables is synced again.
+    """
+
+    def __init__(
+        self,
+        db: SQLAlchemyConnector,
+        workers: Optional[int] = None,
+        cache_size: int = 256,
+        ttl: float = 6 * 3600,
+    ):
+        self.db = db
+        self.workers = workers or default_workers()
+        self._cache = ResponseCache(maxsize=cache_size, ttl=ttl)
+        self._lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # Inline runs share the same budget, one per worker at a time
+        self._inline = threading.BoundedSemaphore(self.workers)
+
+    def _executor(self) -> ProcessPoolExecutor:
+        # Spawned lazily, and not forked: the serving process has threads
+        # and open connections that must not be copied into workers
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=get_context("spawn")
+                )
+            return self._pool
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(cancel_futures=True)
+                self._pool = None
+
+    def run(
+        self, model: LeagueModel, trials: int, seed: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        n = len(model)
+        if not n:
+            return []
+
+        jobs = 1 if trials < INLINE_TRIALS or self.workers == 1 else self.workers * 2
+        sizes = [trials // jobs + (i < trials % jobs) for i in range(jobs)]
+        seeds = np.random.SeedSequence(seed).spawn(jobs)
+        cdf, base = season_distribution(model)
+        args = (cdf, base, model.totals)
+
+        if jobs == 1:
+            with self._inline:
+                results = [_simulate_chunk(*args, sizes[0], seeds[0])]
+        else:
+            pool = self._executor()
+            futures = [
+                pool.submit(_simulate_chunk, *args, size, chunk_seed)
+                for size, chunk_seed in zip(sizes, seeds)
+            ]
+            results = [f.result() for f in futures]
+
+        wins = sum(r[0] for r in results)
+        top3 = sum(r[1] for r in results)
+        final_sum = sum(r[2] for r in results)
+
+        projections = [
+            {
+                "entry_id": int(model.entry_ids[i]),
+                "entry_name": model.names[i],
+                "total": int(model.totals[i]),
+                "projected_total": round(float(final_sum[i]) / trials, 1),
+                "win_probability": float(wins[i]) / trials,
+                "top3_probability": float(top3[i]) / trials,
+            }
+            for i in range(n)
+        ]
+        projections.sort(key=lambda p: (-p["win_probability"], -p["projected_total"]))
+        return projections
+
+    def simulate(
+        self,
+        league_id: int,
+        gameweek: Optional[int],
+        trials: int = 100_000,
+        seed: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        key = (league_id, gameweek, trials, seed, data_versions.get(*DEPENDENCIES))
+
+        def compute():
+            model = LeagueModel.load(self.db, league_id, gameweek)
+            return {
+                "league_id": league_id,
+                "gameweek": gameweek,
+                "remaining_gameweeks": model.remaining,
+                "trials": trials,
+                "entries": self.run(model, trials, seed),
+            }
+
+        return self._cache.get_or_compute(key, compute)
@@ -0,0 +1,224 @@
+import argparse
+import contextvars
+import functools
+import inspect
+import json
+import os
+import secrets
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+# Span attributes summed per stage by the report
+COUNTED_ATTRIBUTES = ("bytes", "rows")
+
+
+class Span:
+    """
+    One timed stage. Records follow the OpenTelemetry span shape (trace and
+    span ids, parent id, start/end in unix nanoseconds, attributes, status)
+    with ``duration_ms`` added for convenience.
+    """
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "attributes", "_start")
+
+    def __init__(self, name: str, parent: Optional["Span"], attributes: Dict[str, Any]):
+        self.trace_id = parent.trace_id if parent else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent.span_id if parent else None
+        self.name = name
+        self.attributes = attributes
+        self._start = time.time_ns()
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def record(self, status: str) -> Dict[str, Any]:
+        end = time.time_ns()
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_id,
+            "name": self.name,
+            "start_time_unix_nano": self._start,
+            "end_time_unix_nano": end,
+            "duration_ms": (end - self._start) / 1e6,
+            "attributes": self.attributes,
+            "status": status,
+        }
+
+
+class _NullSpan:
+    def set(self, **attributes):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+_current: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar(
+    "current_span", default=None
+)
+
+
+class Tracer:
+    """
+    Nested spans written as JSON lines to ``path``. Without a path every
+    span is a no-op, so instrumented code costs nothing when tracing is off.
+
+    The current span lives in a context variable: spans opened inside
+    another become its children, and each top-level span starts a trace.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8") if path else None
+
+    @classmethod
+    def from_env(cls) -> "Tracer":
+        """Trace to the file named by FPL_TRACE_FILE, if set."""
+        return cls(os.environ.get("FPL_TRACE_FILE"))
+
+    @property
+    def enabled(self) -> bool:
+        return self._file is not None
+
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Any]:
+        if not self.enabled:
+            yield _NULL_SPAN
+            return
+
+        parent = _current.get()
+        span = Span(name, parent, attributes)
+        token = _current.set(span)
+        status = "OK"
+        try:
+            yield span
+        except BaseException as e:
+            status = "ERROR"
+            span.set(error=f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            _current.reset(token)
+            line = json.dumps(span.record(status), default=str)
+            with self._lock:
+                self._file.write(line + "\n")
+                if parent is None:
+                    self._file.flush()
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+def traced(name: str, *arguments: str):
+    """
+    Run a method inside ``self.tracer.span(name)``, recording the named
+    arguments as span attributes.
+    """
+
+    def decorator(method):
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            bound = signature.bind(self, *args, **kwargs).arguments
+            attributes = {arg: bound.get(arg) for arg in arguments}
+            with self.tracer.span(name, **attributes):
+                return method(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def load_spans(path: str) -> List[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def summarize(spans: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Aggregate spans by their path from the root (``sync.league > page >
+    entry > http.get``). Self time is a span's duration minus its children's:
+    for a parent stage it is the time spent transforming data between calls.
+    """
+    by_id = {s["span_id"]: s for s in spans}
+    child_ms: Dict[str, float] = defaultdict(float)
+    for s in spans:
+        if s["parent_span_id"]:
+            child_ms[s["parent_span_id"]] += s["duration_ms"]
+
+    def path(s):
+        names = [s["name"]]
+        while s["parent_span_id"] in by_id:
+            s = by_id[s["parent_span_id"]]
+            names.append(s["name"])
+        return tuple(reversed(names))
+
+    stages: Dict[tuple, Dict[str, Any]] = {}
+    for s in spans:
+        key = path(s)
+        stage = stages.setdefault(
+            key,
+            {"path": key, "durations": [], "self_ms": 0.0, "errors": 0}
+            | {attr: 0 for attr in COUNTED_ATTRIBUTES},
+        )
+        stage["durations"].append(s["duration_ms"])
+        stage["self_ms"] += max(s["duration_ms"] - child_ms[s["span_id"]], 0.0)
+        stage["errors"] += s["status"] != "OK"
+        for attr in COUNTED_ATTRIBUTES:
+            value = s["attributes"].get(attr)
+            if isinstance(value, (int, float)):
+                stage[attr] += value
+
+    for stage in stages.values():
+        durations = np.array(stage.pop("durations"))
+        stage["count"] = len(durations)
+        stage["total_ms"] = float(durations.sum())
+        stage["p95_ms"] = float(np.percentile(durations, 95))
+    return sorted(stages.values(), key=lambda stage: stage["path"])
+
+
+def report(spans: List[Dict[str, Any]]):
+    """Print each stage as a tree with its share of the traced wall time."""
+    roots = [s for s in spans if not s["parent_span_id"]]
+    wall_ms = sum(s["duration_ms"] for s in roots) or 1.0
+    print(f"{len(roots)} runs, {len(spans)} spans, {wall_ms / 1000:.2f}s traced")
+    print(
+        f"{'stage':<44}{'count':>8}{'total ms':>12}{'self ms':>12}"
+        f"{'self %':>8}{'p95 ms':>10}{'MiB':>8}{'rows':>9}{'errors':>7}"
+    )
+    for stage in summarize(spans):
+        label = "  " * (len(stage["path"]) - 1) + stage["path"][-1]
+        print(
+            f"{label:<44}{stage['count']:>8}{stage['total_ms']:>12.1f}"
+            f"{stage['self_ms']:>12.1f}{100 * stage['self_ms'] / wall_ms:>7.1f}%"
+            f"{stage['p95_ms']:>10.2f}{stage['bytes'] / 2**20:>8.2f}"
+            f"{stage['rows']:>9}{stage['errors']:>7}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Summarize a sync trace file")
+    parser.add_argument("path", help="JSON-lines file written with FPL_TRACE_FILE")
+    parser.add_argument("--trace", help="only this trace id (default: all runs)")
+    parser.add_argument("--last", action="store_true", help="only the most recent run")
+    args = parser.parse_args()
+
+    spans = load_spans(args.path)
+    trace_id = args.trace
+    if args.last and spans:
+        trace_id = max(
+            (s for s in spans if not s["parent_span_id"]),
+            key=lambda s: s["start_time_unix_nano"],
+        )["trace_id"]
+    if trace_id:
+        spans = [s for s in spans if s["trace_id"] == trace_id]
+    report(spans)
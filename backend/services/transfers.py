@@ -0,0 +1,390 @@
+import heapq
+import itertools
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func, select
+
+from db.connector import SQLAlchemyConnector
+from db.schema import entry_chips, entry_picks
+from services.player_index import PlayerIndex
+
+# Players per position in a 15-man squad
+SQUAD_SLOTS = {1: 2, 2: 5, 3: 5, 4: 3}
+MAX_PER_TEAM = 3
+# Budget for a squad rebuild without a synced squad, in tenths of £m
+DEFAULT_BUDGET = 1000
+
+# Most teams that can already hold MAX_PER_TEAM of the other 14 squad players
+_FULL_TEAMS = (sum(SQUAD_SLOTS.values()) - 1) // MAX_PER_TEAM
+
+Projection = Callable[[PlayerIndex], np.ndarray]
+
+PROJECTIONS: Dict[str, Projection] = {
+    "total_points": lambda index: index.columns["total_points"].astype(np.float64),
+}
+
+
+def register_projection(name: str, projection: Projection):
+    """Make ``projection`` (player index -> score per row) selectable by name."""
+    PROJECTIONS[name] = projection
+
+
+class Candidates:
+    """
+    Per-position candidate lists for one player index and projection.
+
+    Lists are sorted by projected score, best first. A player is dropped
+    when better-or-equal, no-dearer players of its position come from so
+    many teams that any squad using it could swap in one of them instead
+    without breaking the per-team limit; optimal squads never need it.
+    """
+
+    def __init__(self, index: PlayerIndex, scores: np.ndarray):
+        self.index = index
+        self.score = np.asarray(scores, dtype=np.float64)
+        # Costs in tenths of £m so budgets are exact integers
+        self.cost = np.rint(index.columns["cost"] * 10).astype(np.int64)
+        self.team = index.columns["team_id"]
+        self.position = index.columns["position_type_id"]
+        self.row_of = {
+            int(pid): row for row, pid in enumerate(index.columns["player_id"])
+        }
+
+        self.by_position: Dict[int, np.ndarray] = {}
+        for position, slots in SQUAD_SLOTS.items():
+            rows = np.flatnonzero(self.position == position)
+            rows = rows[np.lexsort((self.cost[rows], -self.score[rows]))]
+            self.by_position[position] = rows[self._undominated(rows, slots)]
+
+    def _undominated(self, rows: np.ndarray, slots: int) -> np.ndarray:
+        cost = self.cost[rows]
+        # dominates[i, j]: i precedes j in score order and costs no more
+        earlier = np.tri(len(rows), k=-1, dtype=bool).T
+        dominates = earlier & (cost[:, None] <= cost[None, :])
+        teams = np.unique(self.team[rows], return_inverse=True)[1]
+        on_team = np.zeros((teams.max(initial=0) + 1, len(rows)), dtype=bool)
+        on_team[teams, np.arange(len(rows))] = True
+        dominating_teams = (on_team.astype(np.int64) @ dominates > 0).sum(axis=0)
+        return dominating_teams < _FULL_TEAMS + slots
+
+    def describe(self, row: int) -> Dict[str, Any]:
+        columns = self.index.columns
+        return {
+            "player_id": int(columns["player_id"][row]),
+            "player_name": str(columns["player_name"][row]),
+            "position": str(columns["position"][row]),
+            "team": str(columns["team"][row]),
+            "cost": self.cost[row] / 10,
+            "score": float(self.score[row]),
+        }
+
+
+_candidates_lock = threading.Lock()
+_candidates: Dict[Tuple[int, str], Candidates] = {}
+
+
+def candidates(index: PlayerIndex, projection: str = "total_points") -> Candidates:
+    """Candidate lists for ``index``, built once per snapshot and projection."""
+    if projection not in PROJECTIONS:
+        raise ValueError(f"Unknown projection {projection}")
+    key = (id(index), projection)
+    with _candidates_lock:
+        cached = _candidates.get(key)
+        if cached is not None and cached.index is index:
+            return cached
+    built = Candidates(index, PROJECTIONS[projection](index))
+    with _candidates_lock:
+        if len(_candidates) >= 8:
+            _candidates.clear()
+        _candidates[key] = built
+    return built
+
+
+def load_squad(
+    db: SQLAlchemyConnector, entry_id: int
+) -> Tuple[List[int], int, Optional[int]]:
+    """An entry's latest synced squad as (player ids, bank in tenths, gameweek)."""
+    with db.engine.connect() as conn:
+        gameweek = conn.execute(
+            select(func.max(entry_picks.c.gameweek)).where(
+                entry_picks.c.entry_id == entry_id
+            )
+        ).scalar()
+        if gameweek is None:
+            return [], 0, None
+        player_ids = (
+            conn.execute(
+                select(entry_picks.c.player_id)
+                .where(
+                    (entry_picks.c.entry_id == entry_id)
+                    & (entry_picks.c.gameweek == gameweek)
+                )
+                .order_by(entry_picks.c.position)
+            )
+            .scalars()
+            .all()
+        )
+        bank = conn.execute(
+            select(entry_chips.c.bank).where(
+                (entry_chips.c.entry_id == entry_id)
+                & (entry_chips.c.gameweek == gameweek)
+            )
+        ).scalar()
+    return list(player_ids), bank or 0, gameweek
+
+
+def best_transfers(
+    cands: Candidates, squad_ids: List[int], bank: int, max_transfers: int = 2
+) -> List[Dict[str, Any]]:
+    """
+    The highest-gain set of exactly 1..``max_transfers`` like-for-like
+    transfers for a squad, each within budget and the per-team limit.
+
+    Outgoing pairs are tried in order of their gain bound and incoming
+    players in score order, so both loops stop as soon as nothing left can
+    beat the best found. Sale prices are taken as current prices.
+    """
+    if not 1 <= max_transfers <= 2:
+        raise ValueError("max_transfers must be 1 or 2")
+    try:
+        squad = np.array([cands.row_of[int(pid)] for pid in squad_ids])
+    except KeyError as e:
+        raise ValueError(f"Unknown player {e.args[0]} in squad") from None
+
+    in_squad = np.zeros(len(cands.cost), dtype=bool)
+    in_squad[squad] = True
+    team_count = np.bincount(cands.team[squad], minlength=cands.team.max() + 1)
+    # Incoming candidates per position, never players already owned
+    pools = {p: rows[~in_squad[rows]] for p, rows in cands.by_position.items()}
+    top_score = {
+        p: cands.score[rows[0]] if len(rows) else -np.inf for p, rows in pools.items()
+    }
+
+    def first_fit(rows, budget, counts, exclude=-1):
+        ok = (
+            (cands.cost[rows] <= budget)
+            & (counts[cands.team[rows]] < MAX_PER_TEAM)
+            & (rows != exclude)
+        )
+        hit = np.argmax(ok)
+        return rows[hit] if len(rows) and ok[hit] else None
+
+    options = []
+    for k in range(1, max_transfers + 1):
+        best_gain, best = -np.inf, None
+        outs = sorted(
+            itertools.combinations(squad.tolist(), k),
+            key=lambda out: -sum(
+                top_score[cands.position[o]] - cands.score[o] for o in out
+            ),
+        )
+        for out in outs:
+            bound = sum(top_score[cands.position[o]] - cands.score[o] for o in out)
+            if bound <= best_gain:
+                break
+            budget = bank + cands.cost[list(out)].sum()
+            counts = team_count.copy()
+            np.subtract.at(counts, cands.team[list(out)], 1)
+            out_score = cands.score[list(out)].sum()
+
+            if k == 1:
+                pick = first_fit(pools[cands.position[out[0]]], budget, counts)
+                if pick is not None and cands.score[pick] - out_score > best_gain:
+                    best_gain, best = cands.score[pick] - out_score, (out, (pick,))
+                continue
+
+            first_pool = pools[cands.position[out[0]]]
+            second_pool = pools[cands.position[out[1]]]
+            second_top = top_score[cands.position[out[1]]]
+            for pick in first_pool:
+                if cands.score[pick] + second_top - out_score <= best_gain:
+                    break
+                if (
+                    cands.cost[pick] > budget
+                    or counts[cands.team[pick]] >= MAX_PER_TEAM
+                ):
+                    continue
+                counts[cands.team[pick]] += 1
+                second = first_fit(
+                    second_pool, budget - cands.cost[pick], counts, exclude=pick
+                )
+                counts[cands.team[pick]] -= 1
+                if second is None:
+                    continue
+                gain = cands.score[pick] + cands.score[second] - out_score
+                if gain > best_gain:
+                    best_gain, best = gain, (out, (pick, second))
+
+        if best is not None:
+            out, picks = best
+            options.append(
+                {
+                    "transfers": [
+                        {"out": cands.describe(o), "in": cands.describe(i)}
+                        for o, i in zip(out, picks)
+                    ],
+                    "gain": float(best_gain),
+                    "bank_after": (
+                        bank
+                        + int(
+                            cands.cost[list(out)].sum() - cands.cost[list(picks)].sum()
+                        )
+                    )
+                    / 10,
+                }
+            )
+    return options
+
+
+def _choose(cost: np.ndarray, score: np.ndarray, k: int, budget: int):
+    """
+    0/1 knapsack choosing exactly ``k`` of the items: ``best[j, c]`` is the
+    top score of ``j`` items costing at most ``c``, and ``took`` records
+    which item improved each cell so the choice can be traced back.
+    """
+    best = np.full((k + 1, budget + 1), -np.inf)
+    best[0] = 0.0
+    took = np.zeros((len(cost), k + 1, budget + 1), dtype=bool)
+    for item, (c, v) in enumerate(zip(cost.tolist(), score.tolist())):
+        if c > budget:
+            continue
+        with_item = best[:-1, : budget + 1 - c] + v
+        better = with_item > best[1:, c:]
+        best[1:, c:] = np.where(better, with_item, best[1:, c:])
+        took[item, 1:, c:] = better
+    return best, took
+
+
+def _trace(took: np.ndarray, cost: np.ndarray, k: int, budget: int) -> List[int]:
+    chosen = []
+    for item in range(len(cost) - 1, -1, -1):
+        if k and took[item, k, budget]:
+            chosen.append(item)
+            k -= 1
+            budget -= int(cost[item])
+    return chosen
+
+
+def best_squad(
+    cands: Candidates, budget: int = DEFAULT_BUDGET, max_nodes: int = 500
+) -> Dict[str, Any]:
+    """
+    The highest-scoring 15-man squad within ``budget`` (tenths of £m).
+
+    Branch and bound: each node solves the squad without the per-team limit
+    exactly (a knapsack per position, merged over the budget split), which
+    bounds every squad below it. A team over the limit branches into one
+    child per player of that team, each excluding that player. Nodes are
+    expanded best bound first, so the first squad within the limit is
+    optimal; ``optimal`` is False only if ``max_nodes`` runs out first.
+    """
+    positions = list(SQUAD_SLOTS)
+    # Cost above each position's cheapest candidate, to shrink the DP budget
+    floor = {p: int(cands.cost[rows].min()) for p, rows in cands.by_position.items()}
+    spare = budget - sum(floor[p] * SQUAD_SLOTS[p] for p in positions)
+    if spare < 0:
+        raise ValueError("Budget is below the cheapest possible squad")
+
+    tables: Dict[Tuple[int, frozenset], Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+    pairs: Dict[tuple, Tuple[np.ndarray, np.ndarray]] = {}
+    spend = np.arange(spare + 1)
+    padding = np.full(spare, -np.inf)
+
+    def shifted(values):
+        # View with [c, x] = values[c - x], or -inf where x > c
+        padded = np.concatenate((padding, values))[::-1]
+        return np.lib.stride_tricks.sliding_window_view(padded, spare + 1)[::-1]
+
+    def key(p, excluded):
+        return p, frozenset(r for r in excluded if cands.position[r] == p)
+
+    def position_table(k):
+        if k not in tables:
+            p, excluded = k
+            rows = cands.by_position[p]
+            rows = rows[~np.isin(rows, list(excluded))]
+            best, took = _choose(
+                cands.cost[rows] - floor[p], cands.score[rows], SQUAD_SLOTS[p], spare
+            )
+            tables[k] = (rows, best[SQUAD_SLOTS[p]], took)
+        return tables[k]
+
+    def pair(first, second):
+        # Best value of two positions for every total spend, and the split
+        if (first, second) not in pairs:
+            a, b = position_table(first)[1], position_table(second)[1]
+            combined = a[None, :] + shifted(b)
+            split = combined.argmax(axis=1)
+            pairs[first, second] = (combined[spend, split], split)
+        return pairs[first, second]
+
+    def trace(k, spent):
+        rows, _, took = position_table(k)
+        p = k[0]
+        chosen = _trace(took, cands.cost[rows] - floor[p], SQUAD_SLOTS[p], spent)
+        return rows[chosen].tolist()
+
+    def relax(excluded):
+        """
+        Best squad ignoring the per-team limit. Positions are merged in two
+        cached pairs, so excluding a player only recomputes its own pair.
+        """
+        keys = [key(p, excluded) for p in positions]
+        left, left_split = pair(keys[0], keys[1])
+        right, right_split = pair(keys[2], keys[3])
+        totals = left + right[::-1]
+        x = int(totals.argmax())
+        if not np.isfinite(totals[x]):
+            return -np.inf, []
+        y = spare - x
+        squad = trace(keys[0], int(left_split[x])) + trace(
+            keys[1], x - int(left_split[x])
+        )
+        squad += trace(keys[2], int(right_split[y])) + trace(
+            keys[3], y - int(right_split[y])
+        )
+        return float(totals[x]), squad
+
+    # Children are queued with their parent's bound and only solved when
+    # popped, so branches that never reach the front cost nothing
+    counter = itertools.count()
+    frontier = [(-np.inf, next(counter), frozenset(), None)]
+    seen = {frozenset()}
+    nodes = 0
+    while frontier and nodes < max_nodes:
+        _, _, excluded, squad = heapq.heappop(frontier)
+        if squad is None:
+            nodes += 1
+            value, squad = relax(excluded)
+            if squad:
+                heapq.heappush(frontier, (-value, next(counter), excluded, squad))
+            continue
+
+        teams, counts = np.unique(cands.team[squad], return_counts=True)
+        if counts.max() <= MAX_PER_TEAM:
+            return _squad_result(cands, squad, budget, True, nodes)
+
+        bound = -cands.score[squad].sum()
+        over = teams[counts.argmax()]
+        for row in squad:
+            child = excluded | {row}
+            if cands.team[row] == over and child not in seen:
+                seen.add(child)
+                heapq.heappush(frontier, (bound, next(counter), child, None))
+
+    return {"squad": [], "optimal": False, "nodes": nodes}
+
+
+def _squad_result(cands, squad, budget, optimal, nodes):
+    squad = sorted(squad, key=lambda r: (cands.position[r], -cands.score[r]))
+    cost = int(cands.cost[squad].sum())
+    return {
+        "squad": [cands.describe(r) for r in squad],
+        "score": float(cands.score[squad].sum()),
+        "cost": cost / 10,
+        "bank_after": (budget - cost) / 10,
+        "optimal": optimal,
+        "nodes": nodes,
+    }
@@ -0,0 +1,260 @@
+import hashlib
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import func, select
+
+from db.connector import SQLAlchemyConnector
+from db.schema import (
+    fixtures,
+    gameweeks,
+    player_gameweek_stats,
+    player_xpoints,
+    players,
+    teams,
+)
+from services.cache import data_versions
+from services.change_events import record_change
+
+# Recent gameweeks that count towards form
+FORM_WINDOW = 4
+
+# Feature matrix columns; one row per player per fixture in the gameweek
+FEATURES = (
+    "form",
+    "points_per_90",
+    "minutes_share",
+    "start_rate",
+    "fixture_difficulty",
+    "is_home",
+    "team_strength",
+    "opponent_strength",
+)
+
+DEPENDENCIES = ("players", "teams", "fixtures", "gameweeks", "player_gameweek_stats")
+
+
+class BaselineModel:
+    """
+    Hand-tuned v1 projection: a blend of recent form and season scoring
+    rate, scaled by the chance of playing, fixture difficulty and relative
+    team strength. Any object with ``version`` and a vectorized
+    ``predict(X)`` over ``FEATURES`` columns can replace it.
+    """
+
+    version = "baseline-1"
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        f = {name: X[:, i] for i, name in enumerate(FEATURES)}
+        plays = np.clip(0.5 * f["minutes_share"] + 0.5 * f["start_rate"], 0, 1)
+        rate = 0.55 * f["form"] + 0.45 * f["points_per_90"] * f["minutes_share"]
+        difficulty = 1 + 0.08 * (3 - f["fixture_difficulty"])
+        strength = np.sqrt(
+            np.divide(
+                f["team_strength"],
+                f["opponent_strength"],
+                out=np.ones(len(X)),
+                where=f["opponent_strength"] > 0,
+            )
+        )
+        home = 1 + 0.05 * f["is_home"]
+        return plays * rate * difficulty * strength * home
+
+
+class XPointsPipeline:
+    """
+    Builds the feature matrix for a gameweek from stored per-gameweek player
+    stats, fixtures and team strengths, and writes projected points to
+    ``player_xpoints``.
+
+    Features for all players come from a few array operations over the
+    stats; each player's feature rows are then digested and compared with
+    the digest stored alongside its last projection, so only players whose
+    inputs changed are scored (in one batched model call) and written.
+    """
+
+    def __init__(self, db: SQLAlchemyConnector, model=None):
+        self.db = db
+        self.model = model or BaselineModel()
+        self._last_versions = None
+
+    def target_gameweek(self, conn) -> Optional[int]:
+        """The first gameweek that isn't finished."""
+        return conn.execute(
+            select(func.min(gameweeks.c.gameweek_id)).where(
+                gameweeks.c.finished.is_not(True)
+            )
+        ).scalar()
+
+    def features(self, conn, gameweek: int):
+        """
+        Feature rows for ``gameweek``: returns (player ids, row -> player
+        position, X). Players without a fixture (blank gameweek) get no rows.
+        """
+        player_rows = conn.execute(
+            select(players.c.player_id, players.c.team).order_by(players.c.player_id)
+        ).all()
+        player_ids = np.array([r[0] for r in player_rows], dtype=np.int64)
+        player_team = np.array([r[1] or 0 for r in player_rows], dtype=np.int64)
+        if not len(player_ids):
+            # Nothing to project until players are synced
+            return player_ids, player_ids, np.zeros((0, len(FEATURES)))
+
+        stats = conn.execute(
+            select(
+                player_gameweek_stats.c.player_id,
+                player_gameweek_stats.c.gameweek,
+                player_gameweek_stats.c.minutes,
+                player_gameweek_stats.c.total_points,
+            ).where(player_gameweek_stats.c.gameweek < gameweek)
+        ).all()
+        team_rows = conn.execute(
+            select(
+                teams.c.team_id,
+                teams.c.strength_overall_home,
+                teams.c.strength_overall_away,
+            )
+        ).all()
+        fixture_rows = conn.execute(
+            select(
+                fixtures.c.team_h,
+                fixtures.c.team_a,
+                fixtures.c.team_h_difficulty,
+                fixtures.c.team_a_difficulty,
+            ).where(fixtures.c.gameweek == gameweek)
+        ).all()
+
+        n = len(player_ids)
+        minutes = np.zeros((n, max(gameweek - 1, 0)), dtype=np.float64)
+        points = np.zeros_like(minutes)
+        if stats:
+            s = np.array(stats, dtype=np.float64)
+            idx = np.searchsorted(player_ids, s[:, 0].astype(np.int64))
+            known = (idx < n) & (player_ids[idx.clip(max=n - 1)] == s[:, 0])
+            rows, cols = idx[known], s[known, 1].astype(np.int64) - 1
+            minutes[rows, cols] = np.nan_to_num(s[known, 2])
+            points[rows, cols] = np.nan_to_num(s[known, 3])
+
+        recent_minutes = minutes[:, -FORM_WINDOW:]
+        recent_points = points[:, -FORM_WINDOW:]
+        appearances = (recent_minutes > 0).sum(axis=1)
+        form = np.divide(
+            recent_points.sum(axis=1),
+            appearances,
+            out=np.zeros(n),
+            where=appearances > 0,
+        )
+        season_minutes = minutes.sum(axis=1)
+        points_per_90 = np.divide(
+            points.sum(axis=1) * 90,
+            season_minutes,
+            out=np.zeros(n),
+            where=season_minutes >= 90,
+        )
+        window = max(recent_minutes.shape[1], 1)
+        minutes_share = recent_minutes.sum(axis=1) / (90 * window)
+        start_rate = (recent_minutes >= 60).sum(axis=1) / window
+
+        strength = np.zeros((max([0, *(t[0] for t in team_rows)]) + 1, 2))
+        for team_id, home, away in team_rows:
+            strength[team_id] = (home or 0, away or 0)
+
+        f = np.array(
+            [[value or 0 for value in row] for row in fixture_rows], dtype=np.int64
+        ).reshape(-1, 4)
+        team_h, team_a, diff_h, diff_a = f.T
+        # (player, fixture) pairs for home and away sides
+        home_p, home_f = np.nonzero(player_team[:, None] == team_h[None, :])
+        away_p, away_f = np.nonzero(player_team[:, None] == team_a[None, :])
+        player_of_row = np.concatenate((home_p, away_p))
+        is_home = np.concatenate((np.ones(len(home_p)), np.zeros(len(away_p))))
+        difficulty = np.concatenate((diff_h[home_f], diff_a[away_f]))
+        own = np.concatenate((strength[team_h[home_f], 0], strength[team_a[away_f], 1]))
+        opponent = np.concatenate(
+            (strength[team_a[home_f], 1], strength[team_h[away_f], 0])
+        )
+
+        X = np.column_stack(
+            (
+                form[player_of_row],
+                points_per_90[player_of_row],
+                minutes_share[player_of_row],
+                start_rate[player_of_row],
+                difficulty,
+                is_home,
+                own,
+                opponent,
+            )
+        ).astype(np.float64)
+
+        order = np.argsort(player_of_row, kind="stable")
+        return player_ids, player_of_row[order], X[order]
+
+    def _digests(self, n: int, player_of_row: np.ndarray, X: np.ndarray) -> List[str]:
+        bounds = np.searchsorted(player_of_row, np.arange(n + 1))
+        salt = self.model.version.encode()
+        return [
+            hashlib.blake2b(
+                X[bounds[i] : bounds[i + 1]].round(6).tobytes(), digest_size=8, key=salt
+            ).hexdigest()
+            for i in range(n)
+        ]
+
+    def run(self, gameweek: Optional[int] = None, force: bool = False) -> int:
+        """Refresh projections for ``gameweek`` (default: the next one)."""
+        versions = data_versions.get(*DEPENDENCIES)
+        default = gameweek is None
+        if not force and default and versions == self._last_versions:
+            return 0
+
+        with self.db.engine.connect() as conn:
+            gameweek = gameweek or self.target_gameweek(conn)
+            if gameweek is None:
+                return 0
+            player_ids, player_of_row, X = self.features(conn, gameweek)
+            stored = dict(
+                conn.execute(
+                    select(player_xpoints.c.player_id, player_xpoints.c.inputs_hash)
+                    .where(player_xpoints.c.gameweek == gameweek)
+                    .where(player_xpoints.c.model_version == self.model.version)
+                ).all()
+            )
+
+        n = len(player_ids)
+        digests = self._digests(n, player_of_row, X)
+        changed = np.array(
+            [force or stored.get(int(pid)) != d for pid, d in zip(player_ids, digests)],
+            dtype=bool,
+        )
+
+        rows = changed[player_of_row]
+        xpoints = np.bincount(
+            player_of_row[rows],
+            weights=self.model.predict(X[rows]),
+            minlength=n,
+        )
+
+        # computed_at is a naive column holding UTC
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        updates: List[Dict[str, Any]] = [
+            {
+                "player_id": int(player_ids[i]),
+                "gameweek": gameweek,
+                "xpoints": round(float(xpoints[i]), 3),
+                "inputs_hash": digests[i],
+                "model_version": self.model.version,
+                "computed_at": now,
+            }
+            for i in np.flatnonzero(changed)
+        ]
+        if updates and self.db.batch_upsert_on_conflict(
+            player_xpoints, updates, ["player_id", "gameweek"]
+        ):
+            record_change(self.db, player_xpoints.name, [gameweek])
+
+        if default:
+            # Only the default target is skipped when unchanged
+            self._last_versions = versions
+        print(f"📈 xPoints for GW{gameweek}: {len(updates)} of {n} players rescored")
+        return len(updates)
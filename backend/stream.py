@@ -0,0 +1,8 @@
+from flask import Flask
+from routes.api import stream_bp
+from flask_cors import CORS
+
+# Serves /api/live/stream only; run with `gunicorn -c gunicorn_stream.conf.py stream:app`
+app = Flask(__name__)
+CORS(app)
+app.register_blueprint(stream_bp, url_prefix="/api")
@@ -3,7 +3,7 @@ import { Grid, Container, Paper, Typography, CircularProgress, Alert } from '@mu
 import { MetricCard } from './MetricCard';
 import { TopPlayersTable } from './TopPlayersTable';
 import { GameweekChart } from './GameweekChart';
-import { fetchOverview, fetchTopPlayers, fetchGameWeeksData } from '../services/api';
+import { fetchDashboard } from '../services/api';
 import EmojiEventsIcon from '@mui/icons-material/EmojiEvents';
 import ScoreIcon from '@mui/icons-material/Score';
 import AttachMoneyIcon from '@mui/icons-material/AttachMoney';
@@ -20,9 +20,11 @@ export const Dashboard = ({entryId} : {entryId: number}) => {
         const loadData = async () => {
             try {
                 setLoading(true)
-                const overviewData = await fetchOverview(entryId);
-                const playersData = await fetchTopPlayers();
-                const gameWeeksData = await fetchGameWeeksData(entryId);
+                const {
+                    overview: overviewData,
+                    top_players: playersData,
+                    gameweeks: gameWeeksData,
+                } = await fetchDashboard(entryId);
 
                 // Validate data before setting state
                 if  (!overviewData || !playersData || !gameWeeksData) {
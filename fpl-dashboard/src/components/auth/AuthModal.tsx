@@ -48,10 +48,11 @@ export const AuthModal = ({ open, onClose, onAuthSuccess }: AuthModalProps) => {
                 await axios.post('/auth/signup', { email, password, entryId: Number(entryId) });
                 onAuthSuccess(Number(entryId));
             } else {
-                const response = await axios.post<{ entryId: number }>('/auth/login', {
+                const response = await axios.post<{ entryId: number; token: string }>('/auth/login', {
                     email,
                     password,
                 });
+                axios.defaults.headers.common['Authorization'] = `Bearer ${response.data.token}`;
                 onAuthSuccess(response.data.entryId);
             }
         } catch (err) {
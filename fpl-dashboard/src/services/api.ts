@@ -20,4 +20,9 @@ export const fetchMiniLeagues = async (entryId: number) => {
 export const fetchGameWeeksData = async (entryId: number) => {
     const response = await axios.get(`${API_BASE_URL}/api/gameweeks/${entryId}`);
     return response.data;
+};
+
+export const fetchDashboard = async (entryId: number) => {
+    const response = await axios.get(`${API_BASE_URL}/api/dashboard/${entryId}`);
+    return response.data;
 };
\ No newline at end of file